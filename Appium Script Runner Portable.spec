@@ -60,14 +60,34 @@ a = Analysis(
         'src.core.environment',
         'src.core.runtime',
         'src.device.adb',
+        'src.device.appium_server',
+        'src.device.ios',
         'src.gui.app',
         'src.gui.dialogs',
         'src.runner',
         'src.runner.config',
         'src.runner.executor',
+        'src.runner.report',
+        'src.runner.session_keeper',
+        'utils.adb',
+        'utils.async_driver',
+        'utils.checkpoint',
+        'utils.direct_client',
+        'utils.fast_fill',
         'utils.safe_print',
         'utils.font',
+        'utils.ledger',
+        'utils.limit',
+        'utils.paths',
+        'utils.recorder',
+        'utils.server_loop',
+        'utils.session',
+        'utils.snapshot',
+        'utils.timing',
+        'utils.tracer',
         'utils.util',
+        'utils.verify',
+        'utils.watchdog',
         # tkinter
         'tkinter',
         'tkinter.ttk',
@@ -87,6 +107,8 @@ a = Analysis(
         'urllib.request',
         'urllib.error',
         'ctypes',
+        # 보고서 지연 곡선 맞춤 (src.runner.report)
+        'numpy',
     ] + extra_hiddenimports,
     hookspath=[],
     hooksconfig={},
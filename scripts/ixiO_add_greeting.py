@@ -1,16 +1,24 @@
-import re
-import time
+import asyncio
+import base64
 import sys
 import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 
-from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
 from appium.options.ios import XCUITestOptions
-from utils.util import find, click
+from selenium.common.exceptions import NoSuchElementException
+from utils.util import (
+    find, first_of, click, exists, input_text, print_cache_stats, print_input_stats,
+    load_wait_profile, save_wait_profile, wait_gone,
+)
+from utils.async_driver import run_async
+from utils.direct_client import hot_driver, release_hot_driver
+from utils.session import apply_port_caps, create_driver, quit_driver, keyboard_suppressed, mark_iteration
+from utils.timing import journal, span, end_iterations
+from utils.watchdog import Watchdog
 from datetime import datetime
 
 
@@ -20,15 +28,21 @@ def _dump_debug_state(driver, tag):
     os.makedirs(debug_dir, exist_ok=True)
     stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     base_path = os.path.join(debug_dir, f"{tag}_{stamp}")
+
+    # 스크린샷과 page_source는 서로 독립적인 조회라 동시에 요청한다.
+    async def _capture(adriver):
+        return await asyncio.gather(adriver.screenshot(), adriver.page_source(),
+                                    return_exceptions=True)
     try:
-        driver.get_screenshot_as_file(f"{base_path}.png")
-    except Exception:
-        pass
-    try:
+        screenshot, source = run_async(driver, _capture)
+    except Exception as e:
+        screenshot = source = e
+    if isinstance(screenshot, str):
+        with open(f"{base_path}.png", "wb") as f:
+            f.write(base64.b64decode(screenshot))
+    if isinstance(source, str):
         with open(f"{base_path}.xml", "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
-    except Exception:
-        pass
+            f.write(source)
     return base_path
 
 
@@ -57,7 +71,7 @@ def add_greeting():
             "noReset": True,
             "fullReset": False,
         }
-        options = XCUITestOptions().load_capabilities(caps)
+        options = XCUITestOptions().load_capabilities(apply_port_caps(caps, is_ios=True))
     else:
         caps = {
             "platformName": "Android",
@@ -70,69 +84,100 @@ def add_greeting():
             "noReset": True,
             "fullReset": False,
         }
-        options = UiAutomator2Options().load_capabilities(caps)
+        options = UiAutomator2Options().load_capabilities(apply_port_caps(caps))
 
-    driver = webdriver.Remote("http://localhost:4723", options=options)
+    driver = create_driver(options)
 
     try:
         start_time = datetime.now()
         print(f"🔥 스크립트 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
-        for i in range(start_num, end_num + 1):
-            print(f"🔁 {i - start_num + 1}/{end_num - start_num + 1}번째 인사말 추가")
-
-            try:
-                if is_ios:
-                    btn_greeting = find(driver, AppiumBy.ACCESSIBILITY_ID, '인사말 추가')
-                else:
-                    btn_greeting = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                                       'new UiSelector().text("인사말 추가")')
-                btn_greeting.click()
-
-                greeting_word = f"인사말 추가 테스트 {i}"
-
-                if is_ios:
-                    input_field = find(driver, AppiumBy.ACCESSIBILITY_ID, '인사말을 입력하세요')
-                else:
-                    try:
-                        input_field = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                                           'new UiSelector().text("인사말을 입력하세요")')
-
-                    except Exception:
-                        input_field = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                                            'new UiSelector().className("android.widget.EditText").instance(1)')
-                input_field.click()
-                if is_ios:
-                    input_field.send_keys(greeting_word)
-                else:
+        load_wait_profile('ixiO_add_greeting')
+
+        # 루프 안의 조회/클릭/입력은 (옵션이 켜져 있으면) UiAutomator2 서버 /
+        # WebDriverAgent로 직접 보낸다.
+        if is_ios:
+            hot = hot_driver(driver, probes=[(AppiumBy.ACCESSIBILITY_ID, '인사말 추가')])
+        else:
+            hot = hot_driver(driver, probes=[(AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("인사말 추가")')])
+
+        # 바텀시트의 '확인'까지 누른 마지막 회차 (카운터가 없어 장애 후 반영 여부를 이걸로 판단한다)
+        confirmed = 0
+
+        def close_sheet(i):
+            # 장애 때 열려 있던 바텀시트는 닫고 같은 인사말부터 다시 추가한다.
+            if not is_ios and exists(driver, AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("확인")'):
+                driver.back()
+                return False
+            if confirmed == i:
+                journal.add_entries()
+                return True
+            return False
+
+        # UiAutomator2 / WDA 크래시 등 일시적인 장애는 세션을 다시 만들고 실패한 회차부터 이어서 진행한다.
+        watchdog = Watchdog(driver, options, hot=hot, on_recover=close_sheet)
+        for i in watchdog.attempts(range(start_num, end_num + 1)):
+            with watchdog.step(i):
+                mark_iteration()
+                print(f"🔁 {i - start_num + 1}/{end_num - start_num + 1}번째 인사말 추가")
+
+                try:
+                    # '인사말 추가' 버튼은 목록 화면에 고정되어 있어 캐시한다.
+                    # 바텀시트 안의 요소는 매번 새로 그려지므로 캐시하지 않는다.
+                    if is_ios:
+                        click(hot, AppiumBy.ACCESSIBILITY_ID, '인사말 추가', cache=True)
+                    else:
+                        click(hot, AppiumBy.ANDROID_UIAUTOMATOR,
+                              'new UiSelector().text("인사말 추가")', cache=True)
+
+                    greeting_word = f"인사말 추가 테스트 {i}"
+
+                    if is_ios:
+                        input_field = find(hot, AppiumBy.ACCESSIBILITY_ID, '인사말을 입력하세요')
+                    else:
+                        # placeholder 텍스트로 먼저 찾고, 없으면 두 번째 EditText.
+                        # 두 후보를 XPath 합집합 한 번으로 확인해 첫 후보 실패 시
+                        # 10초 타임아웃을 기다리지 않는다. 둘 다 있으면 placeholder가 우선이다.
+                        input_field = first_of(hot, [
+                            (AppiumBy.XPATH, '//*[@text="인사말을 입력하세요"]'),
+                            (AppiumBy.XPATH, '(//android.widget.EditText)[2]'),
+                        ], timeout=10)
+                        if input_field is None:
+                            raise NoSuchElementException("인사말 입력창을 찾을 수 없습니다.")
                     # 이 바텀시트의 EditText는 표준 setText(send_keys)에 반응하지 않아
-                    # InvalidElementStateException이 발생한다. UiAutomator2의 IME
-                    # 입력 제스처(mobile: type)를 사용해야 정상 입력된다.
-                    driver.execute_script('mobile: type', {'text': greeting_word})
-
-                if not is_ios:
-                    # 뒤로가기 키(keycode 4)는 키보드가 아직 안 떠 있는 타이밍에
-                    # 눌리면 키보드 대신 바텀시트 자체를 닫아버리는 레이스가 있어
-                    # 키보드 전용 종료 명령을 사용한다.
-                    if driver.is_keyboard_shown():
-                        driver.hide_keyboard()
-
-                if is_ios:
-                    click(driver, AppiumBy.ACCESSIBILITY_ID, '확인')
-                else:
+                    # InvalidElementStateException이 발생한다. 입력 전략 벤치마크가
+                    # send_keys를 걸러내고 실제로 입력되는 방식(mobile: type 등) 중
+                    # 가장 빠른 것을 골라 기억한다.
+                    input_text(hot, input_field, greeting_word, field='greeting')
+
+                    if not is_ios and not keyboard_suppressed(driver):
+                        # 뒤로가기 키(keycode 4)는 키보드가 아직 안 떠 있는 타이밍에
+                        # 눌리면 키보드 대신 바텀시트 자체를 닫아버리는 레이스가 있어
+                        # 키보드 전용 종료 명령을 사용한다.
+                        with span('keyboard'):
+                            if driver.is_keyboard_shown():
+                                driver.hide_keyboard()
+
+                    if is_ios:
+                        confirm_locator = (AppiumBy.ACCESSIBILITY_ID, '확인')
+                    else:
+                        confirm_locator = (AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("확인")')
                     # 키보드 닫힘 애니메이션으로 레이아웃이 막 바뀐 직후라
                     # 찾은 요소가 클릭 시점에 stale해지는 경우가 있어 재시도한다.
-                    click(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                          'new UiSelector().text("확인")')
+                    click(hot, *confirm_locator)
+                    confirmed = i
 
-                time.sleep(0.5)
+                    # 고정 sleep 대신 바텀시트가 실제로 닫힐 때까지만 기다린다.
+                    # (닫히기 전에 다음 '인사말 추가'를 누르면 클릭이 씹힌다)
+                    wait_gone(hot, *confirm_locator, step='sheet_close')
+                    journal.add_entries()
 
-                print(f"✅ 인사말 #{i} 추가 완료: '{greeting_word}'")
-                time.sleep(0.8)
-            except Exception:
-                debug_path = _dump_debug_state(driver, f"greeting_{i}_fail")
-                print(f"🧩 실패 시점 화면 저장: {debug_path}.png / {debug_path}.xml")
-                raise
+                    print(f"✅ 인사말 #{i} 추가 완료: '{greeting_word}'")
+                except Exception:
+                    debug_path = _dump_debug_state(driver, f"greeting_{i}_fail")
+                    print(f"🧩 실패 시점 화면 저장: {debug_path}.png / {debug_path}.xml")
+                    raise
+        end_iterations()
 
         if is_ios:
             btn_save = find(driver, AppiumBy.ACCESSIBILITY_ID, '저장')
@@ -140,12 +185,16 @@ def add_greeting():
             btn_save = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
                                 'new UiSelector().text("저장")')
         btn_save.click()
+        save_wait_profile()
+        release_hot_driver(hot, driver)
+        print_cache_stats()
+        print_input_stats()
         end_time = datetime.now()
         print(f"🔥 스크립트 종료: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"🔥 총 소요 시간: {end_time - start_time}")
 
     finally:
-        driver.quit()
+        quit_driver(driver)
 
 
 if __name__ == "__main__":
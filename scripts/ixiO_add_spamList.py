@@ -1,16 +1,28 @@
 import re
-import time
 import sys
 import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 
-from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
 from appium.options.ios import XCUITestOptions
-from utils.util import find
+from utils.util import (
+    find, tap, send_keys, get_text, print_cache_stats,
+    load_wait_profile, save_wait_profile,
+)
+from utils.snapshot import snapshot
+from utils.server_loop import run_batches, server_loop_enabled
+from selenium.common.exceptions import WebDriverException
+from utils.direct_client import WdaClient, hot_driver, release_hot_driver
+from utils.fast_fill import FastFill, fast_fill_enabled, handover_count, tap_point
+from utils.checkpoint import Checkpoint
+from utils.watchdog import Watchdog
+from utils.limit import LimitLoop
+from utils.verify import CounterVerifier, count_listed
+from utils.session import apply_port_caps, create_driver, quit_driver, keyboard_suppressed, mark_iteration
+from utils.timing import journal, span, end_iterations
 from datetime import datetime
 
 # ======================================================
@@ -19,6 +31,50 @@ from datetime import datetime
 # - ✨ 실행 전 확인 사항
 # - 익시오 앱 진입 > 스팸 차단 번호 추가 화면까지 진입한 상태에서 실행
 
+MAX_COUNT = 600
+
+# 서버 측 루프(execute-driver)용 WebdriverIO 스크립트.
+# 파이썬 루프와 같은 순서(입력 → 키보드 닫기 → 등록 → 카운터 변화 대기)로
+# 배치 하나를 처리하고 회차별 {number, counter} 결과를 반환한다.
+# 카운터가 바뀌지 않거나 한도에 도달하면 그 회차까지만 반환하고 멈춘다.
+SERVER_LOOP_SCRIPT = """
+const args = __ARGS__;
+async function readCounter() {
+  if (args.ios) {
+    const texts = await driver.$$('-ios class chain:**/XCUIElementTypeStaticText');
+    let prev = '';
+    for (const el of texts) {
+      const label = (await el.getAttribute('label')) || '';
+      if (label.startsWith('/') && /^\\d+$/.test(prev.trim())) return parseInt(prev.trim(), 10);
+      prev = label;
+    }
+    return 0;
+  }
+  const match = (await (await driver.$(args.counter)).getText()).match(/(\\d+)\\//);
+  return match ? parseInt(match[1], 10) : null;
+}
+const field = await driver.$(args.field);
+const button = await driver.$(args.button);
+const results = [];
+let previous = await readCounter();
+for (const number of args.items) {
+  await field.click();
+  await field.setValue(number);
+  if (!args.ios) await driver.pressKeyCode(4);
+  await button.click();
+  const deadline = Date.now() + args.timeoutMs;
+  let current = await readCounter();
+  while (current === previous && Date.now() < deadline) {
+    await driver.pause(args.pollMs);
+    current = await readCounter();
+  }
+  results.push({number: number, counter: current});
+  if (current === previous || current >= args.limit) break;
+  previous = current;
+}
+return results;
+"""
+
 
 def add_spam_number():
     device_name = os.environ.get('APPIUM_DEVICE_NAME')
@@ -45,7 +101,7 @@ def add_spam_number():
             "noReset": True,
             "fullReset": False,
         }
-        options = XCUITestOptions().load_capabilities(caps)
+        options = XCUITestOptions().load_capabilities(apply_port_caps(caps, is_ios=True))
     else:
         caps = {
             "platformName": "Android",
@@ -58,89 +114,251 @@ def add_spam_number():
             "noReset": True,
             "fullReset": False,
         }
-        options = UiAutomator2Options().load_capabilities(caps)
+        options = UiAutomator2Options().load_capabilities(apply_port_caps(caps))
 
-    driver = webdriver.Remote("http://localhost:4723", options=options)
+    driver = create_driver(options)
 
     try:
         start_time = datetime.now()
         print(f"🔥 스크립트 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
-        prev_num = None
-        for i in range(start_num, end_num + 1):
-            padded_number = f"070{i:03}"
+        # 루프 안의 조회/클릭/입력은 (옵션이 켜져 있으면) UiAutomator2 서버 /
+        # WebDriverAgent로 직접 보낸다.
+        if is_ios:
+            hot = hot_driver(driver, probes=[(AppiumBy.IOS_CLASS_CHAIN, '**/XCUIElementTypeTextField')])
+        else:
+            hot = hot_driver(driver, probes=[(AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().textStartsWith("전체")')])
 
+        def read_counter():
             if is_ios:
-                input_field = find(driver, AppiumBy.CLASS_NAME, 'XCUIElementTypeTextField')
+                # StaticText마다 get_attribute를 호출하면 요소 수만큼 왕복하므로
+                # page_source 한 번으로 받아 로컬에서 '숫자' + '/최대' 라벨 쌍을 찾는다.
+                # 직접 클라이언트는 WDA JSON 트리로 라벨만 받아 XML 파싱을 건너뛴다.
+                if isinstance(hot, WdaClient):
+                    labels = [label for _, label in hot.labels('XCUIElementTypeStaticText')]
+                else:
+                    labels = [node.get('label') or ''
+                              for node in snapshot(hot).nodes('XCUIElementTypeStaticText')]
+                for idx, lbl in enumerate(labels):
+                    if lbl.startswith('/') and idx > 0 and labels[idx - 1].strip().isdigit():
+                        return int(labels[idx - 1].strip())
+                return 0
+            full_text = get_text(hot, AppiumBy.ANDROID_UIAUTOMATOR,
+                                 'new UiSelector().textStartsWith("전체")', cache=True)
+            return int(re.search(r'(\d+)/', full_text).group(1))
+
+        load_wait_profile('ixiO_add_spamList')
+
+        # 고정 sleep 대신 등록 후 카운터가 실제로 바뀔 때까지만 기다리기 위해
+        # 시작 시점의 카운터를 기준값으로 읽어 둔다.
+        try:
+            prev_num = read_counter()
+        except Exception:
+            prev_num = None
+
+        # 중단된 실행을 이어서 할 때는 체크포인트와 카운터를 맞춰 본 다음 번호부터 시작한다.
+        checkpoint = Checkpoint('com.lguplus.aicallagent', 'spam_list')
+        start_num = checkpoint.begin(start_num, prev_num)
+        # 등록 실패로 멈춘 실행은 다음 RESUME에서 실패한 번호부터 다시 시도한다.
+        completed = True
+        # 등록 개수 카운터가 한도에 닿으면 END_NUM까지 남은 번호는 입력하지 않는다.
+        limit = LimitLoop(MAX_COUNT, prev_num)
+
+        def verify_limit_popup():
+            try:
+                if is_ios:
+                    popup = find(driver, AppiumBy.ACCESSIBILITY_ID, '더 이상 추가할 수 없어요')
+                    print("✅ 팝업 노출 확인:", popup.text)
+                    btn_popup_close = find(driver, AppiumBy.XPATH,
+                                           '//XCUIElementTypeButton[@name="확인"]')
+                else:
+                    popup = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
+                                 'new UiSelector().text("더 이상 추가할 수 없어요")')
+                    print("✅ 팝업 노출 확인:", popup.text)
+                    btn_popup_close = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
+                                           'new UiSelector().text("확인")')
+                btn_popup_close.click()
+                print("✅ 팝업 닫기 완료! 스크립트 실행 끝!")
+
+            except Exception as e:
+                print(f"❌ 팝업 미노출 또는 닫기 실패: {e}")
+
+        # 등록 반영은 VERIFY_EVERY 정책에 따라 매 건 / N건마다 / 한도 근처에서 카운터로 확인하고,
+        # 일괄 확인에서 빠진 번호는 목록 화면을 조회해 찾아 다시 등록한다.
+        verifier = CounterVerifier(read_counter, lambda texts: count_listed(hot, texts, ios=is_ios),
+                                   prev_num, limit=MAX_COUNT)
+
+        # 빠른 채우기 / 서버 측 루프가 처리하지 못한 번호부터 다음 단계가 이어서 진행한다.
+        next_num = start_num
+        if fast_fill_enabled() and not is_ios and prev_num is not None:
+            # 한도 직전까지는 캐시한 좌표 + adb input으로 채운다 (Android만).
+            field = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
+                         'new UiSelector().className("android.widget.EditText").instance(0)')
+            button = find(driver, AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("등록")')
+            steps = [('tap', tap_point(field)), ('text', None)]
+            if not keyboard_suppressed(driver):
+                steps.append(('key', 4))
+            steps.append(('tap', tap_point(button)))
+            filler = FastFill(
+                steps,
+                read_counter=read_counter,
+                dump_counter=lambda snap: int(snap.find_text(r'^전체.*?(\d+)/').group(1)),
+            )
+            fill_until = min(end_num, start_num + MAX_COUNT - prev_num - handover_count() - 1)
+            if fill_until >= start_num:
+                # 빠른 채우기 전체를 한 회차로 기록하고 반영된 건수를 남긴다.
+                mark_iteration()
+                with span('fast_fill'):
+                    attempted, current = filler.run(
+                        (f"070{i:03}" for i in range(start_num, fill_until + 1)), count=prev_num)
+                next_num = start_num + attempted
+                current = current if current is not None else read_counter()
+                journal.add_entries(current - prev_num)
+                prev_num = current
+                if filler.shortfall is None:
+                    checkpoint.confirm(next_num - 1, prev_num)
+                else:
+                    # 반영이 덜 된 배치는 어느 번호가 빠졌는지 목록에서 찾아 Appium 루프가 다시 등록한다.
+                    # (시도한 건수만큼 모두 등록됐다고 보고 건너뛰지 않는다)
+                    offset, chunk, before = filler.shortfall
+                    checkpoint.confirm(start_num + offset - 1, before)
+                    verifier.counter = before
+                    for n, number in enumerate(chunk, start_num + offset):
+                        verifier.add(n, number)
+                    prev_num, _, _ = verifier.verify(requeue=True)
+                    print(f"⚡ 빠른 채우기 배치에서 반영을 확인하지 못한 {len(verifier.requeued)}건은 Appium으로 다시 등록합니다.")
+
+        if server_loop_enabled() and next_num <= end_num:
+            # 등록 루프는 서버에서 배치 단위로 돌리고, 결과만 받아 로그를 남긴다.
+            if is_ios:
+                locators = {
+                    'field': '-ios class chain:**/XCUIElementTypeTextField',
+                    'button': '~등록',
+                }
             else:
-                input_field = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                                   'new UiSelector().className("android.widget.EditText").instance(0)')
-            input_field.click()
-            input_field.send_keys(str(padded_number))
+                locators = {
+                    'field': 'android=new UiSelector().className("android.widget.EditText").instance(0)',
+                    'button': 'android=new UiSelector().text("등록")',
+                    'counter': 'android=new UiSelector().textStartsWith("전체")',
+                }
+            print("🛰️ 서버 측 루프(execute-driver)로 등록합니다.")
+            try:
+                # 서버 측 루프 전체를 한 회차로 기록하고 반영된 건수를 남긴다.
+                mark_iteration()
+                numbers = [f"070{i:03}" for i in range(next_num, end_num + 1)]
+                for result in run_batches(driver, SERVER_LOOP_SCRIPT, numbers, ios=is_ios,
+                                          limit=MAX_COUNT, pollMs=50, timeoutMs=10000, **locators):
+                    current_num = result['counter']
+                    if current_num is None or (prev_num is not None and current_num <= prev_num):
+                        print(f"🕹️ ❗️ {result['number']} 등록 실패 또는 반영 안 됨 (등록 개수: {prev_num} → {current_num})")
+                        next_num = end_num + 1
+                        completed = False
+                        break
+                    journal.add_entries(current_num - prev_num if prev_num is not None else 1)
+                    prev_num = current_num
+                    next_num += 1
+                    checkpoint.confirm(next_num - 1, current_num)
+                    print(f"  스팸번호 {next_num - 1} 등록 완료 (총 {current_num}개)")
+                    if limit.update(current_num):
+                        verify_limit_popup()
+                        next_num = end_num + 1
+                        break
+            except WebDriverException as e:
+                # 플러그인 미설치 등 — 남은 번호는 일반 모드로 이어서 진행한다.
+                print(f"⚠️ 서버 측 루프 실행 불가, 일반 모드로 진행합니다: {e.msg or e}")
+                try:
+                    prev_num = read_counter()
+                except Exception:
+                    prev_num = None
 
-            # 키보드 닫기 (Android만)
-            if not is_ios:
-                driver.press_keycode(4)
+        # 서버 측 루프로 카운터가 바뀌었을 수 있어 확인 기준값을 맞춘다.
+        verifier.counter = prev_num
 
+        def register(i):
+            padded_number = f"070{i:03}"
+
+            # 입력창 / 등록 버튼 / 카운터는 매 반복 같은 위치에 있으므로 캐시된 핸들을 재사용한다.
             if is_ios:
-                btn_register = find(driver, AppiumBy.ACCESSIBILITY_ID, '등록')
+                send_keys(hot, AppiumBy.IOS_CLASS_CHAIN, '**/XCUIElementTypeTextField',
+                          str(padded_number), cache=True)
             else:
-                btn_register = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                                    'new UiSelector().text("등록")')
-            btn_register.click()
+                send_keys(hot, AppiumBy.ANDROID_UIAUTOMATOR,
+                          'new UiSelector().className("android.widget.EditText").instance(0)',
+                          str(padded_number), cache=True)
+
+            # 키보드 닫기 (Android만, fast 프로필로 새로 만든 세션은 키보드가 뜨지 않아 생략)
+            if not is_ios and not keyboard_suppressed(driver):
+                with span('keyboard'):
+                    driver.press_keycode(4)
 
             if is_ios:
-                all_texts = driver.find_elements(AppiumBy.CLASS_NAME, 'XCUIElementTypeStaticText')
-                current_num = 0
-                for idx, el in enumerate(all_texts):
-                    lbl = el.get_attribute('label') or ''
-                    if lbl.startswith('/') and idx > 0:
-                        prev = all_texts[idx - 1].get_attribute('label') or ''
-                        if prev.strip().isdigit():
-                            current_num = int(prev.strip())
-                            break
+                tap(hot, AppiumBy.ACCESSIBILITY_ID, '등록')
             else:
-                registered_num_element = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                                              'new UiSelector().textStartsWith("전체")')
-                full_text = registered_num_element.text
-                current_num = int(re.search(r'(\d+)/', full_text).group(1))
+                tap(hot, AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("등록")')
+            verifier.add(i, padded_number)
 
-            if current_num >= 600:
-                try:
-                    if is_ios:
-                        popup = find(driver, AppiumBy.ACCESSIBILITY_ID, '더 이상 추가할 수 없어요')
-                        print("✅ 팝업 노출 확인:", popup.text)
-                        btn_popup_close = find(driver, AppiumBy.XPATH,
-                                               '//XCUIElementTypeButton[@name="확인"]')
-                    else:
-                        popup = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                                     'new UiSelector().text("더 이상 추가할 수 없어요")')
-                        print("✅ 팝업 노출 확인:", popup.text)
-                        btn_popup_close = find(driver, AppiumBy.ANDROID_UIAUTOMATOR,
-                                               'new UiSelector().text("확인")')
-                    btn_popup_close.click()
-                    print("✅ 팝업 닫기 완료! 스크립트 실행 끝!")
-
-                except Exception as e:
-                    print(f"❌ 팝업 미노출 또는 닫기 실패: {e}")
-                break
-
-            # 화면에 표시되는 번호 포맷(자릿수 그룹핑 등)은 앱마다 달라 추측하기
-            # 취약하므로, 대신 등록 개수 카운터가 실제로 늘었는지로 성공 여부를 판단한다.
-            if prev_num is not None and current_num <= prev_num:
-                print(f"🕹️ ❗️ {padded_number} 등록 실패 또는 반영 안 됨 (등록 개수: {prev_num} → {current_num})")
-                break
-            prev_num = current_num
-
-            print(f"  스팸번호 {i} 등록 완료 (총 {current_num}개)")
-            time.sleep(0.5)
+        def resync(i):
+            # 장애 직전까지 등록한 번호를 카운터로 맞춰 보고, 반영되지 않은 번호(실패한 회차 포함)는
+            # 다시 등록하도록 대기열에 넣는다.
+            nonlocal prev_num
+            verifier.add(i, f"070{i:03}")
+            before = prev_num
+            prev_num, batch, _ = verifier.verify(settle=False, requeue=True)
+            if before is not None and prev_num is not None:
+                journal.add_entries(prev_num - before)
+            limit.update(prev_num)
+            if i not in verifier.requeued:
+                print(f"  스팸번호 {i} 등록 완료 (총 {prev_num}개, 장애 전 반영)")
+            if verifier.settled:
+                checkpoint.confirm(verifier.highest, prev_num)
+            return True
+
+        # UiAutomator2 / WDA 크래시 등 일시적인 장애는 세션을 다시 만들고 실패한 번호부터 이어서 진행한다.
+        watchdog = Watchdog(driver, options, hot=hot, on_recover=resync)
+        for i in watchdog.attempts(verifier.entries(range(next_num, end_num + 1))):
+            with watchdog.step(i):
+                mark_iteration()
+                register(i)
+                if not verifier.due() and i != end_num:
+                    continue
+
+                current_num, batch, failed = verifier.verify()
+                if prev_num is not None and current_num is not None:
+                    journal.add_entries(current_num - prev_num)
+                if limit.update(current_num):
+                    checkpoint.confirm(verifier.highest, current_num)
+                    end_iterations()
+                    verify_limit_popup()
+                    break
+
+                # 화면에 표시되는 번호 포맷(자릿수 그룹핑 등)은 앱마다 달라 추측하기
+                # 취약하므로, 대신 등록 개수 카운터가 실제로 늘었는지로 성공 여부를 판단한다.
+                if failed:
+                    print(f"🕹️ ❗️ 070{failed[0]:03} 등록 실패 또는 반영 안 됨 (등록 개수: {prev_num} → {current_num})")
+                    completed = False
+                    break
+                prev_num = current_num
+                if verifier.settled:
+                    checkpoint.confirm(verifier.highest, current_num)
+
+                if len(batch) == 1:
+                    print(f"  스팸번호 {i} 등록 완료 (총 {current_num}개)")
+                else:
+                    done = len(batch) - len(verifier.requeued)
+                    print(f"  스팸번호 {batch[0]}~{batch[-1]} 중 {done}건 등록 완료 (총 {current_num}개)")
+        end_iterations()
+        if completed:
+            checkpoint.finish()
 
+        save_wait_profile()
+        release_hot_driver(hot, driver)
+        print_cache_stats()
         end_time = datetime.now()
         print(f"🔥 스크립트 종료: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"🔥 총 소요 시간: {end_time - start_time}")
 
     finally:
-        driver.quit()
+        quit_driver(driver)
 
 
 if __name__ == "__main__":
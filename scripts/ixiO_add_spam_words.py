@@ -1,16 +1,23 @@
 import os
 import re
-import time
-import random
 import sys
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 
-from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
-from utils.util import find
+from utils.util import (
+    find, exists, click, type_text, get_text, print_cache_stats, print_input_stats,
+    load_wait_profile, save_wait_profile, wait_counter_change,
+)
+from utils.direct_client import hot_driver, release_hot_driver
+from utils.session import apply_port_caps, create_driver, quit_driver, mark_iteration
+from utils.timing import journal, end_iterations
+from utils.checkpoint import Checkpoint
+from utils.watchdog import Watchdog
+from utils.limit import LimitLoop
+from utils.ledger import WordLedger
 from datetime import datetime
 
 # ===============================================================
@@ -46,20 +53,22 @@ def add_spam_words():
         "noReset": True,
         "fullReset": False
     }
-    options = UiAutomator2Options().load_capabilities(caps)
+    options = UiAutomator2Options().load_capabilities(apply_port_caps(caps))
 
-    driver = webdriver.Remote("http://localhost:4723", options=options)
+    driver = create_driver(options)
 
     try:
         start_time = datetime.now()
         print(f"🔥 스크립트 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
         # 차단(300)/차단하지 않을 단어(200)에 따라 숫자 카운트 선택
-        try:
-            find(driver, AppiumBy.XPATH, '//android.widget.TextView[@text="차단하지 않을 단어"]')
+        # (요소가 없을 때 find의 타임아웃을 다 기다리지 않도록 즉시 확인)
+        if exists(driver, AppiumBy.XPATH, '//android.widget.TextView[@text="차단하지 않을 단어"]'):
             max_count = 200
-        except:
+            list_type = '차단하지 않을 단어'
+        else:
             max_count = 300
+            list_type = '차단 단어'
 
         # 2자 이상 한국어 단어 랜덤으로 선택
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -68,31 +77,94 @@ def add_spam_words():
         with open(file_path, "r", encoding="utf-8") as f:
             words = [line.strip() for line in f if 2 <= len(line.strip())]
             words = list(set(words))
-            selected_words = random.sample(words, min(word_count, len(words)))
 
-        print(f"✅ 총 {len(selected_words)}개의 단어가 선택됨")
+        # 루프 안의 조회/클릭/입력은 (옵션이 켜져 있으면) UiAutomator2 서버로 직접 보낸다.
+        hot = hot_driver(driver, probes=[(AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().textStartsWith("전체")')])
+
+        def read_counter():
+            list_size_text = get_text(hot, AppiumBy.ANDROID_UIAUTOMATOR,
+                                      'new UiSelector().textStartsWith("전체")', cache=True)
+            return int(re.search(r'(\d+)/', list_size_text).group(1))
 
-        for word in selected_words:
-            input_field = find(driver, AppiumBy.CLASS_NAME, 'android.widget.EditText')
-            input_field.click()
-            input_field.send_keys(word)
+        def listed(word):
+            # 목록 행(TextView)에 같은 단어가 있는지 대기 없이 한 번 조회 (입력창 EditText는 제외)
+            return bool(hot.find_elements(AppiumBy.ANDROID_UIAUTOMATOR,
+                                          f'new UiSelector().className("android.widget.TextView").text("{word}")'))
 
-            btn_register = find(driver, AppiumBy.XPATH, '//android.widget.TextView[@text="추가"]')
-            btn_register.click()
+        load_wait_profile('ixiO_add_spam_words')
+        try:
+            list_length = read_counter()
+        except Exception:
+            list_length = None
+
+        # 중단된 실행을 이어서 할 때는 이전 실행이 뽑아 둔 단어 목록을 그대로 쓰고,
+        # 새로 뽑을 때는 이 디바이스 목록에 이미 등록한 단어를 뺀다.
+        checkpoint = Checkpoint('com.lguplus.aicallagent', list_type)
+        ledger = WordLedger('com.lguplus.aicallagent', list_type)
+        selected_words = checkpoint.saved_items or ledger.sample(words, word_count, list_length, driver)
 
-            print(f"🕹️ 단어 '{word}' 등록 완료!")
-            time.sleep(0.5)
+        print(f"✅ 총 {len(selected_words)}개의 단어가 선택됨")
+        first = checkpoint.begin(1, list_length, items=selected_words)
+
+        # 카운터가 한도에 닿으면 남은 단어는 입력하지 않고 바로 팝업 확인으로 넘어간다.
+        limit = LimitLoop(max_count, list_length)
+
+        def resync(index):
+            # 장애 직전에 누른 등록이 이미 반영됐으면 그 단어는 다시 입력하지 않는다.
+            nonlocal list_length
+            current = read_counter()
+            done = list_length is not None and current > list_length
+            list_length = current
+            limit.update(current)
+            if done:
+                journal.add_entries()
+                checkpoint.confirm(index, current)
+                ledger.add(selected_words[index - 1])
+                print(f"🕹️ 단어 '{selected_words[index - 1]}' 등록 완료! (장애 전 반영)")
+            return done
+
+        # UiAutomator2 크래시 등 일시적인 장애는 세션을 다시 만들고 실패한 단어부터 이어서 진행한다.
+        watchdog = Watchdog(driver, options, hot=hot, on_recover=resync)
+        for index, word in watchdog.attempts(limit.items(enumerate(selected_words[first - 1:], first))):
+            with watchdog.step(index):
+                mark_iteration()
+                type_text(hot, AppiumBy.CLASS_NAME, 'android.widget.EditText', word, cache=True)
+                click(hot, AppiumBy.XPATH, '//android.widget.TextView[@text="추가"]', cache=True)
+
+                # 고정 sleep 대신 '전체 N/...' 카운터가 실제로 바뀔 때까지만 기다린다.
+                current = wait_counter_change(read_counter, list_length, step='counter', required=False)
+                if current is None:
+                    # 목록에 이미 있는 단어(중복)만 기록해 다음 실행에서 다시 뽑지 않는다.
+                    # (탭이 씹히는 등 반영만 늦은 단어는 기록하지 않아 다음 실행에서 다시 뽑힐 수 있다)
+                    if listed(word):
+                        ledger.add(word)
+                        print(f"🕹️ ❗️ 단어 '{word}' 등록 반영 안 됨 (이미 목록에 있는 단어)")
+                    else:
+                        print(f"🕹️ ❗️ 단어 '{word}' 등록 반영 안 됨")
+                    checkpoint.confirm(index, list_length)
+                    continue
+                list_length = current
+                journal.add_entries()
+                ledger.add(word)
+                limit.update(list_length)
+                checkpoint.confirm(index, list_length)
+
+                print(f"🕹️ 단어 '{word}' 등록 완료!")
+        end_iterations()
+        checkpoint.finish()
+
+        save_wait_profile()
 
         # 차단 갯수 초과 팝업 확인
-        list_size = find(driver, AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().textStartsWith("전체")')
-        list_size_text = list_size.text
-        list_length = int(re.search(r'(\d+)/', list_size_text).group(1))
+        list_length = read_counter()
         print(f"현재 등록된 단어 갯수: {list_length}")
 
-        if list_length >= max_count:
-            input_field.click()
-            input_field.send_keys('팝업확인')
-            btn_register.click()
+        if not limit.update(list_length):
+            print(f"⚠️ 선택한 단어를 모두 입력했지만 한도에 닿지 않아 팝업 확인을 건너뜁니다. "
+                  f"(남은 {limit.remaining}개)")
+        else:
+            type_text(driver, AppiumBy.CLASS_NAME, 'android.widget.EditText', '팝업확인', cache=True)
+            click(driver, AppiumBy.XPATH, '//android.widget.TextView[@text="추가"]', cache=True)
 
             try:
                 popup = find(driver, AppiumBy.ANDROID_UIAUTOMATOR, 'new UiSelector().text("더 이상 추가할 수 없어요")')
@@ -105,12 +177,15 @@ def add_spam_words():
             except Exception as e:
                 print(f"❌ 팝업 미노출 또는 닫기 실패: {e}")
 
+        release_hot_driver(hot, driver)
+        print_cache_stats()
+        print_input_stats()
         end_time = datetime.now()
         print(f"🔥 스크립트 종료: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"🔥 총 소요 시간: {end_time - start_time}")
 
     finally:
-        driver.quit()
+        quit_driver(driver)
 
 if __name__ == "__main__":
     add_spam_words()
@@ -1,14 +1,24 @@
-import time
 import sys
 import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 
-from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
-from utils.util import find
+from utils.util import (
+    find, click, send_keys, get_text, print_cache_stats,
+    load_wait_profile, save_wait_profile,
+)
+from utils.direct_client import hot_driver, release_hot_driver
+from utils.fast_fill import FastFill, fast_fill_enabled, handover_count, tap_point
+from utils.snapshot import node_text
+from utils.checkpoint import Checkpoint
+from utils.watchdog import Watchdog
+from utils.limit import LimitLoop
+from utils.verify import CounterVerifier, count_listed
+from utils.session import apply_port_caps, create_driver, quit_driver, mark_iteration
+from utils.timing import journal, span, end_iterations
 from datetime import datetime
 
 
@@ -19,6 +29,7 @@ from datetime import datetime
 # - ✨ 실행 전 확인 사항
 # - 앱 실행 > 설정 > 스팸 차단/예외 설정 > 차단 번호 관리 or 차단하지 않을 번호 관리 진입 후 스크립트 실행
 
+MAX_COUNT = 600
 
 
 def add_spam_number():
@@ -44,56 +55,147 @@ def add_spam_number():
         "fullReset": False      # 앱 제거 후 재설치 방지
     }
 
-    options = UiAutomator2Options().load_capabilities(caps)
+    options = UiAutomator2Options().load_capabilities(apply_port_caps(caps))
 
-    driver = webdriver.Remote("http://localhost:4723", options=options)
+    driver = create_driver(options)
 
     try:
 
         start_time = datetime.now()
         print(f"🔥 스크립트 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
-        for i in range(start_num, end_num + 1):
-
-            # 세 자리 숫자로 입력
-            padded_number = f"{i:03}" 
-
-            input_field = find(driver, AppiumBy.ID, 'lgt.call:id/spam_number_allow_block_edit_number')
-            input_field.click()
-
-            input_field.send_keys(str(padded_number))
-
-            btn_register = find(driver, AppiumBy.ID, 'lgt.call:id/spam_number_allow_block_register_button')
-            btn_register.click()
-
-            if i <= end_num :
-                print(f"🕹️ 번호 {i} 등록 완료!")
-            
-            time.sleep(0.3)
-
-           # 차단 갯수 초과 팝업 확인
-            list_count_field = find(driver, AppiumBy.ID, 'lgt.call:id/spam_number_block_list_count')
-            list_count = int(list_count_field.text)
-
-            if list_count >= 600:
-                try:
-                    popup = find(driver, AppiumBy.ID, 'lgt.call:id/title')
-                    print("✅ 팝업 노출 확인:", popup.text)            
+        # 루프 안의 조회/클릭/입력은 (옵션이 켜져 있으면) UiAutomator2 서버로 직접 보낸다.
+        hot = hot_driver(driver, probes=[(AppiumBy.ID, 'lgt.call:id/spam_number_block_list_count')])
+
+        def read_counter():
+            return int(get_text(hot, AppiumBy.ID, 'lgt.call:id/spam_number_block_list_count',
+                                cache=True))
+
+        load_wait_profile('mobileManager_add_spam_number')
+        try:
+            list_count = read_counter()
+        except Exception:
+            list_count = None
+
+        # 중단된 실행을 이어서 할 때는 체크포인트와 카운터를 맞춰 본 다음 번호부터 시작한다.
+        checkpoint = Checkpoint('lgt.call', 'spam_number')
+        start_num = checkpoint.begin(start_num, list_count)
+
+        # 카운터가 한도에 닿으면 END_NUM까지 남은 번호는 입력하지 않는다.
+        limit = LimitLoop(MAX_COUNT, list_count)
+
+        # 등록 반영은 VERIFY_EVERY 정책에 따라 매 건 / N건마다 / 한도 근처에서 카운터로 확인하고,
+        # 일괄 확인에서 빠진 번호는 목록 화면을 조회해 찾아 다시 등록한다.
+        verifier = CounterVerifier(read_counter, lambda texts: count_listed(hot, texts), list_count,
+                                   limit=MAX_COUNT)
+
+        next_num = start_num
+        if fast_fill_enabled() and list_count is not None:
+            # 한도 직전까지는 캐시한 좌표 + adb input으로 채우고 나머지는 Appium으로 진행한다.
+            field = find(driver, AppiumBy.ID, 'lgt.call:id/spam_number_allow_block_edit_number')
+            button = find(driver, AppiumBy.ID, 'lgt.call:id/spam_number_allow_block_register_button')
+            filler = FastFill(
+                [('tap', tap_point(field)), ('text', None), ('tap', tap_point(button))],
+                read_counter=read_counter,
+                dump_counter=lambda snap: int(node_text(
+                    snap.find(resource_id='lgt.call:id/spam_number_block_list_count'))),
+            )
+            fill_until = min(end_num, start_num + MAX_COUNT - list_count - handover_count() - 1)
+            if fill_until >= start_num:
+                # 빠른 채우기 전체를 한 회차로 기록하고 반영된 건수를 남긴다.
+                mark_iteration()
+                with span('fast_fill'):
+                    attempted, current = filler.run(
+                        (f"{i:03}" for i in range(start_num, fill_until + 1)), count=list_count)
+                next_num = start_num + attempted
+                current = current if current is not None else read_counter()
+                journal.add_entries(current - list_count)
+                list_count = current
+                if filler.shortfall is None:
+                    checkpoint.confirm(next_num - 1, list_count)
+                else:
+                    # 반영이 덜 된 배치는 어느 번호가 빠졌는지 목록에서 찾아 Appium 루프가 다시 등록한다.
+                    # (시도한 건수만큼 모두 등록됐다고 보고 건너뛰지 않는다)
+                    offset, chunk, before = filler.shortfall
+                    checkpoint.confirm(start_num + offset - 1, before)
+                    verifier.counter = before
+                    for n, number in enumerate(chunk, start_num + offset):
+                        verifier.add(n, number)
+                    list_count, _, _ = verifier.verify(requeue=True)
+                    print(f"⚡ 빠른 채우기 배치에서 반영을 확인하지 못한 {len(verifier.requeued)}건은 Appium으로 다시 등록합니다.")
+                limit.update(list_count)
+
+        def resync(i):
+            # 장애 직전까지 등록한 번호를 카운터로 맞춰 보고, 반영되지 않은 번호(실패한 회차 포함)는
+            # 다시 등록하도록 대기열에 넣는다.
+            nonlocal list_count
+            verifier.add(i, f"{i:03}")
+            before = list_count
+            list_count, _, _ = verifier.verify(settle=False, requeue=True)
+            if before is not None and list_count is not None:
+                journal.add_entries(list_count - before)
+            limit.update(list_count)
+            if i not in verifier.requeued:
+                print(f"🕹️ 번호 {i} 등록 완료! (장애 전 반영)")
+            if verifier.settled:
+                checkpoint.confirm(verifier.highest, list_count)
+            return True
+
+        # UiAutomator2 크래시 등 일시적인 장애는 세션을 다시 만들고 실패한 번호부터 이어서 진행한다.
+        watchdog = Watchdog(driver, options, hot=hot, on_recover=resync)
+        for i in watchdog.attempts(limit.items(verifier.entries(range(next_num, end_num + 1)))):
+            with watchdog.step(i):
+                mark_iteration()
+
+                # 세 자리 숫자로 입력
+                padded_number = f"{i:03}" 
+
+                send_keys(hot, AppiumBy.ID, 'lgt.call:id/spam_number_allow_block_edit_number',
+                          str(padded_number), cache=True)
+                click(hot, AppiumBy.ID, 'lgt.call:id/spam_number_allow_block_register_button', cache=True)
+                verifier.add(i, padded_number)
+
+                if i <= end_num :
+                    print(f"🕹️ 번호 {i} 등록 완료!")
+
+                # 고정 sleep 대신 차단 번호 카운터가 기대한 만큼 바뀔 때까지만 기다린다.
+                if not verifier.due() and i != end_num:
+                    continue
+                before = list_count
+                list_count, _, failed = verifier.verify()
+                if before is not None and list_count is not None:
+                    journal.add_entries(list_count - before)
+                for key in failed:
+                    print(f"🕹️ ❗️ 번호 {key:03} 등록 반영 안 됨 (중복 등)")
+                if verifier.settled:
+                    checkpoint.confirm(verifier.highest, list_count)
+
+               # 차단 갯수 초과 팝업 확인 (한도에 닿은 회차에서 한 번만 확인하고 루프를 끝낸다)
+
+                if limit.update(list_count):
+                    try:
+                        popup = find(driver, AppiumBy.ID, 'lgt.call:id/title')
+                        print("✅ 팝업 노출 확인:", popup.text)            
                 
-                    btn_popupClose = find(driver, AppiumBy.ID, 'lgt.call:id/confirmButton')
-                    btn_popupClose.click()
+                        btn_popupClose = find(driver, AppiumBy.ID, 'lgt.call:id/confirmButton')
+                        btn_popupClose.click()
 
-                    print("✅ 팝업 닫기 완료! 스크립트 실행 끝!")
+                        print("✅ 팝업 닫기 완료! 스크립트 실행 끝!")
 
-                except Exception as e:
-                       print(f"❌ 팝업 미노출 또는 닫기 실패: {e}")
+                    except Exception as e:
+                           print(f"❌ 팝업 미노출 또는 닫기 실패: {e}")
+        end_iterations()
+        checkpoint.finish()
 
+        save_wait_profile()
+        release_hot_driver(hot, driver)
+        print_cache_stats()
         end_time = datetime.now()
         print(f"🔥 스크립트 종료: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"🔥 총 소요 시간: {end_time - start_time}")   
         
     finally:
-        driver.quit()
+        quit_driver(driver)
 
 if __name__ == "__main__":
     add_spam_number()
\ No newline at end of file
@@ -1,12 +1,22 @@
-import time, sys, os
+import asyncio
+import sys, os
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, BASE_DIR)
 
-from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
 from appium.options.android import UiAutomator2Options
-from utils.util import find
+from utils.util import (
+    find, which_of, exists, tap, recheck_taps, print_cache_stats,
+    load_wait_profile, save_wait_profile, wait_until,
+)
+from utils.async_driver import AsyncDriver, AsyncElement
+from utils.fast_fill import FastFill, fast_fill_enabled, handover_count, tap_point
+from utils.session import apply_port_caps, create_driver, quit_driver, mark_iteration
+from utils.timing import journal, span, end_iterations
+from utils.checkpoint import Checkpoint
+from utils.watchdog import Watchdog
+from utils.limit import LimitLoop
 from datetime import datetime
 
 # ===============================================================
@@ -16,6 +26,24 @@ from datetime import datetime
 # - ✨ 실행 전 확인 사항
 # - 앱 실행 > 안심설정 > 번호 직접 차단 or 차단제외 번호 설정 진입한 후 스크립트 실행
 
+MAX_COUNT = 100
+INPUT_FIELD = (AppiumBy.ID, 'com.lguplus.spamcallnoti:id/id_et_inputtxt')
+LIMIT_POPUP = (AppiumBy.ID, 'com.lguplus.spamcallnoti:id/id_tv_dialog_content_center')
+REGISTER_BUTTON = (AppiumBy.ID, 'com.lguplus.spamcallnoti:id/id_btn_dialog_pos')
+# 빠른 채우기에서 입력 다이얼로그가 열리고 닫히기를 기다리는 디바이스 측 대기(초)
+DIALOG_PAUSE = 0.4
+
+
+async def _type_and_find_register(adriver, field_id, text):
+    # 입력창 입력(화면 변경)과 같은 다이얼로그의 등록 버튼 조회(읽기)는 서로 독립이라
+    # 겹쳐 보내 회차마다 조회 왕복 한 번을 숨긴다. → 등록 버튼 요소 ID
+    field = AsyncElement(adriver, field_id)
+
+    async def _type():
+        await field.click()
+        await field.send_keys(text)
+    _, button = await asyncio.gather(_type(), adriver.find(*REGISTER_BUTTON))
+    return button.id
 
 
 def add_spam_number():
@@ -39,55 +67,171 @@ def add_spam_number():
         "fullReset": False      # 앱 제거 후 재설치 방지
     }
 
-    options = UiAutomator2Options().load_capabilities(caps)
+    options = UiAutomator2Options().load_capabilities(apply_port_caps(caps))
 
-    driver = webdriver.Remote("http://localhost:4723", options=options)
+    driver = create_driver(options)
+    # 입력과 등록 버튼 조회를 겹쳐 보낼 연결 풀 (루프 내내 재사용)
+    adriver = AsyncDriver(driver)
 
     try:
         start_time = datetime.now()
         print(f"🔥 스크립트 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
-        # 1부터 100까지 등록 (101은 팝업 확인용)
-        for i in range(1, 102):
-
-            # 세 자리 숫자로 입력
-            padded_number = f"{i:03}" 
-
-            btn_add_number = find(driver, AppiumBy.ACCESSIBILITY_ID, '시작번호 추가 버튼')
-            btn_add_number.click()
-
-            input_field = find(driver, AppiumBy.ID, 'com.lguplus.spamcallnoti:id/id_et_inputtxt')
-            input_field.click()
-
-            input_field.send_keys(str(padded_number))
-
-            btn_register = find(driver, AppiumBy.ID, 'com.lguplus.spamcallnoti:id/id_btn_dialog_pos')
-            btn_register.click()
-
-            if i <= 100 :
+        load_wait_profile('spamcallnoti_add_spam_number')
+
+        # 빠른 채우기로 입력한 마지막 번호 (그 번호까지는 Appium 루프를 건너뛴다)
+        fast_until = 0
+        # 빠른 채우기로 입력만 하고 반영은 확인하지 못한 건수. 등록 개수 카운터가 없는 화면이라
+        # 빠진 번호는 알 수 없으므로, 그만큼 번호를 더 이어 가며 한도 팝업이 뜰 때까지 등록한다.
+        filled = 0
+        # 빠른 채우기 좌표는 이번 실행의 첫 Appium 회차에서 익힌다. (이어서 실행해도 마찬가지)
+        first_appium = True
+
+        # 등록 개수 카운터가 없는 화면이라 중단된 실행은 체크포인트의 다음 번호부터 이어서 한다.
+        checkpoint = Checkpoint('com.lguplus.spamcallnoti', 'spam_number')
+        first = checkpoint.begin(1)
+
+        # 등록 버튼까지 누른 마지막 번호 (카운터가 없어 장애 후 반영 여부를 이걸로 판단한다)
+        submitted = 0
+
+        # 등록 개수 카운터가 없어 한도 도달은 한도 팝업이 뜨는 것으로 판단한다.
+        # (이미 등록된 번호가 있으면 100회차 전에 팝업이 떠서 거기서 멈춘다)
+        limit = LimitLoop(MAX_COUNT)
+
+        def verify_limit_popup(popup):
+            limit.stop()
+            try:
+                print("✅ 팝업 노출 확인:", popup.text)
+
+                btn_popup_add = find(driver, *REGISTER_BUTTON)
+                btn_popup_add.click()
+
+                print("✅ 번호 추가 후 팝업 닫기 완료! 스크립트 실행 끝!")
+
+            except Exception as e:
+                print(f"❌ 팝업 미노출 또는 닫기 실패: {e}")
+
+        def wait_dialog_result():
+            # 등록 탭 후 입력 다이얼로그가 닫히거나(반영) 한도 팝업이 뜰 때까지 대기
+            # → 한도 팝업 요소 / 닫혔으면 None
+            # (한도 팝업은 입력 다이얼로그를 대신하거나 그 위에 모달로 떠서 입력창이 조회되지 않는다)
+            def _settled():
+                if driver.find_elements(*INPUT_FIELD):
+                    return False
+                popups = driver.find_elements(*LIMIT_POPUP)
+                return popups[0] if popups else 'closed'
+            result = wait_until(_settled, step='dialog_close', required=False)
+            if result == 'closed':
+                journal.inserted()
+                return None
+            if result is None:
+                recheck_taps()
+            return result
+
+        def close_dialog(i):
+            # 장애 때 열려 있던 입력 다이얼로그는 닫고 같은 번호부터 다시 등록한다.
+            if exists(driver, *INPUT_FIELD):
+                driver.back()
+                return False
+            if submitted == i:
+                journal.add_entries()
+                checkpoint.confirm(i)
+                return True
+            return False
+
+        # UiAutomator2 크래시 등 일시적인 장애는 세션을 다시 만들고 실패한 번호부터 이어서 진행한다.
+        watchdog = Watchdog(driver, options, on_recover=close_dialog)
+
+        def numbers():
+            # 1부터 100까지 등록 (101은 팝업 확인용). 빠른 채우기에서 빠졌을 수 있는 건수만큼 더 이어 가고,
+            # 한도 팝업을 확인하면 거기서 끝낸다.
+            i = first
+            while i <= MAX_COUNT + 1 + filled and not limit.reached:
+                yield i
+                i += 1
+
+        for i in watchdog.attempts(limit.items(numbers())):
+            with watchdog.step(i):
+                if i <= fast_until:
+                    continue
+                mark_iteration()
+                last_try = i == MAX_COUNT + 1 + filled
+
+                # 세 자리 숫자로 입력
+                padded_number = f"{i:03}" 
+
+                # 이번 실행의 첫 번호를 Appium으로 등록하면서 빠른 채우기에 쓸 좌표를 익혀 둔다.
+                # 다이얼로그가 떠 있으면 아래 화면은 조회되지 않아 추가 버튼은 먼저 잡는다.
+                fill_steps = None
+                learn = first_appium and fast_fill_enabled() and i < MAX_COUNT - handover_count()
+                if learn:
+                    add_point = tap_point(find(driver, AppiumBy.ACCESSIBILITY_ID, '시작번호 추가 버튼'))
+
+                # 추가 버튼은 목록 화면에 고정되어 있어 좌표를 캐시해 탭하고, 입력 다이얼로그는
+                # 매번 새로 뜨므로 캐시하지 않는다.
+                tap(driver, AppiumBy.ACCESSIBILITY_ID, '시작번호 추가 버튼')
+
+                # 입력 다이얼로그 대신 한도 팝업이 떠 있으면 남은 번호는 건너뛰고 팝업을 확인한다.
+                shown, element = which_of(driver, [INPUT_FIELD, LIMIT_POPUP], timeout=10)
+                if shown == 1:
+                    verify_limit_popup(element)
+                    continue
+                input_field = element if shown == 0 else find(driver, *INPUT_FIELD)
+                with span('type'):
+                    button_id = adriver.run(
+                        lambda a: _type_and_find_register(a, input_field.id, str(padded_number)))
+                btn_register = driver.create_web_element(button_id)
+
+                if learn:
+                    fill_steps = [
+                        ('tap', add_point), ('pause', DIALOG_PAUSE),
+                        ('tap', tap_point(input_field)), ('text', None),
+                        ('tap', tap_point(btn_register)), ('pause', DIALOG_PAUSE),
+                    ]
+                with span('tap'):
+                    btn_register.click()
+                submitted = i
+
+                # 고정 sleep 대신 입력 다이얼로그가 실제로 닫힐 때까지만 기다린다.
+                # 이미 등록된 번호가 있어 이 번호에서 한도 팝업이 뜨면 이 번호는 등록되지 않았으므로
+                # 완료로 기록하지 않고 팝업을 확인한 뒤 끝낸다.
+                popup = wait_dialog_result()
+                if popup is not None:
+                    verify_limit_popup(popup)
+                    continue
+
+                first_appium = False
+                if last_try:
+                    # 101번째(빠른 채우기에서 빠졌을 수 있는 건수만큼 더 이어 간 뒤)에도 한도 팝업이 뜨지 않은 경우
+                    print("❌ 팝업 미노출 또는 닫기 실패: 한도 팝업이 나타나지 않았습니다.")
+                    continue
                 print(f"🕹️ 번호 {i} 등록 완료!")
-            
-            time.sleep(0.5)
-
-           # 차단 갯수 초과 팝업 확인
-            if i > 100:
-                try:
-                    popup = find(driver, AppiumBy.ID, 'com.lguplus.spamcallnoti:id/id_tv_dialog_content_center')
-                    print("✅ 팝업 노출 확인:", popup.text)            
-                
-                    btn_popup_add = find(driver, AppiumBy.ID, 'com.lguplus.spamcallnoti:id/id_btn_dialog_pos')
-                    btn_popup_add.click()
-
-                    print("✅ 번호 추가 후 팝업 닫기 완료! 스크립트 실행 끝!")
-
-                except Exception as e:
-                       print(f"❌ 팝업 미노출 또는 닫기 실패: {e}")
-
+                journal.add_entries()
+                checkpoint.confirm(i)
+
+                if fill_steps:
+                    # 등록 개수 카운터가 없는 화면이라 반영 확인 없이 입력만 한다. 입력한 번호는 등록으로
+                    # 세지 않고(journal), 체크포인트에는 이어서 실행할 다음 번호 위치로만 남긴다.
+                    # 탭이 씹혀 빠진 번호는 Appium 루프가 한도 팝업이 뜰 때까지 번호를 더 이어 가며 채운다.
+                    last = MAX_COUNT - handover_count()
+                    with span('fast_fill'):
+                        attempted, _ = FastFill(fill_steps).run(f"{n:03}" for n in range(i + 1, last + 1))
+                    fast_until = i + attempted
+                    filled = attempted
+                    checkpoint.confirm(fast_until)
+                    print(f"⚡ 빠른 채우기 완료: 번호 {i + 1}~{fast_until} 입력 — 반영은 확인하지 못해 "
+                          f"이후는 Appium으로 한도 팝업이 뜰 때까지 진행합니다.")
+        end_iterations()
+        checkpoint.finish()
+
+        save_wait_profile()
+        print_cache_stats()
         end_time = datetime.now()
         print(f"🔥 스크립트 종료: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"🔥 총 소요 시간: {end_time - start_time}")    
     finally:
-        driver.quit()
+        adriver.close()
+        quit_driver(driver)
 
 if __name__ == "__main__":
     add_spam_number()
\ No newline at end of file
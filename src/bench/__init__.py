@@ -0,0 +1,2 @@
+from src.bench.apps import AppSimulator, Element, ElementError
+from src.bench.fake_server import FakeAppiumServer
@@ -0,0 +1,689 @@
+"""벤치마크용 앱 화면 시뮬레이터
+
+스크립트가 보는 화면(입력창, 등록 버튼, 카운터 문구, 한도 팝업)을 요소
+목록으로 흉내 내고, 클릭/입력/뒤로가기에 실제 앱처럼 반응한다.
+locator 해석(id, accessibility id, class name, UiSelector, XPath, iOS class
+chain / predicate)과 page_source XML 생성도 여기서 한다.
+"""
+import itertools
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+ANDROID_EDIT = 'android.widget.EditText'
+ANDROID_TEXT = 'android.widget.TextView'
+ANDROID_BUTTON = 'android.widget.Button'
+ANDROID_VIEW = 'android.view.View'
+IOS_FIELD = 'XCUIElementTypeTextField'
+IOS_TEXT = 'XCUIElementTypeStaticText'
+IOS_BUTTON = 'XCUIElementTypeButton'
+
+KEYCODE_BACK = 4
+KEYCODE_A = 29
+KEYCODE_DEL = 67
+KEYCODE_PASTE = 279
+META_CTRL_ON = 0x1000
+
+_element_ids = itertools.count(1)
+
+
+class ElementError(Exception):
+    """W3C 오류 코드와 함께 던지는 시뮬레이터 오류 (서버가 HTTP 오류 응답으로 바꾼다)"""
+
+    def __init__(self, error, message):
+        super().__init__(message)
+        self.error = error
+
+
+class Element:
+    """화면 요소 하나. 다시 그려지는 화면(다이얼로그 등)은 열 때마다 새로 만든다."""
+
+    def __init__(self, app, tag, text='', resource_id='', desc='', editable=False, hint='',
+                 on_click=None, accepts_set_value=True):
+        self.id = f"fake-{next(_element_ids)}"
+        self.app = app
+        self.tag = tag
+        self.text = text
+        self.resource_id = resource_id
+        self.desc = desc
+        self.editable = editable
+        self.hint = hint
+        self.on_click = on_click
+        self.accepts_set_value = accepts_set_value
+        self.rect = app.next_rect()
+
+    @property
+    def shown_text(self):
+        # Android 입력창은 비어 있으면 힌트 문구를 text로 보여준다.
+        if self.editable and not self.text and self.app.platform == 'android':
+            return self.hint
+        return self.text
+
+    def attributes(self):
+        if self.app.platform == 'ios':
+            name = self.desc or self.text or self.hint
+            label = self.text if self.tag != IOS_FIELD else (self.text or self.hint)
+            return {'type': self.tag, 'name': name, 'label': label, 'value': self.text,
+                    'placeholderValue': self.hint if self.editable else None}
+        return {
+            'class': self.tag,
+            'resource-id': self.resource_id,
+            'text': self.shown_text,
+            'content-desc': self.desc,
+            'package': self.app.package,
+            'hint': self.hint if self.editable else None,
+        }
+
+    def get_attribute(self, name):
+        attrs = self.attributes()
+        aliases = {'contentDescription': 'content-desc', 'resourceId': 'resource-id', 'className': 'class'}
+        value = attrs.get(aliases.get(name, name))
+        if value is None and name in ('displayed', 'enabled', 'clickable', 'visible'):
+            return 'true'
+        return value
+
+    def visible_text(self):
+        if self.app.platform == 'ios':
+            return self.text or self.hint or self.desc
+        return self.shown_text
+
+
+class AppSimulator:
+    """앱 하나의 화면 상태
+
+    reaction : 등록 탭 후 화면(카운터 등)에 반영되기까지 걸리는 시간(초)
+    growth : 목록 한 건당 반영 시간 증가(초). 목록이 찰수록 느려지는 앱 흉내
+    """
+
+    platform = 'android'
+    package = ''
+    activity = ''
+
+    def __init__(self, reaction=0.0, growth=0.0):
+        self.reaction = reaction
+        self.growth = growth
+        self.keyboard = False
+        self.focused = None
+        self.clipboard = ''
+        self.selected = False
+        self.lock = threading.RLock()
+        self._pending = []
+        self._slot = 0
+
+    # -------------------------------------------------------------
+    # 화면 구성 (하위 클래스 구현)
+    # -------------------------------------------------------------
+    def screen(self):
+        raise NotImplementedError
+
+    @property
+    def size(self):
+        return 0
+
+    def next_rect(self):
+        self._slot += 1
+        return {'x': 40, 'y': 100 + 80 * self._slot, 'width': 640, 'height': 60}
+
+    # -------------------------------------------------------------
+    # 반영 지연
+    # -------------------------------------------------------------
+    def later(self, callback):
+        delay = self.reaction + self.growth * self.size
+        if delay <= 0:
+            callback()
+        else:
+            self._pending.append((time.monotonic() + delay, callback))
+
+    def tick(self):
+        now = time.monotonic()
+        due = [item for item in self._pending if item[0] <= now]
+        self._pending = [item for item in self._pending if item[0] > now]
+        for _, callback in sorted(due, key=lambda item: item[0]):
+            callback()
+
+    def visible(self):
+        self.tick()
+        return list(self.screen())
+
+    # -------------------------------------------------------------
+    # 조작
+    # -------------------------------------------------------------
+    def element(self, element_id):
+        for element in self.visible():
+            if element.id == element_id:
+                return element
+        raise ElementError('stale element reference', f"요소 {element_id}가 화면에 없습니다.")
+
+    def click(self, element):
+        if element.editable:
+            self.selected = False
+            self.focused = element
+            self.keyboard = True
+        if element.on_click:
+            element.on_click()
+
+    def tap_at(self, x, y):
+        for element in reversed(self.visible()):
+            rect = element.rect
+            if rect['x'] <= x <= rect['x'] + rect['width'] and rect['y'] <= y <= rect['y'] + rect['height']:
+                self.click(element)
+                return
+        raise ElementError('invalid argument', f"({x}, {y})에 요소가 없습니다.")
+
+    def set_value(self, element, text):
+        if not element.editable:
+            raise ElementError('invalid element state', "입력할 수 없는 요소입니다.")
+        if not element.accepts_set_value:
+            raise ElementError('invalid element state', "setText를 지원하지 않는 입력창입니다.")
+        self.focused = element
+        # UiAutomator2 setText는 내용을 바꾸고, XCUITest는 커서 위치에 이어서 입력한다.
+        element.text = element.text + text if self.platform == 'ios' else text
+
+    def type_focused(self, text):
+        if self.focused is None or self.focused not in self.visible():
+            raise ElementError('invalid element state', "포커스된 입력창이 없습니다.")
+        if self.selected:
+            self.focused.text = ''
+            self.selected = False
+        self.focused.text += text
+
+    def clear(self, element):
+        # UiAutomator2 clear는 setText("")라 setText를 거부하는 입력창은 지우지 못한다.
+        if element.editable and not element.accepts_set_value and self.platform == 'android':
+            raise ElementError('invalid element state', "setText를 지원하지 않는 입력창입니다.")
+        if element.editable:
+            element.text = ''
+
+    def press_key(self, keycode, metastate=0):
+        if keycode == KEYCODE_A and metastate & META_CTRL_ON:
+            self.selected = self.focused is not None
+        elif keycode == KEYCODE_DEL:
+            if self.focused is not None and self.focused in self.visible():
+                self.focused.text = '' if self.selected else self.focused.text[:-1]
+            self.selected = False
+        elif keycode == KEYCODE_PASTE:
+            self.type_focused(self.clipboard)
+        elif keycode == KEYCODE_BACK:
+            if self.keyboard:
+                self.keyboard = False
+            else:
+                self.back()
+
+    def hide_keyboard(self):
+        self.keyboard = False
+
+    def back(self):
+        pass
+
+    def source(self):
+        elements = self.visible()
+        if self.platform == 'ios':
+            root = ET.Element('AppiumAUT')
+            parent = ET.SubElement(root, 'XCUIElementTypeApplication',
+                                   {'type': 'XCUIElementTypeApplication', 'name': self.package})
+        else:
+            root = parent = ET.Element('hierarchy', {'rotation': '0'})
+        for index, element in enumerate(elements):
+            attrs = {key: str(value) for key, value in element.attributes().items()}
+            rect = element.rect
+            if self.platform == 'ios':
+                attrs.update({key: str(rect[key]) for key in ('x', 'y', 'width', 'height')})
+            else:
+                attrs['index'] = str(index)
+                attrs['bounds'] = (f"[{rect['x']},{rect['y']}]"
+                                   f"[{rect['x'] + rect['width']},{rect['y'] + rect['height']}]")
+            ET.SubElement(parent, element.tag, attrs)
+        return "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>" + ET.tostring(root, encoding='unicode')
+
+    def source_tree(self):
+        """WebDriverAgent /source?format=json 형식의 화면 트리 (iOS)
+
+        type은 WDA처럼 XCUIElementType 접두사를 뺀 이름이다.
+        """
+        def node(tag, **attrs):
+            return dict(attrs, type=tag[len('XCUIElementType'):] if tag.startswith('XCUIElementType') else tag)
+        children = []
+        for element in self.visible():
+            attrs = element.attributes()
+            children.append(node(element.tag, name=attrs.get('name'), label=attrs.get('label'),
+                                 value=attrs.get('value'), rect=dict(element.rect)))
+        return dict(node('XCUIElementTypeApplication', name=self.package, label=None, value=None),
+                    children=children)
+
+    # -------------------------------------------------------------
+    # locator 해석
+    # -------------------------------------------------------------
+    def find(self, using, value):
+        elements = self.visible()
+        if using == 'id':
+            return [el for el in elements if el.resource_id == value]
+        if using == 'accessibility id':
+            if self.platform == 'ios':
+                return [el for el in elements if el.attributes()['name'] == value]
+            return [el for el in elements if el.desc == value]
+        if using == 'class name':
+            return [el for el in elements if el.tag == value]
+        if using == '-android uiautomator':
+            return _ui_selector(elements, value)
+        if using == 'xpath':
+            return _xpath(self, elements, value)
+        # WebDriverAgent는 같은 locator를 'class chain' / 'predicate string'으로 받는다.
+        if using in ('-ios class chain', 'class chain'):
+            return _class_chain(elements, value)
+        if using in ('-ios predicate string', 'predicate string'):
+            return [el for el in elements if _predicate(el, value)]
+        raise ElementError('invalid selector', f"지원하지 않는 locator: {using}")
+
+
+# =============================================================
+# locator 해석 함수
+# =============================================================
+_UI_CALL = re.compile(r'\.(\w+)\((?:"((?:[^"\\]|\\.)*)"|(\d+)|(true|false))?\)')
+
+
+def _ui_selector(elements, value):
+    matched = elements
+    instance = None
+    for method, text, number, _ in _UI_CALL.findall(value):
+        if method == 'instance':
+            instance = int(number)
+        elif method == 'text':
+            matched = [el for el in matched if el.visible_text() == text]
+        elif method == 'textStartsWith':
+            matched = [el for el in matched if el.visible_text().startswith(text)]
+        elif method == 'textContains':
+            matched = [el for el in matched if text in el.visible_text()]
+        elif method == 'textMatches':
+            matched = [el for el in matched if re.fullmatch(text, el.visible_text())]
+        elif method == 'className':
+            matched = [el for el in matched if el.tag == text]
+        elif method == 'resourceId':
+            matched = [el for el in matched if el.resource_id == text]
+        elif method == 'description':
+            matched = [el for el in matched if el.desc == text]
+    if instance is not None:
+        return matched[instance:instance + 1]
+    return matched
+
+
+_XPATH_INDEX = re.compile(r'^\((.+)\)\[(\d+)\]$')
+
+
+def _xpath(app, elements, value):
+    root = ET.fromstring(app.source().split('?>', 1)[-1])
+    by_node = {}
+    nodes = list(root.iter())[1:]
+    if app.platform == 'ios':
+        nodes = nodes[1:]  # XCUIElementTypeApplication
+    for node, element in zip(nodes, elements):
+        by_node[id(node)] = element
+
+    found = set()
+    for part in value.split(' | '):
+        part = part.strip()
+        index = None
+        match = _XPATH_INDEX.match(part)
+        if match:
+            part, index = match.group(1), int(match.group(2))
+        try:
+            result = root.findall('.' + part if part.startswith('//') else part)
+        except SyntaxError as e:
+            raise ElementError('invalid selector', f"XPath 해석 실패: {value} ({e})")
+        if index is not None:
+            result = result[index - 1:index]
+        found.update(id(node) for node in result)
+    # 합집합 결과는 문서 순서
+    return [by_node[id(node)] for node in nodes if id(node) in found and id(node) in by_node]
+
+
+def _class_chain(elements, value):
+    match = re.match(r'^\*\*/(\w+)(?:\[(\d+)\])?$', value)
+    if not match:
+        raise ElementError('invalid selector', f"지원하지 않는 class chain: {value}")
+    matched = [el for el in elements if el.tag == match.group(1)]
+    if match.group(2):
+        index = int(match.group(2))
+        return matched[index - 1:index]
+    return matched
+
+
+def _predicate(element, value):
+    attrs = element.attributes()
+    for clause in re.split(r'\s+AND\s+', value, flags=re.IGNORECASE):
+        match = re.match(r'^\s*(\w+)\s*(==|BEGINSWITH|CONTAINS|MATCHES)\s*[\'"](.*)[\'"]\s*$', clause)
+        if not match:
+            raise ElementError('invalid selector', f"지원하지 않는 predicate: {value}")
+        name, operator, expected = match.groups()
+        actual = str(attrs.get(name) or '')
+        if operator == '==' and actual != expected:
+            return False
+        if operator == 'BEGINSWITH' and not actual.startswith(expected):
+            return False
+        if operator == 'CONTAINS' and expected not in actual:
+            return False
+        if operator == 'MATCHES' and not re.fullmatch(expected, actual):
+            return False
+    return True
+
+
+# =============================================================
+# 앱 시뮬레이터
+# =============================================================
+class _ListApp(AppSimulator):
+    """입력창 + 등록 버튼 + 개수 카운터 + 한도 팝업으로 이루어진 목록 화면 공통 부분
+
+    popup_on_full : True면 한도에 도달하는 순간 팝업, False면 한도를 넘는 등록 시도에 팝업
+    visible_rows : 화면에 보이는 목록 행 수 (최근 등록 순, 0이면 목록을 그리지 않음)
+    lose : 반영하지 않고 흘려버릴 등록 순번(1부터) — 탭이 씹히는 앱 흉내
+    """
+
+    limit = 600
+    popup_on_full = True
+    visible_rows = 0
+
+    def __init__(self, prefill=0, lose=(), **kwargs):
+        super().__init__(**kwargs)
+        self.items = [f"기존항목{n}" for n in range(prefill)]
+        self.popup = None
+        self.lose = set(lose)
+        self._attempts = 0
+        self._rows = []
+
+    def rows(self):
+        """최근 등록 항목부터 visible_rows개의 목록 행"""
+        if not self._rows and self.visible_rows:
+            tag = IOS_TEXT if self.platform == 'ios' else ANDROID_TEXT
+            self._rows = [Element(self, tag) for _ in range(self.visible_rows)]
+        shown = self.items[::-1][:self.visible_rows]
+        for row, item in zip(self._rows, shown):
+            row.text = item
+        return self._rows[:len(shown)]
+
+    @property
+    def size(self):
+        return len(self.items)
+
+    def _popup_elements(self):
+        raise NotImplementedError
+
+    def _close_popup(self):
+        self.popup = None
+
+    def _show_popup(self):
+        self.popup = self._popup_elements()
+
+    def register(self, field):
+        value = field.text.strip()
+        if not value:
+            return
+        if len(self.items) >= self.limit:
+            self._show_popup()
+            return
+        field.text = ''
+        self._attempts += 1
+        if value in self.items or self._attempts in self.lose:
+            return  # 중복은 목록에 반영되지 않는다.
+
+        def _commit():
+            self.items.append(value)
+            if self.popup_on_full and len(self.items) >= self.limit:
+                self._show_popup()
+        self.later(_commit)
+
+    def back(self):
+        if self.popup:
+            self._close_popup()
+
+
+class IxioSpamListApp(_ListApp):
+    """익시오 - 스팸 번호 추가 (Android / iOS)"""
+
+    package = 'com.lguplus.aicallagent'
+    activity = '.MainActivity'
+    limit = 600
+    visible_rows = 8
+
+    def __init__(self, platform='android', **kwargs):
+        self.platform = platform
+        super().__init__(**kwargs)
+        if platform == 'ios':
+            self.field = Element(self, IOS_FIELD, hint='번호 입력', editable=True)
+            self.button = Element(self, IOS_BUTTON, desc='등록', text='등록',
+                                  on_click=lambda: self.register(self.field))
+            self.total_label = Element(self, IOS_TEXT, text='전체')
+            self.count_label = Element(self, IOS_TEXT)
+            self.limit_label = Element(self, IOS_TEXT, text=f'/{self.limit}')
+        else:
+            self.field = Element(self, ANDROID_EDIT, hint='번호를 입력하세요', editable=True)
+            self.button = Element(self, ANDROID_TEXT, text='등록', on_click=lambda: self.register(self.field))
+            self.counter = Element(self, ANDROID_TEXT)
+
+    def _popup_elements(self):
+        if self.platform == 'ios':
+            return [Element(self, IOS_TEXT, text='더 이상 추가할 수 없어요', desc='더 이상 추가할 수 없어요'),
+                    Element(self, IOS_BUTTON, text='확인', desc='확인', on_click=self._close_popup)]
+        return [Element(self, ANDROID_TEXT, text='더 이상 추가할 수 없어요'),
+                Element(self, ANDROID_BUTTON, text='확인', on_click=self._close_popup)]
+
+    def screen(self):
+        if self.platform == 'ios':
+            self.count_label.text = str(len(self.items))
+            elements = [self.field, self.button, self.total_label, self.count_label, self.limit_label]
+        else:
+            self.counter.text = f"전체 {len(self.items)}/{self.limit}"
+            elements = [self.field, self.button, self.counter]
+        return elements + self.rows() + (self.popup or [])
+
+
+class IxioSpamWordsApp(_ListApp):
+    """익시오 - 스팸 단어 추가 (차단 300 / 차단하지 않을 단어 200)"""
+
+    package = 'com.lguplus.aicallagent'
+    activity = '.MainActivity'
+    popup_on_full = False
+    visible_rows = 8
+
+    def __init__(self, allow=False, **kwargs):
+        self.limit = 200 if allow else 300
+        super().__init__(**kwargs)
+        self.title = Element(self, ANDROID_TEXT, text='차단하지 않을 단어' if allow else '차단 단어')
+        self.field = Element(self, ANDROID_EDIT, hint='단어를 입력하세요', editable=True)
+        self.button = Element(self, ANDROID_TEXT, text='추가', on_click=lambda: self.register(self.field))
+        self.counter = Element(self, ANDROID_TEXT)
+
+    def _popup_elements(self):
+        # 닫기 버튼은 className("android.view.View").instance(3)으로 찾는다.
+        return [Element(self, ANDROID_VIEW), Element(self, ANDROID_VIEW),
+                Element(self, ANDROID_TEXT, text='더 이상 추가할 수 없어요'),
+                Element(self, ANDROID_VIEW),
+                Element(self, ANDROID_VIEW, desc='닫기', on_click=self._close_popup)]
+
+    def screen(self):
+        self.counter.text = f"전체 {len(self.items)}/{self.limit}"
+        return [self.title, self.field, self.button, self.counter] + self.rows() + (self.popup or [])
+
+
+class IxioGreetingApp(AppSimulator):
+    """익시오 - 인사말 추가. '인사말 추가' → 바텀시트 입력 → '확인'으로 닫힘
+
+    Android 바텀시트 입력창은 실제 앱처럼 setText(send_keys)를 거부한다.
+    """
+
+    package = 'com.lguplus.aicallagent'
+    activity = '.MainActivity'
+
+    def __init__(self, platform='android', **kwargs):
+        self.platform = platform
+        super().__init__(**kwargs)
+        self.greetings = []
+        self.sheet = None
+        if platform == 'ios':
+            self.add_button = Element(self, IOS_BUTTON, text='인사말 추가', desc='인사말 추가',
+                                      on_click=self._open_sheet)
+            self.save_button = Element(self, IOS_BUTTON, text='저장', desc='저장')
+        else:
+            self.add_button = Element(self, ANDROID_TEXT, text='인사말 추가', on_click=self._open_sheet)
+            self.save_button = Element(self, ANDROID_TEXT, text='저장')
+
+    @property
+    def size(self):
+        return len(self.greetings)
+
+    def _open_sheet(self):
+        if self.sheet is not None:
+            return
+        if self.platform == 'ios':
+            field = Element(self, IOS_FIELD, hint='인사말을 입력하세요', desc='인사말을 입력하세요',
+                            editable=True)
+            confirm = Element(self, IOS_BUTTON, text='확인', desc='확인')
+            self.sheet = [field, confirm]
+        else:
+            title = Element(self, ANDROID_EDIT, text='인사말 제목', editable=True)
+            field = Element(self, ANDROID_EDIT, hint='인사말을 입력하세요', editable=True,
+                            accepts_set_value=False)
+            confirm = Element(self, ANDROID_TEXT, text='확인')
+            self.sheet = [title, field, confirm]
+        confirm.on_click = lambda: self._confirm(field)
+
+    def _confirm(self, field):
+        value = field.text.strip()
+        if not value:
+            return
+
+        def _commit():
+            self.greetings.append(value)
+            self.sheet = None
+            self.keyboard = False
+        self.later(_commit)
+
+    def back(self):
+        self.sheet = None
+
+    def screen(self):
+        return [self.add_button, self.save_button] + (self.sheet or [])
+
+
+class MobileManagerWordsApp(_ListApp):
+    """모바일매니저 - 스팸 단어 추가 (차단 300 / 차단하지 않을 단어 200)"""
+
+    package = 'lgt.call'
+    activity = '.Main'
+    popup_on_full = False
+    visible_rows = 8
+
+    def __init__(self, allow=False, **kwargs):
+        self.limit = 200 if allow else 300
+        super().__init__(**kwargs)
+        self.title = Element(self, ANDROID_TEXT, resource_id='lgt.call:id/appbar_title',
+                             text='차단하지 않을 단어 관리' if allow else '차단 단어 관리')
+        self.field = Element(self, ANDROID_EDIT, resource_id='lgt.call:id/edit_text', editable=True)
+        self.button = Element(self, ANDROID_BUTTON, text='등록하기', on_click=lambda: self.register(self.field))
+        self.counter = Element(self, ANDROID_TEXT, resource_id='lgt.call:id/list_size')
+
+    def _popup_elements(self):
+        return [Element(self, ANDROID_TEXT, resource_id='lgt.call:id/title', text='더 이상 등록할 수 없습니다'),
+                Element(self, ANDROID_BUTTON, resource_id='lgt.call:id/confirmButton', text='확인',
+                        on_click=self._close_popup)]
+
+    def screen(self):
+        self.counter.text = str(len(self.items))
+        return [self.title, self.field, self.button, self.counter] + self.rows() + (self.popup or [])
+
+
+class MobileManagerNumberApp(_ListApp):
+    """모바일매니저 - 스팸 번호 추가 (600개, 한도 도달 시 팝업)"""
+
+    package = 'lgt.call'
+    activity = '.Main'
+    limit = 600
+    visible_rows = 8
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.field = Element(self, ANDROID_EDIT, resource_id='lgt.call:id/spam_number_allow_block_edit_number',
+                             editable=True)
+        self.button = Element(self, ANDROID_BUTTON,
+                              resource_id='lgt.call:id/spam_number_allow_block_register_button',
+                              text='등록', on_click=lambda: self.register(self.field))
+        self.counter = Element(self, ANDROID_TEXT, resource_id='lgt.call:id/spam_number_block_list_count')
+
+    def _popup_elements(self):
+        return [Element(self, ANDROID_TEXT, resource_id='lgt.call:id/title', text='더 이상 등록할 수 없습니다'),
+                Element(self, ANDROID_BUTTON, resource_id='lgt.call:id/confirmButton', text='확인',
+                        on_click=self._close_popup)]
+
+    def screen(self):
+        self.counter.text = str(len(self.items))
+        return [self.field, self.button, self.counter] + self.rows() + (self.popup or [])
+
+
+class SpamcallnotiApp(AppSimulator):
+    """스팸전화알림 - 번호 직접 차단 (100개). 추가 버튼 → 입력 다이얼로그 → 등록
+
+    한도를 넘는 등록 시도에는 입력 다이얼로그 대신 안내 다이얼로그가 뜬다.
+    다이얼로그는 모달이라 떠 있는 동안 아래 목록 화면(추가 버튼)은 조회되지 않고,
+    다이얼로그 밖을 탭해도 반응하지 않는다.
+    """
+
+    package = 'com.lguplus.spamcallnoti'
+    activity = '.activity.mainactivity.MainActivity'
+    limit = 100
+    _ID = 'com.lguplus.spamcallnoti:id/'
+
+    def __init__(self, prefill=0, **kwargs):
+        super().__init__(**kwargs)
+        self.items = [f"{n:03}" for n in range(1000 - prefill, 1000)]
+        self.dialog = None
+        self._dialog_rects = None
+        self.add_button = Element(self, 'android.widget.ImageButton', desc='시작번호 추가 버튼',
+                                  on_click=self._open_dialog)
+
+    @property
+    def size(self):
+        return len(self.items)
+
+    def _open_dialog(self):
+        if self.dialog is not None:
+            return
+        field = Element(self, ANDROID_EDIT, resource_id=self._ID + 'id_et_inputtxt', editable=True)
+        button = Element(self, ANDROID_BUTTON, resource_id=self._ID + 'id_btn_dialog_pos', text='등록')
+        button.on_click = lambda: self._register(field)
+        # 다이얼로그는 매번 새로 그려지지만 위치는 같다. (빠른 채우기 좌표 탭)
+        self._dialog_rects = self._dialog_rects or (field.rect, button.rect)
+        field.rect, button.rect = self._dialog_rects
+        self.dialog = [field, button]
+
+    def _register(self, field):
+        value = field.text.strip()
+        if not value:
+            return
+
+        def _commit():
+            self.keyboard = False
+            if len(self.items) >= self.limit:
+                notice = Element(self, ANDROID_TEXT, resource_id=self._ID + 'id_tv_dialog_content_center',
+                                 text=f'최대 {self.limit}개까지 등록할 수 있습니다.')
+                confirm = Element(self, ANDROID_BUTTON, resource_id=self._ID + 'id_btn_dialog_pos', text='확인')
+                confirm.on_click = self._close_dialog
+                self.dialog = [notice, confirm]
+                return
+            self.items.append(value)
+            self.dialog = None
+        self.later(_commit)
+
+    def _close_dialog(self):
+        self.dialog = None
+
+    def tap_at(self, x, y):
+        try:
+            super().tap_at(x, y)
+        except ElementError:
+            if self.dialog is None:
+                raise
+
+    def back(self):
+        self.dialog = None
+
+    def screen(self):
+        return list(self.dialog) if self.dialog is not None else [self.add_button]
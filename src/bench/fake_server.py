@@ -0,0 +1,329 @@
+"""W3C WebDriver / Appium 흉내 서버 (오프라인 벤치마크용)
+
+scripts/의 스크립트가 쓰는 만큼의 프로토콜(세션, 요소 조회/클릭/입력/텍스트,
+page_source, 'mobile:' 확장 명령, 설정)과 직접 클라이언트가 쓰는 WDA / UiAutomator2
+서버 경로(/status의 sessionId, /sessions, /source?format=json)를 구현하고 화면 상태는
+src.bench.apps의 앱 시뮬레이터에 맡긴다. 명령마다 지연을 넣을 수 있다.
+
+    python -m src.bench.fake_server ixiO_add_spamList --port 4799 --latency 0.02
+"""
+import argparse
+import base64
+import json
+import re
+import threading
+import time
+import uuid
+from urllib.parse import parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.bench.apps import ElementError
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# W3C 오류 코드 → HTTP 상태
+_ERROR_STATUS = {
+    'no such element': 404,
+    'stale element reference': 404,
+    'unknown command': 404,
+    'unknown method': 405,
+    'invalid element state': 400,
+    'invalid argument': 400,
+    'invalid selector': 400,
+    'invalid session id': 404,
+}
+
+# 1x1 PNG (스크린샷 응답)
+_PNG = base64.b64encode(bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082'
+)).decode('ascii')
+
+
+class _Route:
+    def __init__(self, method, pattern, name, handler):
+        self.method = method
+        self.regex = re.compile('^' + re.sub(r':(\w+)', r'(?P<\1>[^/]+)', pattern) + '$')
+        self.name = name
+        self.handler = handler
+
+
+class FakeAppiumServer:
+    """앱 시뮬레이터 하나를 서비스하는 HTTP 서버
+
+    latency : 명령당 지연(초) 또는 {명령 이름: 초, 'default': 초}
+    crash_after : 이 수만큼 명령을 처리한 뒤 디바이스 서버 크래시를 흉내 낸다.
+                  (세션을 모두 지우고 instrumentation 오류 응답, utils.watchdog 확인용)
+    """
+
+    def __init__(self, app, port=0, latency=0.0, host='127.0.0.1', crash_after=None):
+        self.app = app
+        self.latency = latency if isinstance(latency, dict) else {'default': latency}
+        self.crash_after = crash_after
+        self.crashes = 0
+        self._served = 0
+        self.sessions = {}
+        self.settings = {}
+        self.stats = {}
+        self.first_request = None
+        self.last_response = None
+        self._stats_lock = threading.Lock()
+        self._routes = self._build_routes()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 작은 응답이 Nagle 지연(~40ms)에 묶이지 않도록
+            disable_nagle_algorithm = True
+
+            def _dispatch(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                status, body = server.handle(method, self.path, raw)
+                # bytes는 기록된 응답 본문 그대로 (src.bench.replay)
+                payload = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def do_DELETE(self):
+                self._dispatch('DELETE')
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-appium', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # -------------------------------------------------------------
+    # 요청 처리
+    # -------------------------------------------------------------
+    def handle(self, method, path, raw):
+        started = time.monotonic()
+        if self.first_request is None:
+            self.first_request = started
+        path, _, query = path.partition('?')
+        if path.startswith('/wd/hub'):
+            path = path[len('/wd/hub'):]
+        try:
+            params = json.loads(raw.decode('utf-8')) if raw else {}
+        except ValueError:
+            params = {}
+        # GET 쿼리(WDA /source?format=json 등)는 본문 대신 params로 넘긴다.
+        for key, value in parse_qsl(query):
+            params.setdefault(key, value)
+
+        name = 'unknown'
+        try:
+            with self._stats_lock:
+                self._served += 1
+                crash = self.crash_after is not None and self._served == self.crash_after + 1
+            if crash:
+                self.crashes += 1
+                self.sessions.clear()
+                raise ElementError('unknown error', "An unknown server-side error occurred while processing "
+                                                    "the command. Original error: The instrumentation process "
+                                                    "is not running (probably crashed)")
+            for route in self._routes:
+                match = route.regex.match(path) if route.method == method else None
+                if match:
+                    name = route.name
+                    if name == 'executeScript':
+                        name = f"executeScript:{params.get('script', '')}"
+                    args = match.groupdict()
+                    session_id = args.pop('session', None)
+                    if session_id is not None and session_id not in self.sessions:
+                        raise ElementError('invalid session id', f"세션 {session_id}가 없습니다.")
+                    delay = self.latency.get(name, self.latency.get('default', 0.0))
+                    if delay:
+                        time.sleep(delay)
+                    with self.app.lock:
+                        value = route.handler(params, **args)
+                    status, body = 200, {'value': value}
+                    if name == 'status':
+                        # WebDriverAgent처럼 지금 세션 ID도 알려 직접 클라이언트(utils.direct_client)가 붙게 한다.
+                        body['sessionId'] = next(iter(self.sessions), None)
+                    break
+            else:
+                raise ElementError('unknown command', f"{method} {path}")
+        except ElementError as e:
+            status = _ERROR_STATUS.get(e.error, 500)
+            body = {'value': {'error': e.error, 'message': str(e), 'stacktrace': ''}}
+
+        finished = time.monotonic()
+        with self._stats_lock:
+            entry = self.stats.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += finished - started
+            self.last_response = finished
+        return status, body
+
+    def command_count(self):
+        return sum(count for count, _ in self.stats.values())
+
+    def busy_seconds(self):
+        return sum(seconds for _, seconds in self.stats.values())
+
+    # -------------------------------------------------------------
+    # 라우트
+    # -------------------------------------------------------------
+    def _build_routes(self):
+        s = '/session/:session'
+        e = s + '/element/:element'
+        table = [
+            ('GET', '/status', 'status', self._status),
+            ('GET', '/sessions', 'getSessions', lambda params: [{'id': sid} for sid in self.sessions]),
+            ('POST', '/session', 'newSession', self._new_session),
+            ('DELETE', s, 'quit', self._quit),
+            ('POST', s + '/timeouts', 'setTimeouts', lambda params: None),
+            ('GET', s + '/appium/settings', 'getSettings', lambda params: dict(self.settings)),
+            ('POST', s + '/appium/settings', 'updateSettings', self._update_settings),
+            ('POST', s + '/element', 'findElement', lambda params: self._find(params, multiple=False)),
+            ('POST', s + '/elements', 'findElements', lambda params: self._find(params, multiple=True)),
+            ('POST', e + '/click', 'clickElement', self._click),
+            ('POST', e + '/value', 'sendKeysToElement', self._value),
+            ('POST', e + '/clear', 'clearElement', self._clear),
+            ('GET', e + '/text', 'getElementText', lambda params, element: self._el(element).visible_text()),
+            ('GET', e + '/rect', 'getElementRect', lambda params, element: dict(self._el(element).rect)),
+            ('GET', e + '/attribute/:name', 'getElementAttribute',
+             lambda params, element, name: self._el(element).get_attribute(name)),
+            ('GET', e + '/displayed', 'isElementDisplayed', lambda params, element: bool(self._el(element))),
+            ('GET', e + '/enabled', 'isElementEnabled', lambda params, element: bool(self._el(element))),
+            ('GET', e + '/name', 'getElementTagName', lambda params, element: self._el(element).tag),
+            ('GET', s + '/source', 'getPageSource', self._source),
+            ('POST', s + '/back', 'back', lambda params: self.app.back()),
+            ('GET', s + '/screenshot', 'screenshot', lambda params: _PNG),
+            ('GET', s + '/window/rect', 'getWindowRect',
+             lambda params: {'x': 0, 'y': 0, 'width': 1080, 'height': 2400}),
+            ('POST', s + '/execute/sync', 'executeScript', self._execute),
+        ]
+        return [_Route(*row) for row in table]
+
+    def _status(self, params):
+        return {'ready': True, 'message': 'fake appium server', 'build': {'version': 'bench'}}
+
+    def _source(self, params):
+        if params.get('format') == 'json':
+            return self.app.source_tree()
+        return self.app.source()
+
+    def _new_session(self, params):
+        requested = (params.get('capabilities') or {}).get('alwaysMatch') or {}
+        caps = {key.split(':', 1)[-1]: value for key, value in requested.items()}
+        caps.setdefault('platformName', 'iOS' if self.app.platform == 'ios' else 'Android')
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = caps
+        return {'sessionId': session_id, 'capabilities': caps}
+
+    def _quit(self, params):
+        self.sessions.clear()
+        return None
+
+    def _update_settings(self, params):
+        self.settings.update(params.get('settings') or {})
+        return None
+
+    def _el(self, element_id):
+        return self.app.element(element_id)
+
+    def _find(self, params, multiple):
+        using = params.get('using') or params.get('strategy')
+        value = params.get('value') or params.get('selector')
+        found = self.app.find(using, value)
+        if multiple:
+            return [{ELEMENT_KEY: el.id, 'ELEMENT': el.id} for el in found]
+        if not found:
+            raise ElementError('no such element', f"{using}={value} 요소를 찾을 수 없습니다.")
+        return {ELEMENT_KEY: found[0].id, 'ELEMENT': found[0].id}
+
+    def _click(self, params, element):
+        self.app.click(self._el(element))
+        return None
+
+    def _value(self, params, element):
+        text = params.get('text')
+        if text is None:
+            text = ''.join(params.get('value') or [])
+        self.app.set_value(self._el(element), text)
+        return None
+
+    def _clear(self, params, element):
+        self.app.clear(self._el(element))
+        return None
+
+    def _execute(self, params):
+        script = params.get('script', '')
+        args = (params.get('args') or [{}])
+        args = args[0] if args and isinstance(args[0], dict) else {}
+        app = self.app
+        if script in ('mobile: clickGesture', 'mobile: tap'):
+            if args.get('elementId'):
+                app.click(self._el(args['elementId']))
+            else:
+                app.tap_at(args.get('x', 0), args.get('y', 0))
+        elif script == 'mobile: type':
+            app.type_focused(args.get('text', ''))
+        elif script == 'mobile: pressKey':
+            app.press_key(int(args.get('keycode', 0)), int(args.get('metastate') or 0))
+        elif script == 'mobile: isKeyboardShown':
+            return app.keyboard
+        elif script == 'mobile: hideKeyboard':
+            app.hide_keyboard()
+        elif script == 'mobile: getCurrentActivity':
+            return app.activity
+        elif script == 'mobile: setClipboard':
+            app.clipboard = base64.b64decode(args.get('content', '')).decode('utf-8')
+        elif script == 'mobile: getClipboard':
+            return base64.b64encode(app.clipboard.encode('utf-8')).decode('ascii')
+        else:
+            # 미구현 확장은 Appium과 같은 오류를 돌려 클라이언트가 기존 경로로 넘어가게 한다.
+            raise ElementError('unknown method', f"지원하지 않는 명령: {script}")
+        return None
+
+
+def main(argv=None):
+    from src.bench.suite import SCENARIOS
+
+    parser = argparse.ArgumentParser(description="오프라인 Appium 흉내 서버")
+    parser.add_argument('scenario', choices=sorted(SCENARIOS))
+    parser.add_argument('--port', type=int, default=4799)
+    parser.add_argument('--latency', type=float, default=0.0, help="명령당 지연(초)")
+    parser.add_argument('--reaction', type=float, default=0.0, help="등록 후 화면 반영 지연(초)")
+    parser.add_argument('--prefill', type=int, default=0, help="미리 채워 둘 목록 개수")
+    args = parser.parse_args(argv)
+
+    app = SCENARIOS[args.scenario].make_app(prefill=args.prefill, reaction=args.reaction)
+    server = FakeAppiumServer(app, port=args.port, latency=args.latency).start()
+    print(f"🧪 {args.scenario} 흉내 서버: {server.url} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
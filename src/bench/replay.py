@@ -0,0 +1,394 @@
+"""WebDriver 통신 기록 재생 (디바이스 없이 스크립트 버전 비교)
+
+APPIUM_RECORD=1로 실제 디바이스에서 남긴 기록(data/recordings)을 Appium 대신
+돌려주는 서버에 스크립트를 붙인다. 스크립트가 보내는 명령은 기록 순서대로
+맞춰 보고, 수정된 스크립트가 명령을 빼거나 더 보내도 가장 가까운 기록 응답으로
+이어 간다. 기록과 어긋난 정도(건너뜀 / 반복 / 대체 / 없음)를 함께 보여준다.
+
+    python -m src.bench.replay mobileManager_add_spam_words        # 최근 기록을 그대로 재생
+    python -m src.bench.replay data/recordings/<파일>.jsonl --realtime
+    python -m src.bench.replay mobileManager_add_spam_words --baseline-rev HEAD~1
+    python -m src.bench.replay <기록> --script scripts/수정본.py --baseline scripts/mobileManager_add_spam_words.py
+
+--realtime을 주면 기록된 응답 시간만큼 기다렸다 응답한다 (기본은 즉시 응답).
+비교 대상은 스크립트 파일만 바뀌고 utils/는 현재 트리를 그대로 쓴다.
+"""
+import argparse
+import base64
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from src.bench.fake_server import FakeAppiumServer
+from src.bench.suite import run_script
+from utils.paths import BASE_DIR, get_data_dir
+
+# 스크립트가 기록에 없는 명령을 보냈을 때 앞쪽 기록을 찾아볼 범위
+LOOKAHEAD = 50
+TOP_CHANGES = 5
+
+_SESSION_RE = re.compile(r'/session/([^/]+)')
+_ELEMENT_RE = re.compile(r'/element/[^/]+')
+
+
+def _strip_path(path):
+    path = path.split('?', 1)[0]
+    if path.startswith('/wd/hub'):
+        path = path[len('/wd/hub'):]
+    return path.rstrip('/') or '/'
+
+
+def request_key(method, path, body):
+    """같은 명령인지 맞춰 볼 키 (입력 텍스트는 실행마다 달라 제외)"""
+    path = _strip_path(path)
+    key = f"{method} {path}"
+    if isinstance(body, dict):
+        if path.endswith(('/element', '/elements')):
+            key += f" {body.get('using')}={body.get('value')}"
+        elif path.endswith('/execute/sync'):
+            key += f" {body.get('script')}"
+    return key
+
+
+def command_name(method, path, body):
+    """보고용 명령 이름 (세션 / 요소 ID를 지운 경로)"""
+    path = _ELEMENT_RE.sub('/element/:id', _SESSION_RE.sub('/session/:sid', _strip_path(path)))
+    name = f"{method} {path}"
+    if isinstance(body, dict) and path.endswith('/execute/sync'):
+        name += f" {body.get('script')}"
+    return name
+
+
+def input_text(path, body):
+    """요청이 입력하는 텍스트 (값 입력 / mobile: type / mobile: setClipboard)"""
+    if not isinstance(body, dict):
+        return None
+    if path.endswith('/value'):
+        text = body.get('text')
+        return text if text is not None else ''.join(body.get('value') or [])
+    if path.endswith('/execute/sync'):
+        args = body.get('args') or [{}]
+        args = args[0] if args and isinstance(args[0], dict) else {}
+        if body.get('script') == 'mobile: type':
+            return args.get('text')
+        if body.get('script') == 'mobile: setClipboard' and args.get('content'):
+            try:
+                return base64.b64decode(args['content']).decode('utf-8')
+            except ValueError:
+                return None
+    return None
+
+
+def load_recording(path):
+    """기록 파일 하나를 (헤더, 요청 목록)으로 읽기"""
+    header, entries = {}, []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 강제 종료로 잘린 마지막 줄
+            if entry.get('type') == 'recording':
+                header = header or entry
+            elif 'seq' in entry:
+                entries.append(entry)
+    return header, entries
+
+
+def find_recordings(script=None):
+    """기록 파일 목록 (오래된 것부터). script를 주면 해당 스크립트만"""
+    pattern = f"{script}_*.jsonl" if script else '*.jsonl'
+    return sorted(get_data_dir('recordings').glob(pattern), key=lambda path: path.stat().st_mtime)
+
+
+def _http_response(response):
+    """selenium _request가 돌려준 값 → (HTTP 상태, 응답 본문)"""
+    status = response.get('status') if isinstance(response, dict) else None
+    if isinstance(status, int) and 399 < status <= 500 and isinstance(response.get('value'), str):
+        # 오류 응답은 서버가 보낸 본문 문자열이 그대로 남아 있다.
+        return status, response['value'].encode('utf-8')
+    return 200, response
+
+
+class ReplayServer(FakeAppiumServer):
+    """기록된 응답을 돌려주는 서버
+
+    요청마다 다음 순서로 응답을 고른다.
+      1. 기록의 다음 요청과 같으면 그대로 (matched)
+      2. 직전에 돌려준 요청과 같으면 같은 응답 반복 (repeated, 폴링이 늘어난 경우)
+      3. LOOKAHEAD 안쪽에 같은 요청이 있으면 그 사이를 건너뛴다 (skipped, 명령이 줄어든 경우)
+      4. 이전에 같은 요청이 있었으면 가장 최근 응답 (fallback)
+      5. 없으면 unknown command 오류 (missed)
+
+    스크립트가 고른 단어 / 번호는 실행마다 달라서, 기록에서 입력했던 텍스트를
+    이번에 입력한 텍스트로 바꿔 (getText 등) 응답한다.
+    """
+
+    def __init__(self, header, entries, realtime=False, port=0, host='127.0.0.1'):
+        super().__init__(app=None, port=port, host=host)
+        self.header = header
+        self.entries = entries
+        self.realtime = realtime
+        self.keys = [request_key(entry['method'], entry['path'], entry['body']) for entry in entries]
+        self.cursor = 0
+        self.counts = {'matched': 0, 'repeated': 0, 'skipped': 0, 'fallback': 0, 'missed': 0}
+        self._last = None
+        self._texts = {}
+        self._replay_lock = threading.Lock()
+        self._session_id = next((m.group(1) for entry in entries
+                                 for m in [_SESSION_RE.search(entry['path'])] if m), None)
+
+    def _pick(self, key):
+        with self._replay_lock:
+            if self.cursor < len(self.entries) and self.keys[self.cursor] == key:
+                self.counts['matched'] += 1
+                index = self.cursor
+                self.cursor += 1
+            elif self._last is not None and self.keys[self._last] == key:
+                self.counts['repeated'] += 1
+                return self.entries[self._last]
+            else:
+                end = min(len(self.entries), self.cursor + LOOKAHEAD)
+                index = next((i for i in range(self.cursor, end) if self.keys[i] == key), None)
+                if index is not None:
+                    self.counts['matched'] += 1
+                    self.counts['skipped'] += index - self.cursor
+                    self.cursor = index + 1
+                else:
+                    index = next((i for i in range(self.cursor - 1, -1, -1) if self.keys[i] == key), None)
+                    if index is None:
+                        self.counts['missed'] += 1
+                        return None
+                    self.counts['fallback'] += 1
+            self._last = index
+            return self.entries[index]
+
+    def _synthetic(self, method, path):
+        # 세션 재사용으로 기록한 실행에는 새 세션 / 종료 요청이 없다.
+        if method == 'POST' and path == '/session' and self._session_id:
+            platform = 'iOS' if (self.header.get('platform') or '').lower() == 'ios' else 'Android'
+            return 200, {'value': {'sessionId': self._session_id, 'capabilities': {'platformName': platform}}}
+        if method == 'DELETE' and _SESSION_RE.fullmatch(path):
+            return 200, {'value': None}
+        return 404, {'value': {'error': 'unknown command', 'message': f"기록에 없는 요청: {method} {path}",
+                               'stacktrace': ''}}
+
+    def handle(self, method, path, raw):
+        started = time.monotonic()
+        if self.first_request is None:
+            self.first_request = started
+        path = _strip_path(path)
+        try:
+            body = json.loads(raw.decode('utf-8')) if raw else None
+        except ValueError:
+            body = None
+
+        entry = self._pick(request_key(method, path, body))
+        if entry is None:
+            status, response = self._synthetic(method, path)
+        else:
+            if self.realtime:
+                time.sleep(entry['ms'] / 1000)
+            status, response = _http_response(entry['response'])
+            typed, recorded = input_text(path, body), input_text(entry['path'], entry['body'])
+            if typed and recorded and typed != recorded:
+                self._texts[recorded] = typed
+            if isinstance(response, dict) and isinstance(response.get('value'), str) \
+                    and response['value'] in self._texts:
+                response = dict(response, value=self._texts[response['value']])
+
+        finished = time.monotonic()
+        with self._stats_lock:
+            stat = self.stats.setdefault(command_name(method, path, body), [0, 0.0])
+            stat[0] += 1
+            stat[1] += finished - started
+            self.last_response = finished
+        return status, response
+
+
+def recording_stats(entries):
+    """기록 원본의 명령 수 / 세션 시간 / 서버 시간"""
+    if not entries:
+        return {'commands': 0, 'session_s': 0.0, 'server_s': 0.0, 'client_s': 0.0, 'by_command': {}}
+    session = entries[-1]['t'] + entries[-1]['ms'] / 1000 - entries[0]['t']
+    server = sum(entry['ms'] for entry in entries) / 1000
+    by_command = {}
+    for entry in entries:
+        name = command_name(entry['method'], entry['path'], entry['body'])
+        by_command[name] = by_command.get(name, 0) + 1
+    return {'commands': len(entries), 'session_s': session, 'server_s': server,
+            'client_s': session - server, 'by_command': by_command}
+
+
+# =============================================================
+# - 기록 하나에 스크립트 하나를 붙여 재생 후 결과 dict 반환
+# - Args (매개변수) :
+#       script_path : 실행할 스크립트 파일
+#       realtime : 기록된 응답 시간만큼 기다렸다 응답
+#       extra_env : 스크립트에 추가로 넘길 환경변수
+# =============================================================
+def replay(header, entries, script_path, realtime=False, extra_env=None, script_name=None):
+    server = ReplayServer(header, entries, realtime=realtime).start()
+    env = dict(header.get('env') or {})
+    env.update(extra_env or {})
+    returncode, output, wall = run_script(script_path, server.url, header.get('platform') or 'android',
+                                          env, script_name=script_name)
+    server.stop()
+
+    window = (server.last_response - server.first_request) if server.first_request else 0.0
+    busy = server.busy_seconds()
+    commands = server.command_count()
+    return {
+        'script': os.path.relpath(script_path, BASE_DIR),
+        'ok': returncode == 0,
+        'commands': commands,
+        'wall_s': wall,
+        'session_s': window,
+        'server_s': busy,
+        'client_s': window - busy,
+        'client_ms_per_command': (window - busy) / commands * 1000 if commands else None,
+        'counts': dict(server.counts),
+        'unused': len(entries) - server.cursor,
+        'by_command': {name: count for name, (count, _) in server.stats.items()},
+        'output_tail': output.strip().splitlines()[-15:] if returncode != 0 else [],
+    }
+
+
+def _command_changes(before, after):
+    names = set(before) | set(after)
+    changes = [(name, after.get(name, 0) - before.get(name, 0)) for name in names]
+    changes = [item for item in changes if item[1]]
+    return sorted(changes, key=lambda item: abs(item[1]), reverse=True)[:TOP_CHANGES]
+
+
+def format_recording(header, stats, path=None):
+    lines = [f"📼 {header.get('script', '?')} — {header.get('device')} ({header.get('started')})"]
+    if path is not None:
+        lines.append(f"   {path}")
+    lines.append(f"   기록 원본: 명령 {stats['commands']}회, 세션 {stats['session_s']:.2f}초 = "
+                 f"디바이스 {stats['server_s']:.2f}초 + 클라이언트 {stats['client_s']:.2f}초")
+    return lines
+
+
+def format_replay(result, reference=None):
+    status = '✅' if result['ok'] else '❌'
+    counts = result['counts']
+    per_command = result['client_ms_per_command']
+    per_command = f" ({per_command:.2f}ms/명령)" if per_command is not None else ''
+    lines = [f"{status} {result['script']} — 명령 {result['commands']}회, "
+             f"클라이언트 {result['client_s']:.2f}초{per_command}"]
+    lines.append(f"   세션 {result['session_s']:.2f}초 = 재생 서버 {result['server_s']:.2f}초 + "
+                 f"클라이언트 {result['client_s']:.2f}초, 프로세스 전체 {result['wall_s']:.2f}초")
+    lines.append(f"   기록과 맞춤: 일치 {counts['matched']} · 반복 {counts['repeated']} · "
+                 f"건너뜀 {counts['skipped']} · 대체 {counts['fallback']} · 없음 {counts['missed']} · "
+                 f"남은 기록 {result['unused']}")
+    if reference is not None:
+        changes = _command_changes(reference['by_command'], result['by_command'])
+        if changes:
+            lines.append("   명령 수 변화: " + ', '.join(f"{name} {delta:+d}" for name, delta in changes))
+    for line in result['output_tail']:
+        lines.append(f"   | {line}")
+    return lines
+
+
+def format_comparison(baseline, candidate):
+    lines = [f"📊 {baseline['script']} → {candidate['script']}"]
+    lines.append(f"   명령 {baseline['commands']} → {candidate['commands']} "
+                 f"({candidate['commands'] - baseline['commands']:+d}회), "
+                 f"클라이언트 {baseline['client_s']:.2f} → {candidate['client_s']:.2f}초 "
+                 f"({candidate['client_s'] - baseline['client_s']:+.2f}초)")
+    changes = _command_changes(baseline['by_command'], candidate['by_command'])
+    if changes:
+        lines.append("   명령 수 변화: " + ', '.join(f"{name} {delta:+d}" for name, delta in changes))
+    return lines
+
+
+def _script_at_revision(script_path, revision):
+    """git revision의 스크립트를 같은 폴더에 임시 파일로 꺼낸다 (단어 파일 등 상대 경로 유지)"""
+    relative = Path(os.path.relpath(os.path.abspath(script_path), BASE_DIR)).as_posix()
+    result = subprocess.run(['git', 'show', f"{revision}:{relative}"], cwd=BASE_DIR,
+                            capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or f"{revision}:{relative}를 읽을 수 없습니다.")
+    tag = re.sub(r'[^\w.-]', '_', revision)
+    target = os.path.join(os.path.dirname(os.path.abspath(script_path)),
+                          f".replay_{tag}_{os.path.basename(script_path)}")
+    with open(target, 'w', encoding='utf-8') as f:
+        f.write(result.stdout)
+    return target
+
+
+def _resolve_recording(target):
+    if Path(target).is_file():
+        return Path(target)
+    recordings = find_recordings(Path(target).stem)
+    return recordings[-1] if recordings else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="WebDriver 통신 기록 재생")
+    parser.add_argument('recording', help="기록 파일 경로 또는 스크립트 이름(최근 기록)")
+    parser.add_argument('--script', help="재생할 스크립트 (기본: 기록한 스크립트)")
+    parser.add_argument('--baseline', help="비교할 기준 스크립트 파일")
+    parser.add_argument('--baseline-rev', help="비교할 기준 git revision (예: HEAD~1)")
+    parser.add_argument('--realtime', action='store_true', help="기록된 응답 시간만큼 기다렸다 응답")
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help="스크립트 환경변수 (예: SESSION_PROFILE=fast)")
+    args = parser.parse_args(argv)
+
+    path = _resolve_recording(args.recording)
+    if path is None:
+        print(f"기록이 없습니다: {args.recording} (data/recordings)")
+        return 1
+    header, entries = load_recording(path)
+    script_name = header.get('script') or 'script'
+    script = args.script or os.path.join('scripts', f"{script_name}.py")
+    if not os.path.isfile(os.path.join(BASE_DIR, script)):
+        parser.error(f"스크립트를 찾을 수 없습니다: {script}")
+    script = os.path.join(BASE_DIR, script)
+    extra_env = dict(item.split('=', 1) for item in args.env)
+
+    reference = recording_stats(entries)
+    print('\n'.join(format_recording(header, reference, path)))
+
+    baseline_path, temporary = args.baseline, None
+    if args.baseline_rev:
+        try:
+            baseline_path = temporary = _script_at_revision(script, args.baseline_rev)
+        except ValueError as e:
+            print(f"❌ 기준 스크립트를 꺼낼 수 없습니다: {e}")
+            return 1
+
+    results = []
+    try:
+        if baseline_path:
+            print(f"🔁 기준 재생 중... ({args.baseline_rev or baseline_path})")
+            baseline = replay(header, entries, os.path.join(BASE_DIR, baseline_path), args.realtime,
+                              extra_env, script_name=script_name)
+            if args.baseline_rev:
+                baseline['script'] = f"{args.baseline_rev}:{os.path.relpath(script, BASE_DIR)}"
+            print('\n'.join(format_replay(baseline, reference)))
+            results.append(baseline)
+        print("🔁 재생 중...")
+        candidate = replay(header, entries, script, args.realtime, extra_env, script_name=script_name)
+        print('\n'.join(format_replay(candidate, reference)))
+        results.append(candidate)
+    finally:
+        if temporary:
+            os.remove(temporary)
+
+    if len(results) == 2:
+        print('\n'.join(format_comparison(*results)))
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
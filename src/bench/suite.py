@@ -0,0 +1,265 @@
+"""오프라인 벤치마크 (휴대폰 / Appium 없이 스크립트의 클라이언트 측 비용 측정)
+
+scripts/의 스크립트를 수정 없이 서브프로세스로 실행하고 Appium 대신
+src.bench.fake_server에 붙인다. 세션 시간에서 서버 처리 시간(명령마다 넣은
+지연 포함)을 뺀 나머지가 스크립트(파이썬 클라이언트) 측 비용이다.
+(--reaction을 주면 화면 반영을 기다리는 폴링 시간도 클라이언트 쪽에 들어간다) 결과는 data/bench/history.jsonl에
+쌓아 이전 실행과 비교한다.
+
+    python -m src.bench.suite                          # 전체 시나리오
+    python -m src.bench.suite ixiO_add_spamList --entries 100 --latency 0.01
+    python -m src.bench.suite mobileManager_add_spam_words --env SESSION_PROFILE=fast
+    python -m src.bench.suite ixiO_add_spamList_direct  # 루프를 직접 클라이언트 경로로 (DIRECT_CLIENT=1)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from src.bench.apps import (
+    IxioGreetingApp,
+    IxioSpamListApp,
+    IxioSpamWordsApp,
+    MobileManagerNumberApp,
+    MobileManagerWordsApp,
+    SpamcallnotiApp,
+)
+from src.bench.fake_server import FakeAppiumServer
+from src.runner.executor import build_script_env
+from utils.paths import BASE_DIR, get_data_dir
+
+DEFAULT_ENTRIES = 50
+SCRIPT_TIMEOUT = 600
+
+
+class Scenario:
+    """스크립트 하나 + 그 스크립트가 보는 앱 화면"""
+
+    def __init__(self, script, app_factory, platform='android', env=None):
+        self.script = script
+        self.app_factory = app_factory
+        self.platform = platform
+        self.env = env or {}
+
+    def make_app(self, prefill=0, reaction=0.0, growth=0.0):
+        return self.app_factory(prefill=prefill, reaction=reaction, growth=growth)
+
+    def script_env(self, entries):
+        # 한도 직전까지 목록을 미리 채워 두고 entries건만 등록해 한도 팝업까지 확인한다.
+        return dict({'START_NUM': 1, 'END_NUM': entries, 'WORD_COUNT': entries}, **self.env)
+
+
+def _greeting(platform):
+    def factory(prefill=0, **kwargs):
+        return IxioGreetingApp(platform=platform, **kwargs)
+    return factory
+
+
+SCENARIOS = {
+    'ixiO_add_spamList': Scenario('ixiO_add_spamList.py', lambda **kw: IxioSpamListApp('android', **kw)),
+    'ixiO_add_spamList_ios': Scenario('ixiO_add_spamList.py', lambda **kw: IxioSpamListApp('ios', **kw),
+                                      platform='ios'),
+    # 등록 루프 전체를 직접 클라이언트(utils.direct_client) 경로로 실행
+    'ixiO_add_spamList_direct': Scenario('ixiO_add_spamList.py', lambda **kw: IxioSpamListApp('android', **kw),
+                                         env={'DIRECT_CLIENT': '1'}),
+    'ixiO_add_spamList_ios_direct': Scenario('ixiO_add_spamList.py', lambda **kw: IxioSpamListApp('ios', **kw),
+                                             platform='ios', env={'DIRECT_CLIENT': '1'}),
+    'ixiO_add_spam_words': Scenario('ixiO_add_spam_words.py', IxioSpamWordsApp),
+    'ixiO_add_greeting': Scenario('ixiO_add_greeting.py', _greeting('android')),
+    'ixiO_add_greeting_ios': Scenario('ixiO_add_greeting.py', _greeting('ios'), platform='ios'),
+    'mobileManager_add_spam_number': Scenario('mobileManager_add_spam_number.py', MobileManagerNumberApp),
+    'mobileManager_add_spam_words': Scenario('mobileManager_add_spam_words.py', MobileManagerWordsApp),
+    'spamcallnoti_add_spam_number': Scenario('spamcallnoti_add_spam_number.py', SpamcallnotiApp),
+}
+
+
+def _limit(app):
+    return getattr(app, 'limit', None)
+
+
+def _git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                capture_output=True, text=True, timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# =============================================================
+# - 스크립트 하나를 서브프로세스로 실행 (Appium 대신 server_url에 붙는다)
+#   GUI 세션 유지용 환경변수는 지우고 데이터는 임시 폴더에 남긴다.
+# - Returns (반환값) : (종료 코드, 출력, 실행 시간(초))
+# =============================================================
+def run_script(script_path, server_url, platform='android', extra_env=None, script_name=None):
+    with tempfile.TemporaryDirectory(prefix='bench_') as data_dir:
+        env = build_script_env(
+            device_name=f"bench-{platform}",
+            platform_version='17.0' if platform == 'ios' else '14',
+            platform_name=platform,
+        )
+        for key in ('APPIUM_SESSION_ID', 'APPIUM_SESSION_CAPS', 'APPIUM_SYSTEM_PORT',
+                    'APPIUM_WDA_LOCAL_PORT', 'APPIUM_MJPEG_SERVER_PORT'):
+            env.pop(key, None)
+        env.update({
+            'APPIUM_SERVER_URL': server_url,
+            'RUNNER_DATA_DIR': data_dir,
+            'RUNNER_SCRIPT': script_name or os.path.splitext(os.path.basename(script_path))[0],
+            'PYTHONIOENCODING': 'utf-8',
+        })
+        env.update({key: str(value) for key, value in (extra_env or {}).items()})
+
+        started = time.monotonic()
+        try:
+            process = subprocess.run([sys.executable, '-u', script_path],
+                                     cwd=BASE_DIR, env=env, capture_output=True, text=True,
+                                     encoding='utf-8', errors='replace', timeout=SCRIPT_TIMEOUT)
+            returncode, output = process.returncode, process.stdout + process.stderr
+        except subprocess.TimeoutExpired as e:
+            returncode, output = -1, f"{e.stdout or ''}시간 초과 ({SCRIPT_TIMEOUT}초)"
+        return returncode, output, time.monotonic() - started
+
+
+# =============================================================
+# - 시나리오 하나 실행 후 결과 dict 반환
+# - Args (매개변수) :
+#       entries : 등록할 건수 (목록은 한도 - entries개를 미리 채운다)
+#       latency : 흉내 서버의 명령당 지연(초)
+#       reaction : 등록 후 화면 반영 지연(초)
+#       extra_env : 스크립트에 추가로 넘길 환경변수 (실행 옵션 비교용)
+#       crash_after : 이 수만큼 명령 후 디바이스 서버 크래시 흉내 (세션 재생성 확인용)
+# =============================================================
+def run_scenario(name, entries=DEFAULT_ENTRIES, latency=0.0, reaction=0.0, growth=0.0, extra_env=None,
+                 crash_after=None):
+    scenario = SCENARIOS[name]
+    probe = scenario.make_app()
+    limit = _limit(probe)
+    prefill = 0 if limit is None else max(0, limit - entries)
+    app = scenario.make_app(prefill=prefill, reaction=reaction, growth=growth)
+    server = FakeAppiumServer(app, latency=latency, crash_after=crash_after).start()
+    env = dict(scenario.script_env(entries))
+    env.update(extra_env or {})
+    direct = str(env.get('DIRECT_CLIENT')) == '1'
+    if direct:
+        # 직접 클라이언트도 흉내 서버에 붙인다. (UiAutomator2 서버는 /wd/hub 아래, WDA는 루트)
+        env['DIRECT_CLIENT_URL'] = server.url + ('' if scenario.platform == 'ios' else '/wd/hub')
+    returncode, output, wall = run_script(os.path.join('scripts', scenario.script), server.url,
+                                          scenario.platform, env)
+    server.stop()
+    # 직접 연결에 실패해 Appium 경로로 돌았으면 직접 경로를 확인하지 못한 것이다.
+    ok = returncode == 0 and (not direct or '직접 호출' in output)
+
+    window = (server.last_response - server.first_request) if server.first_request else 0.0
+    busy = server.busy_seconds()
+    commands = server.command_count()
+    registered = app.size - prefill
+    return {
+        'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'revision': _git_revision(),
+        'scenario': name,
+        'entries': entries,
+        'latency': latency,
+        'reaction': reaction,
+        'crash_after': crash_after,
+        'options': {key: str(value) for key, value in (extra_env or {}).items()},
+        'ok': ok,
+        'registered': registered,
+        'commands': commands,
+        'wall_s': round(wall, 3),
+        'session_s': round(window, 3),
+        'server_s': round(busy, 3),
+        'client_s': round(window - busy, 3),
+        'client_ms_per_command': round((window - busy) / commands * 1000, 2) if commands else None,
+        'commands_per_entry': round(commands / registered, 1) if registered else None,
+        'top_commands': sorted(((cmd, count) for cmd, (count, _) in server.stats.items()),
+                               key=lambda item: item[1], reverse=True)[:5],
+        'output_tail': output.strip().splitlines()[-15:] if not ok else [],
+    }
+
+
+def _history_path():
+    return get_data_dir('bench') / 'history.jsonl'
+
+
+def load_history():
+    try:
+        with open(_history_path(), encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError):
+        return []
+
+
+def append_history(result):
+    with open(_history_path(), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+def _comparable(a, b):
+    keys = ('scenario', 'entries', 'latency', 'reaction', 'crash_after', 'options')
+    return all(a.get(key) == b.get(key) for key in keys) and a.get('ok') and b.get('ok')
+
+
+def previous_result(history, result):
+    for entry in reversed(history):
+        if _comparable(entry, result):
+            return entry
+    return None
+
+
+def format_result(result, previous=None):
+    status = '✅' if result['ok'] else '❌'
+    options = ', '.join(f"{key}={value}" for key, value in result['options'].items()) or '기본'
+    if result.get('crash_after') is not None:
+        options += f", 명령 {result['crash_after']}회 후 크래시"
+    lines = [f"{status} {result['scenario']} [{options}] — 등록 {result['registered']}건, "
+             f"명령 {result['commands']}회 ({result['commands_per_entry']}회/건)"]
+    lines.append(f"   세션 {result['session_s']:.2f}초 = 서버 {result['server_s']:.2f}초 + "
+                 f"클라이언트 {result['client_s']:.2f}초 ({result['client_ms_per_command']}ms/명령), "
+                 f"프로세스 전체 {result['wall_s']:.2f}초")
+    lines.append("   많이 쓴 명령: " + ', '.join(f"{cmd} {count}" for cmd, count in result['top_commands']))
+    if previous:
+        delta = result['client_s'] - previous['client_s']
+        lines.append(f"   이전 실행({previous['time']}, {previous.get('revision') or '-'}) 대비: "
+                     f"클라이언트 {delta:+.2f}초, 명령 {result['commands'] - previous['commands']:+d}회")
+    for line in result['output_tail']:
+        lines.append(f"   | {line}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 스크립트 벤치마크")
+    parser.add_argument('scenarios', nargs='*', help=f"시나리오 (기본: 전체) — {', '.join(SCENARIOS)}")
+    parser.add_argument('--entries', type=int, default=DEFAULT_ENTRIES, help="등록할 건수")
+    parser.add_argument('--latency', type=float, default=0.0, help="명령당 지연(초)")
+    parser.add_argument('--reaction', type=float, default=0.0, help="등록 후 화면 반영 지연(초)")
+    parser.add_argument('--growth', type=float, default=0.0, help="목록 한 건당 반영 지연 증가(초)")
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help="스크립트 환경변수 (예: SESSION_PROFILE=fast)")
+    parser.add_argument('--crash-after', type=int, help="이 수만큼 명령 후 디바이스 서버 크래시 흉내")
+    parser.add_argument('--no-history', action='store_true', help="결과를 기록하지 않음")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {', '.join(unknown)}")
+    extra_env = dict(item.split('=', 1) for item in args.env)
+
+    history = load_history()
+    failed = 0
+    for name in args.scenarios or list(SCENARIOS):
+        print(f"🧪 {name} 실행 중...")
+        result = run_scenario(name, entries=args.entries, latency=args.latency, reaction=args.reaction,
+                              growth=args.growth, extra_env=extra_env, crash_after=args.crash_after)
+        print('\n'.join(format_result(result, previous_result(history, result))))
+        if not args.no_history:
+            append_history(result)
+        failed += not result['ok']
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,4 @@
 import subprocess
-import platform
 
 from src.core.environment import _get_env_with_full_path
 
@@ -19,8 +18,8 @@ def get_device_property(device_id, prop_name):
         return "Unknown"
 
 
-def check_adb_connection():
-    """ADB 디바이스 연결 확인 및 정보 수집"""
+def list_adb_devices():
+    """연결된 모든 ADB 디바이스 정보 수집"""
     try:
         result = subprocess.run(
             ['adb', 'devices'],
@@ -30,29 +29,23 @@ def check_adb_connection():
             env=_get_env_with_full_path(),
         )
         if result.returncode != 0:
-            return None
+            return []
 
         lines = result.stdout.strip().split('\n')[1:]
         devices = [line.split('\t')[0] for line in lines if 'device' in line and line.strip()]
-        if not devices:
-            return None
-
-        device_id = devices[0]
-        return {
-            'deviceName': device_id,
-            'platformVersion': get_device_property(device_id, 'ro.build.version.release'),
-            'model': get_device_property(device_id, 'ro.product.model'),
-        }
+        return [
+            {
+                'deviceName': device_id,
+                'platformVersion': get_device_property(device_id, 'ro.build.version.release'),
+                'model': get_device_property(device_id, 'ro.product.model'),
+            }
+            for device_id in devices
+        ]
     except Exception:
-        return None
-
+        return []
 
-def auto_open_appium_terminal():
-    """GUI 시작 시 자동으로 터미널 열고 appium 실행"""
-    system = platform.system()
 
-    if system == 'Darwin':
-        applescript = 'tell application "Terminal"\n    do script "appium"\nend tell'
-        subprocess.run(['osascript', '-e', applescript])
-    elif system == 'Windows':
-        subprocess.Popen(['cmd', '/k', 'appium'], creationflags=subprocess.CREATE_NEW_CONSOLE)
+def check_adb_connection():
+    """ADB 디바이스 연결 확인 및 정보 수집 (첫 번째 디바이스)"""
+    devices = list_adb_devices()
+    return devices[0] if devices else None
@@ -0,0 +1,324 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from src.core.environment import _get_env_with_full_path, _is_portable_build
+from utils.paths import get_data_dir
+from utils.safe_print import safe_print
+
+APPIUM_BASE_PORT = 4723
+# 디바이스(슬롯)마다 아래 기준값 + 슬롯 번호를 할당해 포트가 겹치지 않게 한다.
+# UiAutomator2 systemPort 기본값은 8200, XCUITest wdaLocalPort 기본값은 8100.
+SYSTEM_PORT_BASE = 8200
+WDA_LOCAL_PORT_BASE = 8100
+MJPEG_SERVER_PORT_BASE = 9100
+MAX_SLOTS = 50
+
+STATUS_TIMEOUT = 2
+STARTUP_TIMEOUT = 60
+MONITOR_INTERVAL = 5
+
+# 설치되어 있으면 서버 실행 시 활성화할 플러그인 (서버 측 루프 실행용)
+OPTIONAL_PLUGINS = ('execute-driver',)
+_installed_plugins = None
+
+
+def probe_status(url, timeout=STATUS_TIMEOUT):
+    """Appium 서버의 /status 응답으로 준비 여부 확인"""
+    try:
+        with urllib.request.urlopen(f"{url}/status", timeout=timeout) as response:
+            if response.status != 200:
+                return False
+            body = json.loads(response.read().decode('utf-8') or '{}')
+            return body.get('value', {}).get('ready', True) is not False
+    except (urllib.error.URLError, OSError, ValueError):
+        return False
+
+
+def _get_appium_env():
+    env = _get_env_with_full_path()
+    # 포터블 빌드는 드라이버가 런타임 폴더 안(APPIUM_HOME)에 설치되어 있다.
+    if _is_portable_build():
+        try:
+            from src.core.runtime import get_runtime_paths
+            paths = get_runtime_paths()
+            if paths:
+                env['APPIUM_HOME'] = str(paths['appium_dir'].absolute())
+        except Exception:
+            pass
+    return env
+
+
+def get_installed_plugins():
+    """설치된 Appium 플러그인 이름 목록 (최초 1회만 조회)"""
+    global _installed_plugins
+    if _installed_plugins is not None:
+        return _installed_plugins
+    _installed_plugins = []
+    try:
+        result = subprocess.run(
+            ['appium', 'plugin', 'list', '--installed', '--json'],
+            capture_output=True, text=True, timeout=30,
+            env=_get_appium_env(), shell=sys.platform == 'win32',
+        )
+        plugins = json.loads(result.stdout or '{}')
+        _installed_plugins = [name for name, info in plugins.items()
+                              if not isinstance(info, dict) or info.get('installed', True)]
+    except (OSError, subprocess.SubprocessError, ValueError):
+        pass
+    return _installed_plugins
+
+
+def _server_command(port):
+    command = ['appium', '--address', '127.0.0.1', '--port', str(port)]
+    plugins = [name for name in OPTIONAL_PLUGINS if name in get_installed_plugins()]
+    if plugins:
+        command.append(f"--use-plugins={','.join(plugins)}")
+    return command
+
+
+class AppiumServer:
+    """풀에서 관리하는 Appium 서버 프로세스 하나"""
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.port = APPIUM_BASE_PORT + slot
+        self.process = None
+        self.external = False
+        self.restarts = 0
+        # 시작(준비 대기 포함)은 한 번에 하나만. 모니터는 시작 중인 서버를 건드리지 않는다.
+        self.starting = False
+        self.ready = False      # 한 번이라도 준비된 적이 있는지 (그 전에는 모니터 대상이 아니다)
+        self._start_lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    def is_alive(self):
+        if self.process is not None and self.process.poll() is not None:
+            return False
+        return probe_status(self.url)
+
+    def start(self):
+        """서버 실행 후 /status가 준비될 때까지 대기. 이미 떠 있는 서버가 있으면 그대로 사용한다."""
+        with self._start_lock:
+            self.starting = True
+            try:
+                return self._start()
+            finally:
+                self.starting = False
+
+    def restart(self):
+        """종료 후 다시 시작 (모니터용). 다른 스레드가 시작 중이면 건드리지 않고 None"""
+        if not self._start_lock.acquire(blocking=False):
+            return None
+        try:
+            self.starting = True
+            self.stop()
+            return self._start()
+        finally:
+            self.starting = False
+            self._start_lock.release()
+
+    def _start(self):
+        if self.process is not None and self.process.poll() is None and probe_status(self.url):
+            # 기다리는 동안 다른 스레드가 이미 띄웠다.
+            return True
+        if self.process is None and probe_status(self.url):
+            self.external = True
+            self.ready = True
+            safe_print(f"🖥️ 실행 중인 Appium 서버 사용: {self.url}")
+            return True
+
+        self.external = False
+        log_path = get_data_dir('logs') / f"appium_{self.port}.log"
+        log_file = open(log_path, 'a', encoding='utf-8')
+        creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+        try:
+            self.process = subprocess.Popen(
+                _server_command(self.port),
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                env=_get_appium_env(),
+                shell=sys.platform == 'win32',
+                creationflags=creation_flags,
+            )
+        except OSError as e:
+            log_file.close()
+            safe_print(f"❌ Appium 서버 실행 실패 (포트 {self.port}): {e}")
+            return False
+        finally:
+            # Popen이 파일 디스크립터를 복제해 가지므로 부모 쪽 핸들은 닫아도 된다.
+            if not log_file.closed:
+                log_file.close()
+
+        process = self.process
+        deadline = time.time() + STARTUP_TIMEOUT
+        while time.time() < deadline:
+            if self.process is not process:
+                # 준비를 기다리는 동안 shutdown()이 서버를 내렸다.
+                return False
+            if process.poll() is not None:
+                safe_print(f"❌ Appium 서버가 시작 직후 종료되었습니다. 로그: {log_path}")
+                self.process = None
+                return False
+            if probe_status(self.url):
+                self.ready = True
+                safe_print(f"✅ Appium 서버 준비 완료: {self.url}")
+                return True
+            time.sleep(0.5)
+
+        safe_print(f"❌ Appium 서버 준비 시간 초과 (포트 {self.port}). 로그: {log_path}")
+        self.stop()
+        return False
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        except Exception as e:
+            safe_print(f"Appium 서버 종료 오류 (포트 {self.port}): {e}")
+        finally:
+            self.process = None
+
+
+class ServerLease:
+    """작업 하나에 할당된 서버 URL과 디바이스 측 포트 묶음"""
+
+    def __init__(self, device_id, server):
+        self.device_id = device_id
+        self.server = server
+        self.system_port = SYSTEM_PORT_BASE + server.slot
+        self.wda_local_port = WDA_LOCAL_PORT_BASE + server.slot
+        self.mjpeg_server_port = MJPEG_SERVER_PORT_BASE + server.slot
+        self.refcount = 0
+
+    @property
+    def server_url(self):
+        return self.server.url
+
+    def as_env(self):
+        """스크립트(utils.session)가 읽는 환경변수 형태로 변환"""
+        return {
+            'APPIUM_SERVER_URL': self.server_url,
+            'APPIUM_SYSTEM_PORT': str(self.system_port),
+            'APPIUM_WDA_LOCAL_PORT': str(self.wda_local_port),
+            'APPIUM_MJPEG_SERVER_PORT': str(self.mjpeg_server_port),
+        }
+
+
+class AppiumServerPool:
+    """디바이스별 Appium 서버 풀
+
+    디바이스 하나에 서버 하나를 고정 할당(sticky)하고, 같은 디바이스의 작업은
+    항상 같은 서버/포트를 받는다. 모니터 스레드가 죽은 서버를 다시 띄운다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._servers = {}
+        self._leases = {}
+        self._monitor_thread = None
+        self._stop_event = threading.Event()
+
+    def _free_slot(self):
+        used = {lease.server.slot for lease in self._leases.values()}
+        for slot in range(MAX_SLOTS):
+            if slot not in used:
+                return slot
+        raise RuntimeError("할당 가능한 Appium 서버 슬롯이 없습니다.")
+
+    def _get_server(self, slot):
+        server = self._servers.get(slot)
+        if server is None:
+            server = AppiumServer(slot)
+            self._servers[slot] = server
+        return server
+
+    def warm_up(self):
+        """첫 번째 서버를 미리 띄워 첫 실행 대기 시간을 줄인다."""
+        with self._lock:
+            server = self._get_server(0)
+        if not server.is_alive():
+            server.start()
+        self.start_monitor()
+
+    def acquire(self, device_id):
+        """디바이스에 서버/포트를 할당하고 서버가 준비될 때까지 대기"""
+        with self._lock:
+            lease = self._leases.get(device_id)
+            if lease is None:
+                lease = ServerLease(device_id, self._get_server(self._free_slot()))
+                self._leases[device_id] = lease
+            lease.refcount += 1
+            server = lease.server
+
+        if not server.is_alive() and not server.start():
+            self.release(device_id)
+            raise RuntimeError(f"Appium 서버를 시작할 수 없습니다. (포트 {server.port})")
+
+        self.start_monitor()
+        return lease
+
+    def release(self, device_id):
+        """할당 해제. 서버는 다음 실행을 위해 켜 둔다."""
+        with self._lock:
+            lease = self._leases.get(device_id)
+            if lease is None:
+                return
+            lease.refcount -= 1
+            if lease.refcount <= 0:
+                del self._leases[device_id]
+
+    def lease_for(self, device_id):
+        with self._lock:
+            return self._leases.get(device_id)
+
+    def start_monitor(self):
+        with self._lock:
+            if self._monitor_thread is not None and self._monitor_thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._monitor_thread = threading.Thread(
+                target=self._monitor, name="appium-pool-monitor", daemon=True
+            )
+            self._monitor_thread.start()
+
+    def _monitor(self):
+        while not self._stop_event.wait(MONITOR_INTERVAL):
+            with self._lock:
+                leased = [lease.server for lease in self._leases.values()]
+            for server in leased:
+                if self._stop_event.is_set():
+                    return
+                # acquire()가 아직 시작(준비 대기) 중인 서버는 죽은 것으로 보지 않는다.
+                if server.starting or not server.ready or server.is_alive():
+                    continue
+                safe_print(f"⚠️ Appium 서버 응답 없음 (포트 {server.port}) — 재시작합니다. ({server.restarts + 1}회)")
+                if server.restart() is not None:
+                    server.restarts += 1
+
+    def shutdown(self):
+        """풀이 직접 띄운 서버를 모두 종료 (외부에서 띄운 서버는 그대로 둔다)"""
+        self._stop_event.set()
+        with self._lock:
+            servers = list(self._servers.values())
+            self._servers.clear()
+            self._leases.clear()
+        for server in servers:
+            if not server.external:
+                server.stop()
+
+
+server_pool = AppiumServerPool()
@@ -16,8 +16,8 @@ def _ideviceinfo(udid, key):
         return "Unknown"
 
 
-def check_ios_connection():
-    """libimobiledevice로 연결된 iOS 디바이스 확인 및 정보 수집"""
+def list_ios_devices():
+    """libimobiledevice로 연결된 모든 iOS 디바이스 확인 및 정보 수집"""
     try:
         result = subprocess.run(
             ['idevice_id', '-l'],
@@ -25,25 +25,29 @@ def check_ios_connection():
             env=_get_env_with_full_path(),
         )
         if result.returncode != 0:
-            return None
+            return []
 
         udids = [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
-        if not udids:
-            return None
-
-        udid = udids[0]
-        device_name = _ideviceinfo(udid, 'DeviceName')
-        ios_version = _ideviceinfo(udid, 'ProductVersion')
-        model = _ideviceinfo(udid, 'ProductType')
-
-        return {
-            'deviceName': udid,
-            'platformVersion': ios_version,
-            'model': device_name if device_name != "Unknown" else model,
-            'platform': 'ios',
-        }
+        devices = []
+        for udid in udids:
+            device_name = _ideviceinfo(udid, 'DeviceName')
+            ios_version = _ideviceinfo(udid, 'ProductVersion')
+            model = _ideviceinfo(udid, 'ProductType')
+            devices.append({
+                'deviceName': udid,
+                'platformVersion': ios_version,
+                'model': device_name if device_name != "Unknown" else model,
+                'platform': 'ios',
+            })
+        return devices
 
     except FileNotFoundError:
-        return None
+        return []
     except Exception:
-        return None
+        return []
+
+
+def check_ios_connection():
+    """연결된 iOS 디바이스 확인 및 정보 수집 (첫 번째 디바이스)"""
+    devices = list_ios_devices()
+    return devices[0] if devices else None
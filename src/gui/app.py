@@ -1,16 +1,28 @@
 import os
 import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 
-from src.device.adb import auto_open_appium_terminal, check_adb_connection
-from src.device.ios import check_ios_connection
+from src.device.adb import list_adb_devices
+from src.device.appium_server import server_pool
+from src.device.ios import list_ios_devices
 from src.runner.config import get_available_scripts
 from src.runner.executor import execute_script, stop_running_script
+from src.runner.session_keeper import SessionKeeper
+from utils.checkpoint import describe_checkpoint
 from utils.font import get_log_font
 
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
+# 카운터 확인 정책 (표시 이름 → VERIFY_EVERY, utils.verify)
+VERIFY_CHOICES = {
+    "매 건": '1',
+    "5건마다": '5',
+    "10건마다": '10',
+    "한도 근처에서만": 'limit',
+}
+
 
 def create_gui():
     """GUI 생성 및 실행"""
@@ -20,14 +32,16 @@ def create_gui():
         root.iconbitmap('./img/icon.ico')
     except Exception:
         pass
-    root.geometry("900x780")
+    root.geometry("900x1070")
 
     device_info = {}
-    current_thread = None
+    connected_devices = []
+    current_threads = []
     platform_var = tk.StringVar(value="android")
     available_scripts = get_available_scripts(platform_var.get())
     tk_font = get_log_font()
     _log_queue = queue.Queue()
+    session_keeper = SessionKeeper(server_pool)
 
     def _process_log_queue():
         while True:
@@ -46,8 +60,10 @@ def create_gui():
 
     def on_platform_change():
         """플랫폼 변경 시 연결 상태 초기화 및 스크립트 목록 갱신"""
-        nonlocal device_info
+        nonlocal device_info, connected_devices
         device_info = {}
+        connected_devices = []
+        threading.Thread(target=session_keeper.shutdown, daemon=True).start()
         device_label.config(text="연결된 디바이스: 없음", foreground="red")
         info_text.config(state='normal', font=tk_font)
         info_text.delete(1.0, tk.END)
@@ -58,17 +74,17 @@ def create_gui():
         log_message(f"{'🤖 Android' if platform == 'android' else '🍎 iOS'} 모드로 전환됨")
 
     def on_check_connection():
-        nonlocal device_info
+        nonlocal device_info, connected_devices
         platform = platform_var.get()
 
         if platform == "ios":
             log_message("🔍 iOS 디바이스 연결 확인 중...")
-            result = check_ios_connection()
+            devices = list_ios_devices()
         else:
             log_message("🔍 ADB 연결 확인 중...")
-            result = check_adb_connection()
+            devices = list_adb_devices()
 
-        if not result:
+        if not devices:
             device_label.config(text="연결된 디바이스: ❌ 없음", foreground="red")
             info_text.config(state='normal', font=tk_font)
             info_text.delete(1.0, tk.END)
@@ -92,33 +108,63 @@ def create_gui():
             run_button.config(state='disabled')
             log_message("❌ 연결된 디바이스를 찾을 수 없습니다.")
             device_info = {}
+            connected_devices = []
             return
 
-        device_info = result
+        connected_devices = devices
+        device_info = devices[0]
         platform_tag = "🍎 iOS" if platform == "ios" else "🤖 Android"
+        extra_count = len(devices) - 1
         device_label.config(
-            text=f"✅ 연결된 디바이스: {device_info['deviceName']}",
+            text=f"✅ 연결된 디바이스: {device_info['deviceName']}"
+                 + (f" 외 {extra_count}대" if extra_count else ""),
             foreground="green",
             font=tk_font,
         )
         info_text.config(state='normal', font=tk_font)
         info_text.delete(1.0, tk.END)
-        info_text.insert(
-            1.0,
-            f"📱 모델: {device_info['model']}\n"
-            f"⚙️  OS: {platform_tag} {device_info['platformVersion']}\n"
-            f"🔗 디바이스 ID: {device_info['deviceName']}",
-        )
+        if extra_count:
+            info_text.insert(
+                1.0,
+                "\n".join(
+                    f"📱 {d['model']} · {platform_tag} {d['platformVersion']} · 🔗 {d['deviceName']}"
+                    for d in devices
+                ),
+            )
+        else:
+            info_text.insert(
+                1.0,
+                f"📱 모델: {device_info['model']}\n"
+                f"⚙️  OS: {platform_tag} {device_info['platformVersion']}\n"
+                f"🔗 디바이스 ID: {device_info['deviceName']}",
+            )
         info_text.config(state='disabled')
 
         if available_scripts:
             run_button.config(state='normal')
 
-        log_message(f"✅ 디바이스 연결 완료: {device_info['deviceName']}")
-        log_message(f"   📱 {device_info['model']} ({platform_tag} {device_info['platformVersion']})")
+        for d in devices:
+            log_message(f"✅ 디바이스 연결 완료: {d['deviceName']}")
+            log_message(f"   📱 {d['model']} ({platform_tag} {d['platformVersion']})")
+
+        _prepare_warm_sessions()
+
+    def _prepare_warm_sessions():
+        """세션 유지가 켜져 있으면 스크립트를 고르는 동안 백그라운드에서 세션을 미리 만든다."""
+        if not keep_session_var.get():
+            return
+        for d in connected_devices:
+            session_keeper.prepare(d['deviceName'], d['platformVersion'], platform_var.get(), log=log_message)
+
+    def on_keep_session_toggle():
+        if keep_session_var.get():
+            _prepare_warm_sessions()
+        else:
+            threading.Thread(target=session_keeper.shutdown, daemon=True).start()
+            log_message("♻️ 세션 유지 해제 — 유지 중인 세션을 종료합니다.")
 
     def on_run_script():
-        nonlocal current_thread
+        nonlocal current_threads
 
         try:
             start_num = int(start_num_var.get())
@@ -170,32 +216,74 @@ def create_gui():
 
         platform = platform_var.get()
         platform_tag = "🍎 iOS" if platform == "ios" else "🤖 Android"
+        targets = connected_devices if run_all_var.get() and connected_devices else [device_info]
         log_message("=" * 60)
         log_message(f"🚀 스크립트 실행 시작: {selected_display_name}")
         log_message(f"📁 파일: {script_filename}")
-        log_message(f"📱 디바이스: {device_info['deviceName']}")
-        log_message(f"{platform_tag} OS 버전: {device_info['platformVersion']}")
+        for target in targets:
+            log_message(f"📱 디바이스: {target['deviceName']}")
+            log_message(f"{platform_tag} OS 버전: {target['platformVersion']}")
+            if resume_var.get():
+                checkpoint = describe_checkpoint(os.path.splitext(script_filename)[0], target['deviceName'])
+                log_message(f"📌 이어서 실행 — {checkpoint}" if checkpoint else "📌 이어갈 체크포인트 없음 (처음부터 실행)")
         log_message("=" * 60)
 
+        run_env = {}
+        if server_loop_var.get():
+            run_env['SERVER_LOOP'] = '1'
+        if fast_profile_var.get():
+            run_env['SESSION_PROFILE'] = 'fast'
+        if direct_client_var.get():
+            run_env['DIRECT_CLIENT'] = '1'
+        if fast_fill_var.get():
+            run_env['FAST_FILL'] = '1'
+        if trace_var.get():
+            run_env['APPIUM_TRACE'] = '1'
+        if record_var.get():
+            run_env['APPIUM_RECORD'] = '1'
+        if ledger_sync_var.get():
+            run_env['LEDGER_SYNC'] = '1'
+        verify_every = VERIFY_CHOICES[verify_var.get()]
+        if verify_every != '1':
+            run_env['VERIFY_EVERY'] = verify_every
+
+        remaining = [len(targets)]
+
         def on_finish():
             def _on_finish_ui():
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
                 run_button.config(state='normal')
                 stop_button.config(state='disabled')
                 script_combo.config(state='readonly')
                 log_message("=" * 60)
             root.after(0, _on_finish_ui)
 
-        current_thread = execute_script(
-            script_filename,
-            device_info['deviceName'],
-            device_info['platformVersion'],
-            platform_name=platform,
-            start_num=start_num,
-            end_num=end_num,
-            word_count=word_count,
-            log_callback=log_message,
-            finish_callback=on_finish,
-        )
+        def _device_logger(device_name):
+            # 여러 디바이스를 동시에 돌릴 때는 로그 줄마다 디바이스 ID를 붙여 구분한다.
+            if len(targets) == 1:
+                return log_message
+            return lambda message: log_message(f"[{device_name}] {message}")
+
+        current_threads = [
+            execute_script(
+                script_filename,
+                target['deviceName'],
+                target['platformVersion'],
+                platform_name=platform,
+                start_num=start_num,
+                end_num=end_num,
+                word_count=word_count,
+                log_callback=_device_logger(target['deviceName']),
+                finish_callback=on_finish,
+                extra_env=run_env,
+                server_pool=server_pool,
+                session_keeper=session_keeper if keep_session_var.get() else None,
+                resume=resume_var.get(),
+            )
+            for target in targets
+        ]
 
     def on_stop_script():
         log_message("⏹️ 스크립트 중지 요청...")
@@ -257,6 +345,11 @@ def create_gui():
     info_text = tk.Text(adb_frame, height=3, width=70, state='disabled', font=tk_font, bg='#f8f8f8', fg='#000000')
     info_text.grid(row=2, column=0, columnspan=2, pady=(10, 0), sticky=(tk.W, tk.E))
 
+    run_all_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        adb_frame, text="연결된 모든 디바이스에서 동시 실행", variable=run_all_var,
+    ).grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(6, 0))
+
     # 2. 스크립트 선택 섹션
     script_frame = ttk.LabelFrame(main_frame, text="📜 스크립트 선택", padding="10")
     script_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -298,9 +391,77 @@ def create_gui():
     word_count_var = tk.StringVar(value="200")
     ttk.Entry(range_frame, textvariable=word_count_var, width=8).grid(row=0, column=5)
 
-    # 4. 실행 버튼들
+    # 4. 실행 옵션
+    option_frame = ttk.LabelFrame(main_frame, text="⚙️ 실행 옵션", padding="10")
+    option_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+
+    keep_session_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="세션 유지 (다음 실행부터 세션 생성 생략)",
+        variable=keep_session_var, command=on_keep_session_toggle,
+    ).grid(row=0, column=0, sticky=tk.W)
+
+    server_loop_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="서버 측 루프 실행 (execute-driver 플러그인 필요)",
+        variable=server_loop_var,
+    ).grid(row=1, column=0, sticky=tk.W)
+
+    fast_profile_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="빠른 세션 프로필 (애니메이션 끄기 · 키보드 숨김 · 초기화 생략)",
+        variable=fast_profile_var,
+    ).grid(row=2, column=0, sticky=tk.W)
+
+    direct_client_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="디바이스 서버 직접 호출 (Appium 중계 생략, 지원 스크립트만)",
+        variable=direct_client_var,
+    ).grid(row=3, column=0, sticky=tk.W)
+
+    fast_fill_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="ADB 빠른 채우기 (Android 번호 스크립트, 한도 직전까지 adb input으로 입력)",
+        variable=fast_fill_var,
+    ).grid(row=4, column=0, sticky=tk.W)
+
+    trace_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="명령 지연 추적 (명령별 p50/p95/p99를 data/traces에 기록)",
+        variable=trace_var,
+    ).grid(row=5, column=0, sticky=tk.W)
+
+    record_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="WebDriver 통신 기록 (data/recordings, 오프라인 재생 비교용)",
+        variable=record_var,
+    ).grid(row=6, column=0, sticky=tk.W)
+
+    resume_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="중단된 실행 이어서 하기 (체크포인트와 디바이스 카운터를 맞춰 다음 회차부터)",
+        variable=resume_var,
+    ).grid(row=7, column=0, sticky=tk.W)
+
+    ledger_sync_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        option_frame, text="단어 기록 동기화 (단어 스크립트, 목록마다 처음 한 번 목록 화면을 읽어 등록된 단어를 제외)",
+        variable=ledger_sync_var,
+    ).grid(row=8, column=0, sticky=tk.W)
+
+    verify_frame = ttk.Frame(option_frame)
+    verify_frame.grid(row=9, column=0, sticky=tk.W, pady=(4, 0))
+    ttk.Label(verify_frame, text="카운터 확인 (번호 스크립트, 일괄 확인의 누락은 목록에서 찾아 재등록):").grid(
+        row=0, column=0, sticky=tk.W, padx=(0, 8))
+    verify_var = tk.StringVar(value=next(iter(VERIFY_CHOICES)))
+    ttk.Combobox(
+        verify_frame, textvariable=verify_var, values=list(VERIFY_CHOICES),
+        state='readonly', width=14,
+    ).grid(row=0, column=1, sticky=tk.W)
+
+    # 5. 실행 버튼들
     button_frame = ttk.Frame(main_frame)
-    button_frame.grid(row=3, column=0, columnspan=2, pady=(0, 2))
+    button_frame.grid(row=4, column=0, columnspan=2, pady=(0, 2))
 
     run_button = ttk.Button(button_frame, text="🚀 스크립트 실행", command=on_run_script, state='disabled')
     run_button.grid(row=0, column=0, padx=(0, 10))
@@ -308,9 +469,9 @@ def create_gui():
     stop_button = ttk.Button(button_frame, text="⏹️ 실행 중지", command=on_stop_script, state='disabled')
     stop_button.grid(row=0, column=1)
 
-    # 5. 로그 출력 섹션
+    # 6. 로그 출력 섹션
     log_frame = ttk.LabelFrame(main_frame, text="📋 진행 로그", padding="20")
-    log_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+    log_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
 
     log_text = scrolledtext.ScrolledText(
         log_frame,
@@ -349,7 +510,7 @@ def create_gui():
     log_text.bind("<Control-Button-1>", _show_log_context_menu)
 
     main_frame.columnconfigure(1, weight=1)
-    main_frame.rowconfigure(4, weight=1)
+    main_frame.rowconfigure(5, weight=1)
     log_frame.columnconfigure(0, weight=1)
     log_frame.rowconfigure(0, weight=1)
     root.columnconfigure(0, weight=1)
@@ -373,7 +534,17 @@ def create_gui():
 
     refresh_scripts()
 
+    def _warm_up_appium():
+        threading.Thread(target=server_pool.warm_up, name="appium-warm-up", daemon=True).start()
+
+    def on_close():
+        stop_running_script()
+        session_keeper.shutdown()
+        server_pool.shutdown()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.after(50, _process_log_queue)
-    root.after(1000, auto_open_appium_terminal)
+    root.after(1000, _warm_up_appium)
 
     root.mainloop()
@@ -1,2 +1,2 @@
 from src.runner.config import SCRIPT_MAPPING, get_available_scripts
-from src.runner.executor import execute_script, stop_running_script, is_script_running
+from src.runner.executor import RunManager, run_manager, execute_script, stop_running_script, is_script_running
@@ -6,6 +6,8 @@ import sys
 import threading
 import builtins
 
+from utils.paths import get_data_dir
+
 
 def _find_system_python(extra_path=None):
     """selenium/appium을 실제로 import할 수 있는 시스템 Python 반환
@@ -46,58 +48,349 @@ def _find_system_python(extra_path=None):
             continue
     return None
 
-running_process = None
-running_thread = None
-script_should_stop = False
 
+# 내부 실행(exec)은 os.environ / builtins.print를 프로세스 전체와 공유하므로
+# 여러 작업이 동시에 들어가면 환경변수와 로그가 섞인다. 한 번에 하나씩만 허용한다.
+_in_process_lock = threading.Lock()
 
-def stop_running_script():
-    """실행 중인 스크립트 중지"""
-    global running_process, running_thread, script_should_stop
+MSG_SUCCESS = "🎉 스크립트가 성공적으로 완료되었습니다!"
+MSG_STOPPED = "⏹️ 스크립트가 사용자에 의해 중지되었습니다."
 
-    script_should_stop = True
 
-    if running_process and running_process.poll() is None:
-        try:
-            running_process.terminate()
+def build_script_env(
+    device_name,
+    platform_version,
+    platform_name="android",
+    start_num=1,
+    end_num=600,
+    word_count=200,
+    extra_env=None,
+):
+    """작업별 스크립트 환경변수 생성 (공유 os.environ은 건드리지 않는다)"""
+    env = os.environ.copy()
+    env['APPIUM_DEVICE_NAME'] = device_name
+    env['APPIUM_PLATFORM_VERSION'] = platform_version
+    env['APPIUM_PLATFORM_NAME'] = platform_name
+    env['START_NUM'] = str(start_num)
+    env['END_NUM'] = str(end_num)
+    env['WORD_COUNT'] = str(word_count)
+    env['PYTHONUNBUFFERED'] = '1'
+    env['RUNNER_DATA_DIR'] = str(get_data_dir())
+    if extra_env:
+        env.update({key: str(value) for key, value in extra_env.items()})
+    return env
+
+
+class ScriptJob:
+    """디바이스 하나에 대한 스크립트 실행 단위
+
+    작업마다 환경변수, 서브프로세스, 중지 토큰, 로그 채널을 따로 가지므로
+    여러 디바이스를 동시에 돌려도 서로 간섭하지 않는다.
+    """
+
+    def __init__(self, job_id, script_filename, env, log_callback=None, finish_callback=None,
+                 server_pool=None, session_keeper=None):
+        self.job_id = job_id
+        self.script_filename = script_filename
+        self.env = env
+        self.server_pool = server_pool
+        self.session_keeper = session_keeper
+        self.lease = None
+        self.borrowed_session = False
+        self.process = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self._in_process = False
+        self._log_callback = log_callback
+        self._finish_callback = finish_callback
+
+    def log(self, message):
+        if self._log_callback:
+            self._log_callback(message)
+
+    @property
+    def should_stop(self):
+        return self.stop_event.is_set()
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name=f"job-{self.job_id}", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def is_running(self):
+        if self.process is not None and self.process.poll() is None:
+            return True
+        if self.thread is not None and self.thread.is_alive():
+            return True
+        return False
+
+    def stop(self):
+        """실행 중인 스크립트 중지"""
+        self.stop_event.set()
+
+        process = self.process
+        if process and process.poll() is None:
+            try:
+                process.terminate()
+                try:
+                    process.wait(timeout=3)
+                    return True
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                    return True
+            except Exception as e:
+                print(f"스크립트 중지 오류: {e}")
+                return False
+
+        if self._in_process and self.thread and self.thread.is_alive():
             try:
-                running_process.wait(timeout=3)
-                return True
-            except subprocess.TimeoutExpired:
-                running_process.kill()
-                running_process.wait()
-                return True
+                import ctypes
+                thread_id = self.thread.ident
+                if thread_id is not None:
+                    exc = SystemExit
+                    res = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                        ctypes.c_long(thread_id),
+                        ctypes.py_object(exc),
+                    )
+                    if res == 0:
+                        return False
+                    if res > 1:
+                        ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, None)
+                        return False
+                    return True
+            except Exception as e:
+                print(f"스레드 중지 오류: {e}")
+                return False
+
+        return False
+
+    def _acquire_server(self):
+        """서버 풀에서 이 디바이스 전용 Appium 서버/포트를 할당받아 환경변수에 반영"""
+        device_id = self.env.get('APPIUM_DEVICE_NAME', self.job_id)
+        self.log("🖥️ Appium 서버 준비 중...")
+        try:
+            self.lease = self.server_pool.acquire(device_id)
         except Exception as e:
-            print(f"스크립트 중지 오류: {e}")
-            return False
+            self.log(f"⚠️ Appium 서버 할당 실패: {e}")
+            self.log("   기본 서버(localhost:4723)로 실행합니다.")
+            return
+        self.env.update(self.lease.as_env())
+        self.log(f"🖥️ Appium 서버: {self.lease.server_url}")
+
+    def _borrow_session(self):
+        """세션 유지 기능이 켜져 있으면 미리 만들어 둔 세션을 빌려 환경변수에 반영"""
+        session_env = self.session_keeper.lend(
+            self.env['APPIUM_DEVICE_NAME'],
+            self.env['APPIUM_PLATFORM_VERSION'],
+            self.env['APPIUM_PLATFORM_NAME'],
+            log=self.log,
+        )
+        if session_env is None:
+            self.log("⚠️ 유지 중인 세션을 사용할 수 없어 새 세션으로 실행합니다.")
+            return
+        self.env.update(session_env)
+        self.borrowed_session = True
+
+    def _return_session(self):
+        if self.borrowed_session:
+            self.session_keeper.give_back(self.env['APPIUM_DEVICE_NAME'], log=self.log)
+            self.borrowed_session = False
+
+    def _release_server(self):
+        if self.lease is not None:
+            self.server_pool.release(self.lease.device_id)
+            self.lease = None
+
+    def _run(self):
+        try:
+            script_path = os.path.join("scripts", self.script_filename)
+            if self.server_pool is not None:
+                self._acquire_server()
+            if self.session_keeper is not None:
+                self._borrow_session()
+            if self.should_stop:
+                self.log(MSG_STOPPED)
+                return
+            self.log(f"🚀 스크립트 시작: {self.script_filename}")
 
-    if running_thread and running_thread.is_alive():
+            if getattr(sys, 'frozen', False):
+                self.log("📦 EXE 환경에서 실행합니다. 시스템 Python을 탐색합니다...")
+                python_cmd = _find_system_python(getattr(sys, '_MEIPASS', None))
+
+                if python_cmd:
+                    self.log(f"🐍 시스템 Python({python_cmd})으로 스크립트를 실행합니다.")
+
+                    # PyInstaller의 _MEIPASS 경로가 PATH/PYTHONPATH에 포함되면
+                    # 시스템 Python이 frozen exe용 .pyd(Python 3.10 등)를 잘못 로드해 충돌 발생
+                    # → _MEIPASS 관련 경로를 환경에서 제거
+                    if hasattr(sys, '_MEIPASS'):
+                        meipass = sys._MEIPASS
+                        sep = os.pathsep
+                        for key in ('PATH', 'PYTHONPATH'):
+                            val = self.env.get(key, '')
+                            cleaned = sep.join(p for p in val.split(sep) if p and p != meipass)
+                            if cleaned:
+                                self.env[key] = cleaned
+                            elif key in self.env:
+                                del self.env[key]
+
+                    self._run_subprocess([python_cmd, '-u', script_path])
+                else:
+                    self.log("⚠️ 시스템 Python을 찾을 수 없습니다. 내부 실행을 시도합니다.")
+                    self._run_in_process(script_path)
+            else:
+                self._run_subprocess([sys.executable, '-u', script_path])
+
+        except Exception as e:
+            self.log(f"❌ 스크립트 실행 오류: {e}")
+        finally:
+            self.process = None
+            self._return_session()
+            self._release_server()
+            if self._finish_callback:
+                self._finish_callback()
+
+    def _run_subprocess(self, command):
+        creation_flags = subprocess.CREATE_NO_WINDOW if platform.system() == 'Windows' else 0
+
+        self.process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=0,
+            encoding='utf-8',
+            errors='replace',
+            universal_newlines=True,
+            env=self.env,
+            creationflags=creation_flags,
+        )
+
+        while True:
+            if self.process.poll() is not None:
+                remaining = self.process.stdout.read()
+                if remaining:
+                    for line in remaining.strip().split('\n'):
+                        if line.strip():
+                            self.log(line.strip())
+                break
+            try:
+                output = self.process.stdout.readline()
+                if output:
+                    self.log(output.strip())
+            except Exception as e:
+                self.log(f"로그 읽기 오류: {e}")
+                break
+
+        return_code = self.process.wait()
+        if return_code == 0:
+            self.log(MSG_SUCCESS)
+        elif return_code == -15 or self.should_stop:
+            self.log(MSG_STOPPED)
+        else:
+            self.log(f"❌ 스크립트가 오류로 종료되었습니다. (종료 코드: {return_code})")
+
+    def _run_in_process(self, script_path):
+        if not _in_process_lock.acquire(blocking=False):
+            self.log("⏳ 내부 실행은 한 번에 하나씩만 가능합니다. 이전 작업이 끝날 때까지 대기합니다...")
+            _in_process_lock.acquire()
+        self._in_process = True
+
+        original_print = builtins.print
+        original_environ = dict(os.environ)
+
+        def custom_print(*args, **kwargs):
+            self.log(' '.join(str(arg) for arg in args))
+            original_print(*args, **kwargs)
+
+        builtins.print = custom_print
+        os.environ.update(self.env)
         try:
-            import ctypes
-            thread_id = running_thread.ident
-            if thread_id is not None:
-                exc = SystemExit
-                res = ctypes.pythonapi.PyThreadState_SetAsyncExc(
-                    ctypes.c_long(thread_id),
-                    ctypes.py_object(exc),
-                )
-                if res == 0:
-                    return False
-                if res > 1:
-                    ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, None)
-                    return False
-                return True
+            with open(script_path, 'r', encoding='utf-8') as f:
+                script_code = f.read()
+
+            script_globals = {
+                '__name__': '__main__',
+                '__file__': script_path,
+                'script_should_stop': lambda: self.should_stop,
+            }
+            exec(compile(script_code, script_path, 'exec'), script_globals)
+            self.log(MSG_STOPPED if self.should_stop else MSG_SUCCESS)
+
+        except SystemExit:
+            self.log(MSG_STOPPED if self.should_stop else "✅ 스크립트가 종료되었습니다.")
+        except KeyboardInterrupt:
+            self.log("⏹️ 스크립트가 중단되었습니다.")
         except Exception as e:
-            print(f"스레드 중지 오류: {e}")
-            return False
+            import traceback
+            self.log(f"❌ 스크립트 실행 오류: {e}")
+            self.log(traceback.format_exc())
+        finally:
+            builtins.print = original_print
+            os.environ.clear()
+            os.environ.update(original_environ)
+            self._in_process = False
+            _in_process_lock.release()
 
-    return False
 
+class RunManager:
+    """여러 디바이스의 스크립트 작업을 동시에 실행/관리"""
 
-def run_script_as_module(script_path, log_callback=None):
-    """스크립트를 모듈로 로드하여 직접 실행 (EXE 환경용)"""
-    global script_should_stop
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def start(self, job_id, script_filename, env, log_callback=None, finish_callback=None,
+              server_pool=None, session_keeper=None):
+        """작업 시작. 같은 job_id로 실행 중인 작업이 있으면 먼저 중지한다."""
+        with self._lock:
+            previous = self._jobs.get(job_id)
+
+        if previous is not None and previous.is_running():
+            if log_callback:
+                log_callback("⚠️ 이전 스크립트를 중지하고 새 스크립트를 시작합니다.")
+            previous.stop()
+
+        job = ScriptJob(
+            job_id, script_filename, env, log_callback, finish_callback,
+            server_pool=server_pool, session_keeper=session_keeper,
+        )
+        with self._lock:
+            self._jobs[job_id] = job
+        job.start()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def stop(self, job_id=None):
+        """job_id 작업 중지. None이면 실행 중인 모든 작업 중지"""
+        targets = [self.get(job_id)] if job_id is not None else self.jobs()
+        results = [job.stop() for job in targets if job is not None and job.is_running()]
+        return bool(results) and all(results)
+
+    def is_running(self, job_id=None):
+        """job_id 작업 실행 여부. None이면 하나라도 실행 중인지 확인"""
+        targets = [self.get(job_id)] if job_id is not None else self.jobs()
+        return any(job.is_running() for job in targets if job is not None)
+
+
+run_manager = RunManager()
 
+
+def stop_running_script(job_id=None):
+    """실행 중인 스크립트 중지 (job_id 미지정 시 전체)"""
+    return run_manager.stop(job_id)
+
+
+def run_script_as_module(script_path, log_callback=None, should_stop=None):
+    """스크립트를 모듈로 로드하여 직접 실행 (EXE 환경용)"""
     original_print = builtins.print
 
     def custom_print(*args, **kwargs):
@@ -129,8 +422,8 @@ def run_script_as_module(script_path, log_callback=None):
             code = compile(open(script_path, encoding='utf-8').read(), script_path, 'exec')
             exec(code, script_module.__dict__)
 
-        if log_callback and not script_should_stop:
-            log_callback("🎉 스크립트가 성공적으로 완료되었습니다!")
+        if log_callback and not (should_stop and should_stop()):
+            log_callback(MSG_SUCCESS)
 
     except Exception as e:
         if log_callback:
@@ -151,211 +444,46 @@ def execute_script(
     word_count=200,
     log_callback=None,
     finish_callback=None,
+    job_id=None,
+    extra_env=None,
+    server_pool=None,
+    session_keeper=None,
+    resume=False,
 ):
-    """스크립트를 별도 프로세스 또는 스레드로 실행"""
-    global running_process, running_thread, script_should_stop
-
-    script_should_stop = False
-
-    def run_in_thread():
-        global running_process, script_should_stop
-
-        try:
-            script_path = os.path.join("scripts", script_filename)
-
-            os.environ['APPIUM_DEVICE_NAME'] = device_name
-            os.environ['APPIUM_PLATFORM_VERSION'] = platform_version
-            os.environ['APPIUM_PLATFORM_NAME'] = platform_name
-            os.environ['START_NUM'] = str(start_num)
-            os.environ['END_NUM'] = str(end_num)
-            os.environ['WORD_COUNT'] = str(word_count)
-
-            if log_callback:
-                log_callback(f"🚀 스크립트 시작: {script_filename}")
-
-            if getattr(sys, 'frozen', False):
-                if log_callback:
-                    log_callback("📦 EXE 환경에서 실행합니다. 시스템 Python을 탐색합니다...")
-
-                python_cmd = _find_system_python(getattr(sys, '_MEIPASS', None))
-
-                if python_cmd:
-                    if log_callback:
-                        log_callback(f"🐍 시스템 Python({python_cmd})으로 스크립트를 실행합니다.")
-
-                    env = os.environ.copy()
-                    env['PYTHONUNBUFFERED'] = '1'
-
-                    # PyInstaller의 _MEIPASS 경로가 PATH/PYTHONPATH에 포함되면
-                    # 시스템 Python이 frozen exe용 .pyd(Python 3.10 등)를 잘못 로드해 충돌 발생
-                    # → _MEIPASS 관련 경로를 환경에서 제거
-                    if hasattr(sys, '_MEIPASS'):
-                        meipass = sys._MEIPASS
-                        sep = os.pathsep
-                        for key in ('PATH', 'PYTHONPATH'):
-                            val = env.get(key, '')
-                            cleaned = sep.join(p for p in val.split(sep) if p and p != meipass)
-                            if cleaned:
-                                env[key] = cleaned
-                            elif key in env:
-                                del env[key]
-
-                    creation_flags = subprocess.CREATE_NO_WINDOW if platform.system() == 'Windows' else 0
-
-                    running_process = subprocess.Popen(
-                        [python_cmd, '-u', script_path],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=0,
-                        encoding='utf-8',
-                        errors='replace',
-                        universal_newlines=True,
-                        env=env,
-                        creationflags=creation_flags,
-                    )
-
-                    while True:
-                        if running_process.poll() is not None:
-                            remaining = running_process.stdout.read()
-                            if remaining and log_callback:
-                                for line in remaining.strip().split('\n'):
-                                    if line.strip():
-                                        log_callback(line.strip())
-                            break
-                        try:
-                            output = running_process.stdout.readline()
-                            if output and log_callback:
-                                log_callback(output.strip())
-                        except Exception as e:
-                            if log_callback:
-                                log_callback(f"로그 읽기 오류: {e}")
-                            break
-
-                    return_code = running_process.wait()
-                    if log_callback:
-                        if return_code == 0:
-                            log_callback("🎉 스크립트가 성공적으로 완료되었습니다!")
-                        elif return_code == -15:
-                            log_callback("⏹️ 스크립트가 사용자에 의해 중지되었습니다.")
-                        else:
-                            log_callback(f"❌ 스크립트가 오류로 종료되었습니다. (종료 코드: {return_code})")
-
-                else:
-                    if log_callback:
-                        log_callback("⚠️ 시스템 Python을 찾을 수 없습니다. 내부 실행을 시도합니다.")
-
-                    original_print = builtins.print
-
-                    def custom_print(*args, **kwargs):
-                        msg = ' '.join(str(arg) for arg in args)
-                        if log_callback:
-                            log_callback(msg)
-                        original_print(*args, **kwargs)
-
-                    builtins.print = custom_print
-                    try:
-                        with open(script_path, 'r', encoding='utf-8') as f:
-                            script_code = f.read()
-
-                        script_globals = {
-                            '__name__': '__main__',
-                            '__file__': script_path,
-                            'script_should_stop': lambda: script_should_stop,
-                        }
-                        exec(compile(script_code, script_path, 'exec'), script_globals)
-
-                        if log_callback:
-                            if script_should_stop:
-                                log_callback("⏹️ 스크립트가 사용자에 의해 중지되었습니다.")
-                            else:
-                                log_callback("🎉 스크립트가 성공적으로 완료되었습니다!")
-
-                    except SystemExit:
-                        if log_callback:
-                            msg = "⏹️ 스크립트가 사용자에 의해 중지되었습니다." if script_should_stop else "✅ 스크립트가 종료되었습니다."
-                            log_callback(msg)
-                    except KeyboardInterrupt:
-                        if log_callback:
-                            log_callback("⏹️ 스크립트가 중단되었습니다.")
-                    except Exception as e:
-                        if log_callback:
-                            import traceback
-                            log_callback(f"❌ 스크립트 실행 오류: {e}")
-                            log_callback(traceback.format_exc())
-                    finally:
-                        builtins.print = original_print
-
-            else:
-                env = os.environ.copy()
-                env['PYTHONUNBUFFERED'] = '1'
-
-                creation_flags = 0
-                if platform.system() == 'Windows':
-                    creation_flags = subprocess.CREATE_NO_WINDOW
-
-                running_process = subprocess.Popen(
-                    [sys.executable, '-u', script_path],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=0,
-                    encoding='utf-8',
-                    errors='replace',
-                    universal_newlines=True,
-                    env=env,
-                    creationflags=creation_flags,
-                )
-
-                while True:
-                    if running_process.poll() is not None:
-                        remaining = running_process.stdout.read()
-                        if remaining and log_callback:
-                            for line in remaining.strip().split('\n'):
-                                if line.strip():
-                                    log_callback(line.strip())
-                        break
-                    try:
-                        output = running_process.stdout.readline()
-                        if output and log_callback:
-                            log_callback(output.strip())
-                    except Exception as e:
-                        if log_callback:
-                            log_callback(f"로그 읽기 오류: {e}")
-                        break
-
-                return_code = running_process.wait()
-                if log_callback:
-                    if return_code == 0:
-                        log_callback("🎉 스크립트가 성공적으로 완료되었습니다!")
-                    elif return_code == -15:
-                        log_callback("⏹️ 스크립트가 사용자에 의해 중지되었습니다.")
-                    else:
-                        log_callback(f"❌ 스크립트가 오류로 종료되었습니다. (종료 코드: {return_code})")
-
-        except Exception as e:
-            if log_callback:
-                log_callback(f"❌ 스크립트 실행 오류: {e}")
-        finally:
-            running_process = None
-            script_should_stop = False
-            if finish_callback:
-                finish_callback()
-
-    if running_process and running_process.poll() is None:
-        if log_callback:
-            log_callback("⚠️ 이전 스크립트를 중지하고 새 스크립트를 시작합니다.")
-        stop_running_script()
-
-    running_thread = threading.Thread(target=run_in_thread, daemon=True)
-    running_thread.start()
-    return running_thread
+    """스크립트를 별도 프로세스 또는 스레드로 실행
+
+    job_id를 지정하지 않으면 디바이스 ID를 작업 ID로 사용한다.
+    디바이스마다 독립된 작업으로 실행되므로 여러 디바이스에 동시에 호출할 수 있다.
+    server_pool을 넘기면 디바이스 전용 Appium 서버와 포트를 할당받아 실행한다.
+    session_keeper를 넘기면 미리 만들어 둔 세션을 빌려 세션 생성 시간을 생략한다.
+    resume=True면 중단된 실행의 체크포인트(utils.checkpoint)와 디바이스 카운터를
+    맞춰 보고 다음 회차부터 이어서 실행한다.
+    """
+    env = build_script_env(
+        device_name,
+        platform_version,
+        platform_name=platform_name,
+        start_num=start_num,
+        end_num=end_num,
+        word_count=word_count,
+        extra_env=extra_env,
+    )
+    # 세션 프로필별 소요 시간 통계 등을 스크립트 단위로 구분하기 위한 이름
+    env['RUNNER_SCRIPT'] = os.path.splitext(script_filename)[0]
+    if resume:
+        env['RESUME'] = '1'
+    job = run_manager.start(
+        job_id or device_name,
+        script_filename,
+        env,
+        log_callback=log_callback,
+        finish_callback=finish_callback,
+        server_pool=server_pool,
+        session_keeper=session_keeper,
+    )
+    return job.thread
 
 
-def is_script_running():
-    """스크립트가 실행 중인지 확인"""
-    if running_process is not None and running_process.poll() is None:
-        return True
-    if running_thread is not None and running_thread.is_alive():
-        return True
-    return False
+def is_script_running(job_id=None):
+    """스크립트가 실행 중인지 확인 (job_id 미지정 시 전체 중 하나라도)"""
+    return run_manager.is_running(job_id)
@@ -0,0 +1,256 @@
+"""실행 기록(data/timings) 보고서
+
+    python -m src.runner.report                 # 스크립트별 최근 실행
+    python -m src.runner.report ixiO_add_spamList --runs 5
+    python -m src.runner.report data/timings/<파일>.jsonl
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from utils.paths import get_data_dir
+
+TAIL_COUNT = 5
+
+# 목록 크기별 반영 지연 곡선
+# - 곡선을 맞추기 위한 최소 회차 수
+CURVE_MIN_POINTS = 20
+# - 회차를 목록 크기 순으로 이만큼 구간으로 나눠 구간 중앙값에 맞춘다 (튀는 값 완화)
+CURVE_BINS = 10
+# - 목록 처음 대비 끝의 예측 지연 비가 이 값 미만이면 flat
+FLAT_GROWTH = 1.25
+# - 2차 곡선이 직선보다 오차를 이 비율 이상 줄이면 superlinear
+SUPERLINEAR_GAIN = 0.5
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def load_run(path):
+    """타이밍 파일 하나를 (헤더, 회차 목록)으로 읽기"""
+    header, iterations = {}, []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 강제 종료로 잘린 마지막 줄
+            if entry.get('type') == 'run':
+                header = header or entry
+            elif 'i' in entry:
+                iterations.append(entry)
+    return header, iterations
+
+
+def find_runs(script=None):
+    """타이밍 파일 목록 (오래된 것부터). script를 주면 해당 스크립트만"""
+    pattern = f"{script}_*.jsonl" if script else '*.jsonl'
+    return sorted(get_data_dir('timings').glob(pattern), key=lambda path: path.stat().st_mtime)
+
+
+def _median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def latency_points(iterations):
+    """(목록 크기, 탭→반영 지연 ms) 목록. 카운터가 없는 스크립트는 회차 번호를 크기로 쓴다."""
+    return [(entry.get('n', entry['i']), entry['lat']) for entry in iterations if 'lat' in entry]
+
+
+def _binned(points, bins):
+    ordered = sorted(points)
+    size = max(1, len(ordered) // bins)
+    chunks = [ordered[start:start + size] for start in range(0, len(ordered), size)]
+    if len(chunks) > 1 and len(chunks[-1]) < size // 2:
+        chunks[-2].extend(chunks.pop())
+    return ([_median([x for x, _ in chunk]) for chunk in chunks],
+            [_median([y for _, y in chunk]) for chunk in chunks])
+
+
+def fit_latency_curve(points):
+    """목록 크기에 따른 반영 지연 증가 형태 판정 (flat / linear / superlinear)
+
+    NumPy로 1차·2차 다항식을 함께 맞춰, 직선 기울기로 flat / linear를 가르고
+    2차 곡선이 훨씬 잘 맞으면 superlinear로 본다.
+    """
+    if len(points) < CURVE_MIN_POINTS:
+        return None
+    xs, ys = _binned(points, CURVE_BINS)
+    if len(xs) < 3 or xs[0] == xs[-1]:
+        return None
+
+    x, y = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    slope, intercept = np.polyfit(x, y, 1)
+    quad = np.polyfit(x, y, 2)
+    sse_linear = float(np.sum((np.polyval((slope, intercept), x) - y) ** 2))
+    sse_quad = float(np.sum((np.polyval(quad, x) - y) ** 2))
+    superlinear = quad[0] > 0 and sse_quad < sse_linear * (1 - SUPERLINEAR_GAIN)
+
+    first = max(float(slope * xs[0] + intercept), 1.0)
+    last = float(slope * xs[-1] + intercept)
+    growth = last / first
+    if growth < FLAT_GROWTH:
+        model = 'flat'
+    elif superlinear:
+        model = 'superlinear'
+    else:
+        model = 'linear'
+    return {
+        'model': model,
+        'growth': growth,
+        'per_100_ms': float(slope) * 100,
+        'from_n': xs[0],
+        'to_n': xs[-1],
+        'first_ms': ys[0],
+        'last_ms': ys[-1],
+        'points': len(points),
+    }
+
+
+def count_entries(iterations):
+    """반영 확인한 등록 건수. 건수를 남기지 않은 이전 기록은 회차마다 한 건으로 본다."""
+    if any('e' in entry for entry in iterations):
+        return sum(entry.get('e', 0) for entry in iterations)
+    return len(iterations)
+
+
+def _per_entry_ms(entry):
+    return entry['ms'] / max(entry.get('e', 1), 1)
+
+
+def summarize(header, iterations):
+    totals = sorted(entry['ms'] for entry in iterations)
+    busy_ms = sum(totals)
+    entries = count_entries(iterations)
+    # 처리량은 첫 회차 시작부터 마지막 회차 끝까지의 실행 시간 기준
+    run_ms = (max(entry['t'] * 1000 + entry['ms'] for entry in iterations)
+              - min(entry['t'] * 1000 for entry in iterations)) if iterations else 0.0
+    phases = {}
+    for entry in iterations:
+        for name, ms in entry['p'].items():
+            phases.setdefault(name, []).append(ms)
+    phase_rows = []
+    for name, values in phases.items():
+        ordered = sorted(values)
+        phase_rows.append({
+            'phase': name,
+            'total_ms': sum(ordered),
+            'share': sum(ordered) / busy_ms if busy_ms else 0.0,
+            'avg_ms': sum(ordered) / len(iterations),
+            'p95_ms': _percentile(ordered, 0.95),
+        })
+    phase_rows.sort(key=lambda row: row['total_ms'], reverse=True)
+    return {
+        'script': header.get('script', '?'),
+        'device': header.get('device'),
+        'started': header.get('started'),
+        'options': header.get('options') or {},
+        'iterations': len(iterations),
+        'entries': entries,
+        'busy_s': busy_ms / 1000,
+        'run_s': run_ms / 1000,
+        'per_minute': entries / (run_ms / 60000) if run_ms else 0.0,
+        'p50_ms': _percentile(totals, 0.50),
+        'p95_ms': _percentile(totals, 0.95),
+        'p99_ms': _percentile(totals, 0.99),
+        'phases': phase_rows,
+        # 여러 건을 넣은 회차(빠른 채우기)가 목록을 차지하지 않도록 건당 시간으로 고른다.
+        'tail': sorted(iterations, key=_per_entry_ms, reverse=True)[:TAIL_COUNT],
+        'curve': fit_latency_curve(latency_points(iterations)),
+    }
+
+
+def format_run(summary, path=None):
+    options = ', '.join(f"{key}={value}" for key, value in summary['options'].items()) or '기본'
+    lines = [
+        f"📄 {summary['script']} — {summary['device']} ({summary['started']}) [{options}]",
+    ]
+    if path is not None:
+        lines.append(f"   {path}")
+    if not summary['iterations']:
+        lines.append("   기록된 회차 없음")
+        return lines
+    lines.append(f"   회차 {summary['iterations']}개 · 등록 {summary['entries']}건 · {summary['run_s']:.1f}초 · "
+                 f"분당 {summary['per_minute']:.1f}건 · 회차 p50 {summary['p50_ms']:.0f}ms / "
+                 f"p95 {summary['p95_ms']:.0f}ms / p99 {summary['p99_ms']:.0f}ms")
+    lines.append(f"   {'단계':<10}{'합계(초)':>10}{'비중':>8}{'평균(ms)':>11}{'p95(ms)':>10}")
+    for row in summary['phases']:
+        lines.append(f"   {row['phase']:<10}{row['total_ms'] / 1000:>10.1f}{row['share'] * 100:>7.0f}%"
+                     f"{row['avg_ms']:>11.0f}{row['p95_ms']:>10.0f}")
+    lines.append("   가장 느린 회차:")
+    for entry in summary['tail']:
+        slowest = max(entry['p'].items(), key=lambda item: item[1], default=('-', 0))
+        batch = f", {entry['e']}건 · 건당 {_per_entry_ms(entry):.0f}ms" if entry.get('e', 1) > 1 else ''
+        lines.append(f"     #{entry['i']:<5} {entry['ms']:>8.0f}ms  (최대 단계 {slowest[0]} {slowest[1]:.0f}ms{batch})")
+    curve = summary['curve']
+    if curve is not None:
+        flag = '' if curve['model'] == 'flat' else ' ⚠️'
+        lines.append(f"   목록 크기별 반영 지연: {curve['from_n']:.0f}개 {curve['first_ms']:.0f}ms → "
+                     f"{curve['to_n']:.0f}개 {curve['last_ms']:.0f}ms (×{curve['growth']:.2f}, "
+                     f"100개당 {curve['per_100_ms']:+.0f}ms) — {curve['model']}{flag}")
+    return lines
+
+
+def format_comparison(summaries):
+    """같은 스크립트의 여러 실행을 한 줄씩 비교 (옵션별 효과 확인용)"""
+    lines = ["📊 실행 비교"]
+    for summary in summaries:
+        options = ', '.join(f"{key}={value}" for key, value in summary['options'].items()) or '기본'
+        top = summary['phases'][0]['phase'] if summary['phases'] else '-'
+        lines.append(f"   {summary['started']}  분당 {summary['per_minute']:>6.1f}건  "
+                     f"p95 {summary['p95_ms']:>6.0f}ms  최대 단계 {top:<8} [{options}]")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스크립트 실행 단계 시간 보고서")
+    parser.add_argument('target', nargs='?', help="스크립트 이름(확장자 제외) 또는 타이밍 파일 경로")
+    parser.add_argument('--runs', type=int, default=1, help="스크립트별로 보여줄 최근 실행 수")
+    args = parser.parse_args(argv)
+
+    if args.target and Path(args.target).is_file():
+        paths = [Path(args.target)]
+    else:
+        script = Path(args.target).stem if args.target else None
+        runs = find_runs(script)
+        if not runs:
+            print("기록된 실행이 없습니다. (data/timings)")
+            return 1
+        by_script = {}
+        for path in runs:
+            header, _ = load_run(path)
+            by_script.setdefault(header.get('script', path.stem), []).append(path)
+        paths = [path for group in by_script.values() for path in group[-args.runs:]]
+
+    summaries = []
+    for path in paths:
+        summary = summarize(*load_run(path))
+        summaries.append(summary)
+        print('\n'.join(format_run(summary, path)))
+        print()
+    if len(summaries) > 1 and len({summary['script'] for summary in summaries}) == 1:
+        print('\n'.join(format_comparison(summaries)))
+
+    degraded = [summary for summary in summaries if summary['curve'] and summary['curve']['model'] != 'flat']
+    if degraded:
+        print("⚠️ 목록이 찰수록 등록 반영이 느려지는 실행")
+        for summary in degraded:
+            curve = summary['curve']
+            print(f"   {summary['script']} — {summary['device']} ({summary['started']}): "
+                  f"{curve['model']}, ×{curve['growth']:.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
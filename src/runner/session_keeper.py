@@ -0,0 +1,261 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from utils.safe_print import safe_print
+
+KEEPALIVE_INTERVAL = 30
+# 세션 유지 프로그램(GUI)이 비정상 종료돼도 세션이 영원히 남지 않도록
+# keepalive 주기보다 넉넉한 newCommandTimeout을 건다.
+NEW_COMMAND_TIMEOUT = 300
+SESSION_CREATE_TIMEOUT = 180
+LEND_WAIT_TIMEOUT = 120
+# 세션 생성이 실패한 디바이스는 이 간격(초)부터 두 배씩 늘려 가며 다시 시도한다.
+RETRY_BASE_DELAY = 10
+RETRY_MAX_DELAY = 300
+
+
+def _w3c_request(method, url, payload=None, timeout=10):
+    """W3C WebDriver 요청 후 (HTTP 상태 코드, 응답 JSON) 반환"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(url, data=data, method=method)
+    request.add_header('Content-Type', 'application/json; charset=utf-8')
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read().decode('utf-8') or '{}')
+    except urllib.error.HTTPError as e:
+        try:
+            return e.code, json.loads(e.read().decode('utf-8') or '{}')
+        except ValueError:
+            return e.code, {}
+
+
+def build_warm_caps(device_name, platform_version, platform_name, lease=None):
+    """앱 지정 없이 디바이스에만 붙는 범용 세션 capability
+
+    어떤 스크립트가 선택될지 모르는 시점에 미리 만들어 두는 세션이라
+    appPackage / bundleId를 넣지 않는다. 스크립트는 어차피 사용자가
+    대상 화면까지 진입해 둔 상태에서 현재 화면을 조작한다.
+    """
+    if platform_name == 'ios':
+        caps = {
+            "platformName": "iOS",
+            "appium:automationName": "XCUITest",
+            "appium:udid": device_name,
+            "appium:deviceName": "iPhone",
+            "appium:platformVersion": platform_version,
+        }
+        if lease is not None:
+            caps["appium:wdaLocalPort"] = lease.wda_local_port
+    else:
+        caps = {
+            "platformName": "Android",
+            "appium:automationName": "UiAutomator2",
+            "appium:deviceName": device_name,
+            "appium:udid": device_name,
+            "appium:platformVersion": platform_version,
+        }
+        if lease is not None:
+            caps["appium:systemPort"] = lease.system_port
+    if lease is not None:
+        caps["appium:mjpegServerPort"] = lease.mjpeg_server_port
+    caps["appium:noReset"] = True
+    caps["appium:newCommandTimeout"] = NEW_COMMAND_TIMEOUT
+    return caps
+
+
+class WarmSession:
+    """디바이스 하나에 대해 유지 중인 Appium 세션"""
+
+    def __init__(self, device_name, platform_version, platform_name):
+        self.device_name = device_name
+        self.platform_version = platform_version
+        self.platform_name = platform_name
+        self.lease = None
+        self.session_id = None
+        self.caps = {}
+        self.busy = False
+        self.ready = threading.Event()
+        self.error = None
+        self.failures = 0
+        self.retry_at = 0.0
+
+    @property
+    def session_url(self):
+        return f"{self.lease.server_url}/session/{self.session_id}"
+
+    @property
+    def retry_due(self):
+        """생성이 실패한 채로 끝났고 재시도 대기 시간이 지났는지"""
+        return self.ready.is_set() and not self.session_id and time.monotonic() >= self.retry_at
+
+
+class SessionKeeper:
+    """디바이스별 Appium 세션을 미리 만들어 두고 keepalive로 유지하다가
+    GUI에서 실행하는 스크립트에 빌려준다 (옵트인).
+
+    UiAutomator2 / WDA 세션 부트스트랩(특히 iOS 20~40초)을
+    실행할 때마다 반복하지 않기 위함.
+    """
+
+    def __init__(self, server_pool):
+        self._server_pool = server_pool
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._keepalive_thread = None
+
+    def prepare(self, device_name, platform_version, platform_name, log=safe_print):
+        """백그라운드에서 세션 생성 시작 (이미 있으면 무시)"""
+        with self._lock:
+            warm = self._sessions.get(device_name)
+            if warm is not None and warm.platform_name == platform_name:
+                retry = self._claim_retry(warm)
+        if warm is not None and warm.platform_name == platform_name:
+            if retry:
+                log(f"♻️ [{device_name}] 이전에 실패한 세션 생성을 다시 시도합니다.")
+                self._start_create(warm, log)
+            return warm
+        if warm is not None:
+            self.discard(device_name)
+
+        with self._lock:
+            warm = WarmSession(device_name, platform_version, platform_name)
+            self._sessions[device_name] = warm
+
+        self._start_create(warm, log)
+        self._start_keepalive()
+        return warm
+
+    def _claim_retry(self, warm):
+        # 실패한 세션의 재시도를 한 곳에서만 시작하도록 ready를 먼저 내린다. (_lock 안에서 호출)
+        if not warm.busy and warm.retry_due:
+            warm.ready.clear()
+            return True
+        return False
+
+    def _start_create(self, warm, log):
+        threading.Thread(
+            target=self._create, args=(warm, log), name=f"warm-session-{warm.device_name}", daemon=True
+        ).start()
+
+    def _create(self, warm, log):
+        warm.ready.clear()
+        warm.error = None
+        try:
+            if warm.lease is None:
+                warm.lease = self._server_pool.acquire(warm.device_name)
+            log(f"♻️ [{warm.device_name}] 세션 미리 생성 중...")
+            started = time.time()
+            caps = build_warm_caps(warm.device_name, warm.platform_version, warm.platform_name, warm.lease)
+            status, body = _w3c_request(
+                'POST',
+                f"{warm.lease.server_url}/session",
+                {"capabilities": {"alwaysMatch": caps, "firstMatch": [{}]}},
+                timeout=SESSION_CREATE_TIMEOUT,
+            )
+            value = body.get('value', {})
+            if status != 200 or 'sessionId' not in value:
+                raise RuntimeError(value.get('message', f"HTTP {status}"))
+            warm.session_id = value['sessionId']
+            warm.caps = value.get('capabilities', {})
+            warm.failures = 0
+            log(f"♻️ [{warm.device_name}] 세션 준비 완료 ({time.time() - started:.1f}초)")
+        except Exception as e:
+            warm.session_id = None
+            warm.error = e
+            warm.failures += 1
+            delay = min(RETRY_BASE_DELAY * 2 ** (warm.failures - 1), RETRY_MAX_DELAY)
+            warm.retry_at = time.monotonic() + delay
+            log(f"⚠️ [{warm.device_name}] 세션 미리 생성 실패: {e} — {delay}초 뒤 다시 시도합니다.")
+        finally:
+            warm.ready.set()
+
+    def _is_alive(self, warm):
+        if not warm.session_id:
+            return False
+        try:
+            status, _ = _w3c_request('GET', f"{warm.session_url}/timeouts")
+            return status == 200
+        except (urllib.error.URLError, OSError, ValueError):
+            return False
+
+    def lend(self, device_name, platform_version, platform_name, log=safe_print):
+        """유지 중인 세션을 스크립트에 빌려준다. 스크립트에 넘길 환경변수 dict 반환 (실패 시 None)"""
+        warm = self.prepare(device_name, platform_version, platform_name, log=log)
+        if not warm.ready.wait(LEND_WAIT_TIMEOUT) or not warm.session_id:
+            return None
+
+        with self._lock:
+            if warm.busy:
+                return None
+            warm.busy = True
+
+        if not self._is_alive(warm):
+            log("♻️ 유지 중인 세션이 끊어져 다시 생성합니다...")
+            self._create(warm, log)
+            if not warm.session_id:
+                warm.busy = False
+                return None
+
+        return {
+            'APPIUM_SESSION_ID': warm.session_id,
+            'APPIUM_SESSION_CAPS': json.dumps(warm.caps),
+        }
+
+    def give_back(self, device_name, log=safe_print):
+        """스크립트가 끝난 세션을 돌려받는다. 스크립트 도중 세션이 죽었으면 다시 만든다."""
+        with self._lock:
+            warm = self._sessions.get(device_name)
+        if warm is None:
+            return
+        if not self._is_alive(warm):
+            warm.ready.clear()
+            threading.Thread(target=self._create, args=(warm, log), daemon=True).start()
+        warm.busy = False
+
+    def _start_keepalive(self):
+        with self._lock:
+            if self._keepalive_thread is not None and self._keepalive_thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._keepalive_thread = threading.Thread(
+                target=self._keepalive, name="warm-session-keepalive", daemon=True
+            )
+            self._keepalive_thread.start()
+
+    def _keepalive(self):
+        while not self._stop_event.wait(KEEPALIVE_INTERVAL):
+            with self._lock:
+                idle = [w for w in self._sessions.values() if w.ready.is_set() and not w.busy]
+                retry = [w for w in idle if self._claim_retry(w)]
+            for warm in idle:
+                if warm in retry:
+                    safe_print(f"♻️ [{warm.device_name}] 실패한 세션 생성을 다시 시도합니다.")
+                    self._create(warm, safe_print)
+                elif warm.session_id and not self._is_alive(warm):
+                    safe_print(f"⚠️ [{warm.device_name}] 유지 중인 세션이 종료되어 다시 생성합니다.")
+                    self._create(warm, safe_print)
+
+    def discard(self, device_name):
+        """세션 종료 및 서버 할당 해제"""
+        with self._lock:
+            warm = self._sessions.pop(device_name, None)
+        if warm is None:
+            return
+        if warm.session_id and warm.lease is not None:
+            try:
+                _w3c_request('DELETE', warm.session_url)
+            except (urllib.error.URLError, OSError, ValueError):
+                pass
+        if warm.lease is not None:
+            self._server_pool.release(device_name)
+
+    def shutdown(self):
+        self._stop_event.set()
+        with self._lock:
+            device_names = list(self._sessions)
+        for device_name in device_names:
+            self.discard(device_name)
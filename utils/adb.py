@@ -0,0 +1,63 @@
+import os
+import subprocess
+
+# =============================================================
+# ✨ 스크립트에서 ADB를 직접 호출하는 함수
+# - Appium을 거치지 않고 디바이스에 shell 명령을 보낼 때 사용한다.
+#   (IME 브로드캐스트 입력 등)
+# =============================================================
+
+ADB_KEYBOARD_IME = 'com.android.adbkeyboard/.AdbIME'
+
+
+def _adb_env():
+    # GUI/EXE에서 띄운 스크립트는 PATH에 adb가 빠져 있을 수 있어
+    # GUI와 같은 PATH 보정을 적용한다.
+    try:
+        from src.core.environment import _get_env_with_full_path
+        return _get_env_with_full_path()
+    except Exception:
+        return os.environ.copy()
+
+
+# =============================================================
+# - 현재 스크립트 대상 디바이스 시리얼 (GUI가 넘겨준 APPIUM_DEVICE_NAME)
+# =============================================================
+def device_serial():
+    return os.environ.get('APPIUM_DEVICE_NAME')
+
+
+# =============================================================
+# - adb -s <serial> shell <args...> 실행 후 표준출력 반환
+#   실패하면 CalledProcessError
+# - Args (매개변수) :
+#       args : shell 명령과 인자
+#       serial : 디바이스 시리얼 (생략 시 현재 스크립트 대상 디바이스)
+# =============================================================
+def adb_shell(*args, serial=None, timeout=10):
+    return adb('shell', *args, serial=serial, timeout=timeout)
+
+def adb(*args, serial=None, timeout=10):
+    serial = serial or device_serial()
+    command = ['adb'] + (['-s', serial] if serial else []) + list(args)
+    result = subprocess.run(command, capture_output=True, text=True, encoding='utf-8',
+                            errors='replace', timeout=timeout, env=_adb_env())
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+    return result.stdout
+
+
+# =============================================================
+# - ADBKeyBoard IME(브로드캐스트로 텍스트 입력) 설치 여부
+# =============================================================
+def has_adb_keyboard(serial=None):
+    try:
+        return ADB_KEYBOARD_IME in adb_shell('ime', 'list', '-s', serial=serial)
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+def current_ime(serial=None):
+    return adb_shell('settings', 'get', 'secure', 'default_input_method', serial=serial).strip()
+
+def set_ime(ime, serial=None):
+    adb_shell('ime', 'set', ime, serial=serial)
@@ -0,0 +1,181 @@
+import asyncio
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+from utils.direct_client import _DirectClient
+from utils.util import POLL_INTERVAL
+
+# =============================================================
+# ✨ asyncio 기반 드라이버 파사드
+# - selenium/Appium 클라이언트는 동기식이라 서로 독립적인 요청(i번째
+#   입력창 입력과 등록 버튼 조회, 디버깅용 스크린샷 등)도 하나씩
+#   순서대로 기다린다. 이 파사드는 같은 Appium 세션에 keep-alive 연결
+#   여러 개를 열어 두고 독립적인 명령을 동시에 보낸다.
+# - 화면을 바꾸는 명령(click, send_keys)은 순서가 섞이면 안 되므로
+#   하나의 락으로 직렬화하고, 조회 명령만 겹쳐서 보낸다.
+# - utils.util과 같은 이름의 find / find_all / click / send_keys / get_text 제공
+#
+#   async def step(adriver):
+#       count, field = await asyncio.gather(
+#           adriver.get_text(AppiumBy.ID, counter_id),
+#           adriver.find(AppiumBy.ID, field_id),
+#       )
+#
+#   run_async(driver, step)  # 동기 스크립트에서 한 번 호출
+#
+#   adriver = AsyncDriver(driver)  # 루프에서 반복 호출할 때는 연결을 재사용한다
+#   adriver.run(step)
+# =============================================================
+
+DEFAULT_POOL_SIZE = 4
+
+
+def _server_url(driver):
+    try:
+        return driver.command_executor._client_config.remote_server_addr
+    except AttributeError:
+        from utils.session import get_server_url
+        return get_server_url()
+
+
+class _AppiumConnection(_DirectClient):
+    name = 'Appium'
+
+
+class AsyncElement:
+    def __init__(self, adriver, element_id):
+        self._adriver = adriver
+        self.id = element_id
+
+    async def click(self):
+        async with self._adriver.ui_lock:
+            await self._adriver.command('POST', f"/element/{self.id}/click", {})
+
+    async def send_keys(self, text):
+        async with self._adriver.ui_lock:
+            await self._adriver.command('POST', f"/element/{self.id}/value",
+                                        {'text': text, 'value': list(text)})
+
+    async def text(self):
+        return await self._adriver.command('GET', f"/element/{self.id}/text")
+
+    async def rect(self):
+        return await self._adriver.command('GET', f"/element/{self.id}/rect")
+
+
+class AsyncDriver:
+    """Appium 세션 하나에 대한 비동기 명령 파사드 (세션 생성/종료는 기존 드라이버가 담당)"""
+
+    def __init__(self, driver, pool_size=DEFAULT_POOL_SIZE):
+        self.driver = driver
+        parsed = urlparse(_server_url(driver))
+        self._connections = queue.Queue()
+        for _ in range(pool_size):
+            connection = _AppiumConnection(driver, parsed.hostname or '127.0.0.1', parsed.port or 80,
+                                           driver.session_id)
+            connection.base_path = parsed.path.rstrip('/')
+            self._connections.put(connection)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='async-driver')
+        self._ui_lock = None
+
+    @property
+    def ui_lock(self):
+        # 락은 실행 중인 이벤트 루프 안에서 만들어야 한다.
+        if self._ui_lock is None:
+            self._ui_lock = asyncio.Lock()
+        return self._ui_lock
+
+    def _send(self, method, path, payload):
+        connection = self._connections.get()
+        # utils.watchdog가 세션을 다시 만들면 같은 드라이버의 세션 ID가 바뀐다.
+        connection.session_id = self.driver.session_id
+        try:
+            return connection.command(method, path, payload)
+        finally:
+            self._connections.put(connection)
+
+    async def command(self, method, path, payload=None):
+        """빈 연결 하나로 명령 실행 (연결 수만큼 동시에 보낼 수 있다)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._send, method, path, payload)
+
+    async def _find_once(self, by, value, multiple):
+        found = await self.command('POST', '/elements', {'using': by, 'value': value})
+        elements = [AsyncElement(self, item.get('element-6066-11e4-a52e-4f735466cecf') or item.get('ELEMENT'))
+                    for item in found or []]
+        return elements if multiple else (elements[0] if elements else None)
+
+    async def _poll(self, by, value, timeout, multiple):
+        deadline = time.monotonic() + timeout
+        while True:
+            result = await self._find_once(by, value, multiple)
+            if result:
+                return result
+            if time.monotonic() >= deadline:
+                raise TimeoutException(f"요소를 찾을 수 없습니다: {value} ({timeout}초)")
+            await asyncio.sleep(POLL_INTERVAL)
+
+    # =============================================================
+    # - utils.util과 같은 동작의 비동기 버전
+    # =============================================================
+    async def find(self, by, value, timeout=10):
+        return await self._poll(by, value, timeout, multiple=False)
+
+    async def find_all(self, by, value, timeout=10):
+        return await self._poll(by, value, timeout, multiple=True)
+
+    async def _retry_stale(self, by, value, action, timeout, retries):
+        last_exc = None
+        for _ in range(retries):
+            try:
+                return await action(await self.find(by, value, timeout=timeout))
+            except StaleElementReferenceException as e:
+                last_exc = e
+        raise last_exc
+
+    async def click(self, by, value, timeout=10, retries=3):
+        await self._retry_stale(by, value, lambda el: el.click(), timeout, retries)
+
+    async def send_keys(self, by, value, text, timeout=10, retries=3):
+        async def _type(element):
+            await element.click()
+            await element.send_keys(text)
+            return element
+        return await self._retry_stale(by, value, _type, timeout, retries)
+
+    async def get_text(self, by, value, timeout=10, retries=3):
+        return await self._retry_stale(by, value, lambda el: el.text(), timeout, retries)
+
+    async def screenshot(self):
+        """base64 PNG (화면을 바꾸지 않으므로 다른 명령과 겹쳐 보낼 수 있다)"""
+        return await self.command('GET', '/screenshot')
+
+    async def page_source(self):
+        return await self.command('GET', '/source')
+
+    def run(self, coroutine_function):
+        """동기 코드에서 coroutine_function(self)를 새 이벤트 루프로 실행하고 결과 반환"""
+        # 락은 루프마다 새로 만든다.
+        self._ui_lock = None
+        return asyncio.run(coroutine_function(self))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        while not self._connections.empty():
+            self._connections.get().close()
+
+
+# =============================================================
+# - 동기 스크립트에서 비동기 작업 실행
+#   coroutine_function(adriver)를 새 이벤트 루프에서 실행하고 결과 반환
+# =============================================================
+def run_async(driver, coroutine_function, pool_size=DEFAULT_POOL_SIZE):
+    adriver = AsyncDriver(driver, pool_size=pool_size)
+    try:
+        return adriver.run(coroutine_function)
+    finally:
+        adriver.close()
@@ -0,0 +1,154 @@
+import json
+import os
+import time
+
+from utils.paths import get_data_dir
+
+# =============================================================
+# ✨ 등록 루프 체크포인트 (중단된 실행 이어서 하기)
+# - 스크립트 루프가 등록을 확인할 때마다 마지막 회차 번호와 디바이스 카운터를
+#   data/checkpoints/<스크립트>_<디바이스>.jsonl 에 한 줄씩 남긴다.
+#   (헤더: 디바이스, 앱, 목록 종류, 요청 범위, 단어 스크립트는 뽑은 단어 목록)
+# - RESUME=1 (GUI: 중단된 실행 이어서 하기)이면 기록과 현재 카운터를 맞춰 보고
+#   다음 회차부터 시작한다. 마지막 기록 이후 카운터가 더 늘어 있으면 기록하기 전에
+#   등록된 것이므로 그만큼 건너뛴다.
+# - 루프를 끝까지 돈 실행은 done 줄을 남겨 다음 RESUME에서 이어가지 않는다.
+# =============================================================
+
+
+def resume_enabled():
+    return os.environ.get('RESUME') == '1'
+
+
+def checkpoint_path(script=None, device=None):
+    script = script or os.environ.get('RUNNER_SCRIPT') or 'script'
+    device = (device or os.environ.get('APPIUM_DEVICE_NAME') or 'device').replace(':', '_')
+    return get_data_dir('checkpoints') / f"{script}_{device}.jsonl"
+
+
+def load_checkpoint(script=None, device=None):
+    """체크포인트 기록 읽기 → {'header', 'last', 'done'} (기록이 없으면 None)
+
+    last : 마지막으로 확인된 회차 {'i': 회차 번호, 'c': 그때의 카운터}
+    """
+    try:
+        with open(checkpoint_path(script, device), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    state = {'header': None, 'last': None, 'done': False}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue  # 강제 종료로 잘린 마지막 줄
+        kind = entry.get('type')
+        if kind == 'run':
+            state = {'header': entry, 'last': None, 'done': False}
+        elif kind == 'done':
+            state['done'] = True
+        elif 'i' in entry:
+            state['last'] = entry
+    return state if state['header'] else None
+
+
+def describe_checkpoint(script=None, device=None):
+    """GUI 로그용 한 줄 요약 (이어갈 기록이 없으면 None)"""
+    state = load_checkpoint(script, device)
+    if not state or state['done'] or not state['last']:
+        return None
+    header, last = state['header'], state['last']
+    counter = f", 카운터 {last['c']}" if last.get('c') is not None else ''
+    return (f"{header.get('list_type') or header.get('app')}: 마지막 확인 회차 {last['i']}{counter} "
+            f"({header.get('started')} 시작)")
+
+
+class Checkpoint:
+    """스크립트 루프 하나의 체크포인트 기록
+
+    app / list_type이 이전 기록과 같을 때만 이어서 실행한다.
+    (같은 디바이스라도 다른 목록 화면에서 돌린 기록은 쓰지 않는다)
+    """
+
+    def __init__(self, app, list_type=None):
+        self.app = app
+        self.list_type = list_type
+        self.path = checkpoint_path()
+        self.previous = None
+        self._file = None
+        if resume_enabled():
+            state = load_checkpoint()
+            if state and not state['done'] and state['last'] \
+                    and state['header'].get('app') == app and state['header'].get('list_type') == list_type:
+                self.previous = state
+            elif state and not state['done'] and state['last']:
+                print(f"📌 다른 목록의 체크포인트라 이어가지 않습니다: {state['header'].get('list_type')}")
+            else:
+                print("📌 이어갈 체크포인트가 없어 처음부터 실행합니다.")
+
+    @property
+    def saved_items(self):
+        """이어서 실행할 때 이전 실행이 뽑아 둔 항목 목록 (단어 스크립트)"""
+        return self.previous['header'].get('items') if self.previous else None
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def _reconcile(self, counter):
+        last = self.previous['last']
+        next_index = last['i'] + 1
+        if counter is None or last.get('c') is None:
+            return next_index
+        delta = counter - last['c']
+        if delta > 0:
+            print(f"📌 마지막 기록 이후 {delta}건이 더 등록되어 있어 건너뜁니다. "
+                  f"(카운터 {last['c']} → {counter})")
+            return next_index + delta
+        if delta < 0:
+            print(f"⚠️ 디바이스 카운터가 기록보다 적습니다 ({last['c']} → {counter}). "
+                  f"목록이 수동으로 바뀌었을 수 있어 기록 다음 회차부터 진행합니다.")
+        return next_index
+
+    # =============================================================
+    # - 루프 시작 전 호출 → 이번 실행에서 시작할 회차 번호 반환
+    # - Args (매개변수) :
+    #       start : 요청한 시작 회차 (START_NUM, 단어 스크립트는 1)
+    #       counter : 지금 디바이스 카운터 (없는 화면은 None)
+    #       items : 이번 실행이 등록할 항목 목록 (이어서 실행할 때 그대로 다시 쓴다)
+    # =============================================================
+    def begin(self, start, counter=None, items=None):
+        if self.previous:
+            index = self._reconcile(counter)
+            self._file = open(self.path, 'a', encoding='utf-8')
+            self._write({'type': 'resume', 'at': index, 'c': counter,
+                         'time': time.strftime('%Y-%m-%d %H:%M:%S')})
+            print(f"📌 체크포인트에서 이어서 실행: {index}회차부터 (마지막 확인 {self.previous['last']['i']}회차)")
+            return index
+        self._file = open(self.path, 'w', encoding='utf-8')
+        header = {
+            'type': 'run',
+            'device': os.environ.get('APPIUM_DEVICE_NAME'),
+            'app': self.app,
+            'list_type': self.list_type,
+            'start': start,
+            'end': int(os.environ.get('END_NUM') or 0) or None,
+            'started': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'c': counter,
+        }
+        if items is not None:
+            header['items'] = list(items)
+        self._write(header)
+        return start
+
+    def confirm(self, index, counter=None):
+        """index 회차까지 등록 확인 (counter : 확인한 디바이스 카운터)"""
+        if self._file is not None:
+            self._write({'i': index, 'c': counter})
+
+    def finish(self):
+        """루프를 끝까지 돈 실행 — 다음 RESUME에서 이어가지 않는다."""
+        if self._file is not None:
+            self._write({'type': 'done', 'time': time.strftime('%Y-%m-%d %H:%M:%S')})
+            self._file.close()
+            self._file = None
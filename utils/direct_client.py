@@ -0,0 +1,363 @@
+import http.client
+import json
+import os
+import socket
+import re
+import time
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    InvalidElementStateException,
+    InvalidSelectorException,
+    InvalidSessionIdException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from utils.tracer import trace_enabled, tracer
+
+# =============================================================
+# ✨ 디바이스 측 자동화 서버 직접 호출 클라이언트
+# - 스크립트 → Appium(Node) → UiAutomator2 서버 / WebDriverAgent 경로에서
+#   Appium을 거치지 않고, Appium이 포워딩해 둔 로컬 포트(systemPort /
+#   wdaLocalPort)로 디바이스 서버에 바로 요청해 명령마다 한 단계의 중계
+#   지연을 없앤다.
+# - 세션 생성/종료는 지금처럼 Appium이 담당하고, 루프 안의 요소 조회 /
+#   클릭 / 입력 / 텍스트 읽기만 직접 보낸다.
+# - 스크립트가 hot_driver()로 명시적으로 사용할 때만 동작하며
+#   GUI 실행 옵션(DIRECT_CLIENT=1)이 켜져 있어야 한다.
+# - DIRECT_CLIENT_URL을 주면 포워딩 포트 대신 그 주소의 서버로 보낸다.
+#   (src.bench.suite의 *_direct 시나리오가 흉내 서버에 붙여 루프 전체를 직접 경로로 돌린다)
+# =============================================================
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# W3C 오류 코드 → selenium 예외 (기존 스크립트의 except 구문이 그대로 동작하도록)
+_W3C_ERRORS = {
+    'no such element': NoSuchElementException,
+    'stale element reference': StaleElementReferenceException,
+    'invalid element state': InvalidElementStateException,
+    'element not interactable': ElementNotInteractableException,
+    'element click intercepted': ElementClickInterceptedException,
+    'invalid selector': InvalidSelectorException,
+    'invalid session id': InvalidSessionIdException,
+    'timeout': TimeoutException,
+}
+
+
+def direct_client_enabled():
+    return os.environ.get('DIRECT_CLIENT') == '1'
+
+
+def _endpoint_override():
+    # DIRECT_CLIENT_URL(예: http://127.0.0.1:4799/wd/hub)이 있으면 포워딩 포트 대신 그 주소로 보낸다.
+    # (오프라인 벤치마크가 직접 경로를 흉내 서버에 붙일 때)
+    url = os.environ.get('DIRECT_CLIENT_URL')
+    if not url:
+        return None
+    address, _, path = url.split('://', 1)[-1].partition('/')
+    host, _, port = address.partition(':')
+    return host, int(port or 80), f"/{path}".rstrip('/')
+
+
+def _short_type(element_type):
+    # XCUIElementTypeStaticText → StaticText (WDA JSON 트리 형식)
+    return element_type[len('XCUIElementType'):] if element_type.startswith('XCUIElementType') else element_type
+
+
+def _route(path):
+    # 추적 기록에서 같은 명령끼리 묶이도록 요소 ID와 쿼리를 지운다.
+    return re.sub(r'/element/[^/]+', '/element/:id', path.split('?', 1)[0])
+
+
+class DirectElement:
+    """직접 클라이언트가 반환하는 요소 (selenium WebElement에서 스크립트가 쓰는 부분만)"""
+
+    def __init__(self, client, element_id):
+        self._client = client
+        self.id = element_id
+
+    def _path(self, suffix=''):
+        return f"/element/{self.id}{suffix}"
+
+    def click(self):
+        self._client.command('POST', self._path('/click'), {})
+
+    def send_keys(self, text):
+        self._client.command('POST', self._path('/value'), self._client.value_payload(self.id, text))
+
+    def clear(self):
+        self._client.command('POST', self._path('/clear'), {})
+
+    @property
+    def text(self):
+        return self._client.command('GET', self._path('/text'))
+
+    def get_attribute(self, name):
+        return self._client.command('GET', self._path(f'/attribute/{name}'))
+
+    @property
+    def rect(self):
+        return self._client.command('GET', self._path('/rect'))
+
+
+class _DirectClient:
+    """keep-alive HTTP 연결 하나로 디바이스 서버에 W3C 명령을 보내는 공통 부분"""
+
+    base_path = ''
+
+    def __init__(self, driver, host, port, session_id, timeout=30, base_path=None):
+        self.driver = driver
+        self.host = host
+        self.port = port
+        self.session_id = session_id
+        if base_path is not None:
+            self.base_path = base_path
+        self.timeout = timeout
+        self._conn = None
+        self.commands = 0
+        self.elapsed = 0.0
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._conn.connect()
+            # 작은 요청이 많아 Nagle 지연(~40ms)이 그대로 명령 지연이 되므로 끈다.
+            self._conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return self._conn
+
+    def request(self, method, path, payload=None):
+        """(HTTP 상태, 응답 JSON) 반환. 연결이 끊겨 있으면 한 번 다시 연결한다."""
+        # 헤더와 본문이 한 번에 전송되도록 bytes로 넘긴다.
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json; charset=utf-8', 'Connection': 'keep-alive'}
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, f"{self.base_path}{path}", body=body, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+                return response.status, json.loads(raw.decode('utf-8') or '{}')
+            except (http.client.HTTPException, ConnectionError):
+                self.close()
+                if attempt:
+                    raise
+        return None, {}
+
+    def command(self, method, path, payload=None):
+        """세션 명령 실행 후 value 반환. 오류 응답은 selenium 예외로 바꿔 던진다."""
+        started = time.monotonic()
+        status, body = self.request(method, f"/session/{self.session_id}{path}", payload)
+        elapsed = time.monotonic() - started
+        self.commands += 1
+        self.elapsed += elapsed
+        if trace_enabled():
+            strategy = (payload or {}).get('using') or (payload or {}).get('strategy')
+            tracer.record(f"{self.name} {method} {_route(path)}", strategy, elapsed,
+                          len(json.dumps(body.get('value'), default=str)), ok=status == 200)
+        value = body.get('value')
+        if status != 200 or (isinstance(value, dict) and 'error' in value):
+            error = value.get('error', '') if isinstance(value, dict) else ''
+            message = value.get('message', f"HTTP {status}") if isinstance(value, dict) else f"HTTP {status}"
+            raise _W3C_ERRORS.get(error, WebDriverException)(message)
+        return value
+
+    def _element_id(self, value):
+        return value.get(ELEMENT_KEY) or value.get('ELEMENT')
+
+    def locator_payload(self, by, value):
+        return {'using': by, 'value': value}
+
+    def value_payload(self, element_id, text):
+        return {'text': text, 'value': list(text)}
+
+    def find_element(self, by, value):
+        found = self.command('POST', '/element', self.locator_payload(by, value))
+        return DirectElement(self, self._element_id(found))
+
+    def find_elements(self, by, value):
+        found = self.command('POST', '/elements', self.locator_payload(by, value)) or []
+        return [DirectElement(self, self._element_id(item)) for item in found]
+
+    def __getattr__(self, name):
+        # 직접 클라이언트가 구현하지 않은 명령(press_keycode, page_source 등)은
+        # 원래 Appium 드라이버로 보낸다.
+        return getattr(self.driver, name)
+
+    def refresh(self):
+        """세션을 다시 만든 뒤 디바이스 서버의 새 세션 ID / 포트로 갱신 (utils.watchdog)"""
+        fresh = self.connect(self.driver)
+        self.close()
+        self.host, self.port, self.session_id = fresh.host, fresh.port, fresh.session_id
+        self.base_path = fresh.base_path
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def print_stats(self):
+        if self.commands:
+            print(f"🔌 {self.name} 직접 호출: {self.commands}회, 평균 {self.elapsed / self.commands * 1000:.0f}ms")
+
+
+class UiAutomator2Client(_DirectClient):
+    """Appium이 adb forward로 열어 둔 systemPort(기본 8200)의 UiAutomator2 서버 직접 호출"""
+
+    name = 'UiAutomator2'
+    base_path = '/wd/hub'
+
+    @classmethod
+    def connect(cls, driver):
+        caps = driver.capabilities or {}
+        override = _endpoint_override()
+        if override:
+            host, port, base_path = override
+        else:
+            host, base_path = '127.0.0.1', None
+            port = int(os.environ.get('APPIUM_SYSTEM_PORT') or caps.get('systemPort') or 8200)
+        client = cls(driver, host, port, None, base_path=base_path)
+        # 디바이스 서버의 세션 ID는 Appium 세션 ID와 다르다.
+        status, body = client.request('GET', '/sessions')
+        sessions = (body.get('value') or []) if status == 200 else []
+        if not sessions:
+            raise WebDriverException(f"UiAutomator2 서버 세션을 찾을 수 없습니다. (포트 {port})")
+        client.session_id = sessions[0].get('id') or sessions[0].get('sessionId')
+        return client
+
+    def locator_payload(self, by, value):
+        # UiAutomator2 서버는 Appium 드라이버와 같은 strategy/selector 형식을 받는다.
+        return {'strategy': by, 'selector': value, 'context': '', 'multiple': False}
+
+    def find_elements(self, by, value):
+        payload = dict(self.locator_payload(by, value), multiple=True)
+        found = self.command('POST', '/elements', payload) or []
+        return [DirectElement(self, self._element_id(item)) for item in found]
+
+    def value_payload(self, element_id, text):
+        return {'elementId': element_id, 'text': text, 'replace': False}
+
+
+class WdaClient(_DirectClient):
+    """Appium이 wdaLocalPort(기본 8100)로 포워딩해 둔 WebDriverAgent 직접 호출
+
+    class chain / predicate locator를 그대로 쓸 수 있고, page_source와
+    labels()는 화면 트리를 한 번에 받아 요소별 속성 조회 왕복을 없앤다.
+    """
+
+    name = 'WebDriverAgent'
+    # Appium locator 이름 → WDA locator 이름
+    STRATEGIES = {
+        '-ios class chain': 'class chain',
+        '-ios predicate string': 'predicate string',
+    }
+
+    @classmethod
+    def connect(cls, driver):
+        caps = driver.capabilities or {}
+        url = caps.get('webDriverAgentUrl')
+        override = _endpoint_override()
+        base_path = None
+        if override:
+            host, port, base_path = override
+        elif url:
+            host, _, port = url.split('://', 1)[-1].rstrip('/').partition(':')
+            port = int(port or 8100)
+        else:
+            host = '127.0.0.1'
+            port = int(os.environ.get('APPIUM_WDA_LOCAL_PORT') or caps.get('wdaLocalPort') or 8100)
+        client = cls(driver, host, port, None, base_path=base_path)
+        # Appium이 만든 WDA 세션 ID는 /status 응답에 들어 있다.
+        status, body = client.request('GET', '/status')
+        if status != 200 or not body.get('sessionId'):
+            raise WebDriverException(f"WebDriverAgent 세션을 찾을 수 없습니다. ({host}:{port})")
+        client.session_id = body['sessionId']
+        return client
+
+    def locator_payload(self, by, value):
+        return {'using': self.STRATEGIES.get(by, by), 'value': value}
+
+    @property
+    def page_source(self):
+        return self.command('GET', '/source')
+
+    def labels(self, element_type=None):
+        """화면 트리 한 번 조회로 (type, label) 목록을 문서 순서로 반환
+
+        JSON 트리의 type은 'StaticText'처럼 XCUIElementType 접두사가 빠진 이름이라
+        element_type은 접두사를 붙여도, 빼도 된다.
+        """
+        wanted = _short_type(element_type) if element_type else None
+        tree = self.command('GET', '/source?format=json&excluded_attributes=frame,enabled,visible,accessible')
+        result = []
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if wanted is None or _short_type(node.get('type') or '') == wanted:
+                result.append((node.get('type'), node.get('label') or ''))
+            stack.extend(reversed(node.get('children') or []))
+        return result
+
+
+# =============================================================
+# - 같은 locator를 Appium 경로와 직접 경로로 조회해 결과(개수, 텍스트)가
+#   같은지 확인. 다르면 차이 설명 문자열 반환 (같으면 None)
+# =============================================================
+def compare_paths(driver, client, locators):
+    for by, value in locators:
+        regular = driver.find_elements(by, value)
+        direct = client.find_elements(by, value)
+        if len(regular) != len(direct):
+            return f"{value}: 요소 수 {len(regular)} ≠ {len(direct)}"
+        if regular and regular[0].text != direct[0].text:
+            return f"{value}: 텍스트 '{regular[0].text}' ≠ '{direct[0].text}'"
+    return None
+
+
+# =============================================================
+# - 루프에서 쓸 드라이버 반환
+#   DIRECT_CLIENT=1이면 직접 클라이언트를 만들어 probes locator로 Appium 경로와
+#   결과가 같은지 확인한 뒤 반환하고, 사용할 수 없거나 결과가 다르면
+#   원래 드라이버를 그대로 반환한다.
+# - Args (매개변수) :
+#       driver : Appium webDriver
+#       probes : 검증에 사용할 [(by, value), ...] (화면에 있는 요소)
+# =============================================================
+def hot_driver(driver, probes=()):
+    if not direct_client_enabled():
+        return driver
+    platform = ((driver.capabilities or {}).get('platformName') or '').lower()
+    client_class = _CLIENTS.get(platform)
+    if client_class is None:
+        return driver
+    try:
+        client = client_class.connect(driver)
+        mismatch = compare_paths(driver, client, probes)
+    except (WebDriverException, OSError, ValueError) as e:
+        print(f"⚠️ {platform} 직접 연결 불가, Appium 경로 사용: {e}")
+        return driver
+    if mismatch:
+        print(f"⚠️ 직접 연결 결과가 Appium 경로와 달라 사용하지 않습니다: {mismatch}")
+        client.close()
+        return driver
+    print(f"🔌 {client.name} 서버 직접 연결 (포트 {client.port})")
+    return client
+
+
+# =============================================================
+# - 루프 종료 후 직접 클라이언트 통계 출력 및 연결 정리
+# =============================================================
+def release_hot_driver(hot, driver):
+    if hot is driver:
+        return
+    hot.print_stats()
+    hot.close()
+
+
+_CLIENTS = {
+    'android': UiAutomator2Client,
+    'ios': WdaClient,
+}
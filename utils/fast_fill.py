@@ -0,0 +1,146 @@
+import os
+import subprocess
+
+from utils.adb import adb, adb_shell
+
+# =============================================================
+# ✨ ADB 직접 입력 빠른 채우기 (Android 번호 스크립트)
+# - 한도 팝업을 보기 위해 599개를 채우는 구간은 화면 검증이 필요 없으므로
+#   Appium 대신 캐시한 탭 좌표 + `adb shell input`으로 여러 건을 한 번의
+#   adb 호출로 입력한다.
+# - 배치마다 카운터를 한 번 읽어 실제 반영 개수를 확인하고, 예상보다
+#   적게 반영되면 즉시 멈춘다. 한도 직전 몇 건과 팝업 확인은 원래처럼
+#   Appium이 이어서 진행한다.
+# - 멈춘 배치는 어느 항목이 빠졌는지 모르므로 shortfall로 넘기고,
+#   스크립트가 CounterVerifier로 빠진 항목을 찾아 다시 등록한다.
+# - 카운터는 기본적으로 Appium(스크립트의 read_counter)으로 읽는다.
+#   FAST_FILL_DUMP=1이면 `uiautomator dump`(exec-out)로 읽는데, 이때
+#   UiAutomator2 서버의 UiAutomation 연결이 끊길 수 있어 기본값은 끈다.
+# =============================================================
+
+DEFAULT_BATCH = 10
+# 한도까지 남겨 두고 Appium에 넘길 건수
+DEFAULT_HANDOVER = 3
+# 배치 입력 후 카운터가 예상 값에 도달하기를 기다리는 최대 시간(초)
+VERIFY_TIMEOUT = 10
+
+
+def fast_fill_enabled():
+    return os.environ.get('FAST_FILL') == '1'
+
+
+def handover_count():
+    return int(os.environ.get('FAST_FILL_HANDOVER', DEFAULT_HANDOVER))
+
+
+# =============================================================
+# - Appium 요소의 중앙 좌표 (adb input tap 좌표로 사용)
+# =============================================================
+def tap_point(element):
+    rect = element.rect
+    return int(rect['x'] + rect['width'] / 2), int(rect['y'] + rect['height'] / 2)
+
+
+def _input_text_arg(text):
+    # input text는 공백을 %s로 받는다. 셸 특수문자는 작은따옴표로 감싼다.
+    return "'" + str(text).replace(' ', '%s').replace("'", "'\\''") + "'"
+
+
+# =============================================================
+# - uiautomator dump로 현재 화면 스냅샷 (실패 시 None)
+# =============================================================
+def dump_snapshot():
+    from utils.snapshot import PageSnapshot
+    try:
+        output = adb('exec-out', 'uiautomator', 'dump', '/dev/tty', timeout=20)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    # XML 뒤에 "UI hierchary dumped to: /dev/tty" 안내 문구가 붙는다.
+    end = output.rfind('>')
+    if end < 0:
+        return None
+    try:
+        return PageSnapshot(output[:end + 1])
+    except Exception:
+        return None
+
+
+class FastFill:
+    """회차 하나를 adb input 명령 목록으로 정의해 배치 단위로 실행
+
+    steps 예: [('tap', (x, y)), ('text', None), ('key', 4), ('tap', (bx, by))]
+    ('text', None)은 회차 값으로, ('pause', 초)는 디바이스 측 sleep으로 바뀐다.
+    """
+
+    def __init__(self, steps, read_counter=None, dump_counter=None, batch=DEFAULT_BATCH):
+        self.steps = steps
+        self.batch = batch
+        self._appium_counter = read_counter
+        self._dump_counter = dump_counter
+        self._use_dump = os.environ.get('FAST_FILL_DUMP') == '1' and dump_counter is not None
+        # 반영이 덜 된 배치 (values 안의 시작 위치, 배치 항목, 배치 직전 카운터) — 없으면 None
+        self.shortfall = None
+
+    def _commands(self, value):
+        commands = []
+        for kind, arg in self.steps:
+            if kind == 'tap':
+                commands.append(f"input tap {arg[0]} {arg[1]}")
+            elif kind == 'text':
+                commands.append(f"input text {_input_text_arg(value)}")
+            elif kind == 'key':
+                commands.append(f"input keyevent {arg}")
+            elif kind == 'pause':
+                commands.append(f"sleep {arg}")
+        return commands
+
+    def read_counter(self):
+        if self._use_dump:
+            snap = dump_snapshot()
+            if snap is not None:
+                try:
+                    return self._dump_counter(snap)
+                except Exception:
+                    pass
+            print("⚠️ uiautomator dump 카운터 읽기 실패 — Appium으로 읽습니다.")
+            self._use_dump = False
+        return self._appium_counter() if self._appium_counter else None
+
+    def _wait_counter(self, expected):
+        from utils.util import wait_until
+        latest = [None]
+
+        def _reached():
+            latest[0] = self.read_counter()
+            return latest[0] is not None and latest[0] >= expected
+        wait_until(_reached, step='fast_fill_batch', timeout=VERIFY_TIMEOUT, required=False)
+        return latest[0]
+
+    # =============================================================
+    # - values를 배치 단위로 입력. (입력 시도한 건수, 마지막 카운터) 반환
+    #   카운터가 예상보다 적게 늘면 그 배치에서 멈추고 shortfall에 남긴다.
+    # - Args (매개변수) :
+    #       values : 회차별 입력 문자열
+    #       count : 시작 시점 카운터 (None이면 검증 없이 입력만)
+    # =============================================================
+    def run(self, values, count=None):
+        values = list(values)
+        attempted = 0
+        self.shortfall = None
+        for start in range(0, len(values), self.batch):
+            chunk = values[start:start + self.batch]
+            commands = [command for value in chunk for command in self._commands(value)]
+            adb_shell('; '.join(commands), timeout=30 + 5 * len(chunk))
+            attempted += len(chunk)
+
+            if count is None or (self._appium_counter is None and not self._use_dump):
+                print(f"⚡ 빠른 채우기: {attempted}/{len(values)}건 입력")
+                continue
+            current = self._wait_counter(count + len(chunk))
+            print(f"⚡ 빠른 채우기: {attempted}/{len(values)}건 입력 (등록 개수 {current})")
+            if current is None or current < count + len(chunk):
+                print(f"⚠️ 빠른 채우기 반영 누락 (예상 {count + len(chunk)}, 실제 {current}) — Appium으로 전환합니다.")
+                self.shortfall = (start, chunk, count)
+                return attempted, current
+            count = current
+        return attempted, count
@@ -0,0 +1,154 @@
+import os
+import random
+import sqlite3
+import time
+
+from utils.paths import get_data_dir
+
+# =============================================================
+# ✨ 등록한 단어 기록 (디바이스 / 앱 / 목록별)
+# - 단어 스크립트가 등록한(또는 목록에 이미 있어 중복으로 반영되지 않은)
+#   단어를 data/ledger/words.sqlite3 에 남기고, 다음 실행의 random.sample은
+#   기록에 있는 단어를 빼고 뽑는다. (앱이 중복으로 거부해 회차를 낭비하지 않도록)
+# - (디바이스, 앱, 목록, 단어)가 기본키인 WITHOUT ROWID 테이블 하나라
+#   색인 외에 따로 쌓이는 행 데이터가 없다.
+# - 시작 시 카운터가 0이면 목록을 비운 것으로 보고 그 목록의 기록을 지운다.
+# - LEDGER_SYNC=1 (GUI: 단어 기록 동기화)이면 시작할 때 page_source 스냅샷
+#   한 번으로 화면에 보이는 목록의 단어를 기록에 더한다.
+#   (이 도구 밖에서 등록한 단어 — 화면에 보이는 행만 읽힌다)
+#   동기화는 목록마다 한 번만 하고 synced 테이블에 표시해 둔다. 목록을
+#   비워 기록을 지우면 표시도 지워 다음 실행에서 다시 동기화한다.
+# - LEDGER=0이면 기록을 쓰지 않는다.
+# =============================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    device TEXT NOT NULL,
+    app TEXT NOT NULL,
+    list_type TEXT NOT NULL,
+    word TEXT NOT NULL,
+    added INTEGER NOT NULL,
+    PRIMARY KEY (device, app, list_type, word)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS synced (
+    device TEXT NOT NULL,
+    app TEXT NOT NULL,
+    list_type TEXT NOT NULL,
+    synced INTEGER NOT NULL,
+    PRIMARY KEY (device, app, list_type)
+) WITHOUT ROWID;
+"""
+
+
+def ledger_enabled():
+    return os.environ.get('LEDGER') != '0'
+
+
+def ledger_sync_enabled():
+    return os.environ.get('LEDGER_SYNC') == '1'
+
+
+def ledger_path():
+    return get_data_dir('ledger') / 'words.sqlite3'
+
+
+class WordLedger:
+    """목록 하나(디바이스 + 앱 + 목록 종류)의 등록 단어 기록
+
+    LEDGER=0이면 아무것도 읽거나 쓰지 않는 빈 기록처럼 동작한다.
+    """
+
+    def __init__(self, app, list_type, device=None):
+        self.key = ((device or os.environ.get('APPIUM_DEVICE_NAME') or 'device'), app, list_type or '')
+        self._db = None
+        if ledger_enabled():
+            self._db = sqlite3.connect(str(ledger_path()), timeout=10)
+            self._db.executescript(_SCHEMA)
+            self._db.commit()
+
+    def words(self):
+        if self._db is None:
+            return set()
+        rows = self._db.execute(
+            "SELECT word FROM words WHERE device = ? AND app = ? AND list_type = ?", self.key)
+        return {word for (word,) in rows}
+
+    def __len__(self):
+        if self._db is None:
+            return 0
+        return self._db.execute(
+            "SELECT COUNT(*) FROM words WHERE device = ? AND app = ? AND list_type = ?", self.key).fetchone()[0]
+
+    def add(self, *words):
+        """등록(또는 목록에 이미 있어 중복으로 거부)된 단어 기록 → 새로 기록한 수"""
+        if self._db is None or not words:
+            return 0
+        added = int(time.time())
+        before = self._db.total_changes
+        self._db.executemany("INSERT OR IGNORE INTO words VALUES (?, ?, ?, ?, ?)",
+                             [(*self.key, word, added) for word in words])
+        self._db.commit()
+        return self._db.total_changes - before
+
+    def clear(self):
+        if self._db is None:
+            return
+        self._db.execute("DELETE FROM words WHERE device = ? AND app = ? AND list_type = ?", self.key)
+        self._db.execute("DELETE FROM synced WHERE device = ? AND app = ? AND list_type = ?", self.key)
+        self._db.commit()
+
+    def synced(self):
+        """이 목록의 화면 동기화를 이미 했는지"""
+        if self._db is None:
+            return False
+        return self._db.execute(
+            "SELECT 1 FROM synced WHERE device = ? AND app = ? AND list_type = ?", self.key).fetchone() is not None
+
+    def _mark_synced(self):
+        self._db.execute("INSERT OR REPLACE INTO synced VALUES (?, ?, ?, ?)", (*self.key, int(time.time())))
+        self._db.commit()
+
+    def _prepare(self, candidates, counter, driver):
+        # 실행 시작 시 기록 정리 (목록 비움 감지 / 화면 동기화) → 뽑을 때 뺄 단어 집합
+        if self._db is None:
+            return set()
+        known = len(self)
+        if counter == 0 and known:
+            print(f"📒 목록이 비어 있어 등록 단어 기록 {known}건을 지웁니다.")
+            self.clear()
+        elif counter is not None and known > counter:
+            print(f"📒 등록 단어 기록({known}건)이 목록 카운터({counter})보다 많습니다. "
+                  f"앱에서 지운 단어가 있으면 다시 뽑히지 않을 수 있습니다.")
+        if driver is not None and ledger_sync_enabled():
+            if self.synced():
+                print("📒 이 목록은 이미 화면 동기화를 해 두어 건너뜁니다.")
+            else:
+                from utils.snapshot import snapshot
+
+                candidates = set(candidates)
+                shown = [text.strip() for text in snapshot(driver).texts()]
+                synced = self.add(*{text for text in shown if text in candidates})
+                self._mark_synced()
+                print(f"📒 목록 화면 동기화: 화면의 단어 {synced}건을 새로 기록했습니다.")
+        return self.words()
+
+    # =============================================================
+    # - 기록에 없는 단어 중 count개를 무작위로 선택
+    # - Args (매개변수) :
+    #       candidates : 후보 단어 목록 (동기화 때 화면 문구 중 후보에 있는 것만 기록)
+    #       counter : 지금 목록 카운터 (0이면 목록을 비운 것으로 보고 기록 삭제)
+    #       driver : LEDGER_SYNC=1일 때 page_source를 읽을 드라이버
+    # =============================================================
+    def sample(self, candidates, count, counter=None, driver=None):
+        registered = self._prepare(candidates, counter, driver)
+        pool = [word for word in candidates if word not in registered]
+        if len(pool) < len(candidates):
+            print(f"📒 이전에 등록한 단어 {len(candidates) - len(pool)}개를 빼고 뽑습니다.")
+        if len(pool) < count:
+            print(f"⚠️ 기록에 없는 단어가 {len(pool)}개뿐이라 그만큼만 선택합니다.")
+        return random.sample(pool, min(count, len(pool)))
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
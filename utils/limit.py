@@ -0,0 +1,60 @@
+# =============================================================
+# ✨ 한도 감시 루프 (최대 등록 갯수에 닿으면 바로 팝업 확인으로 전환)
+# - 등록 루프가 디바이스 카운터를 update()로 넘기면 한도(limit) 도달 여부를 판단한다.
+# - items()로 감싼 반복은 한도에 닿는 순간 남은 항목(WORD_COUNT / END_NUM으로
+#   요청한 나머지)을 건너뛰고 끝난다. 이후 스크립트가 한도 팝업을 확인한다.
+# - 카운터가 없는 화면(스팸전화알림)은 한도 팝업을 발견했을 때 stop()을 호출한다.
+#
+#     limit = LimitLoop(max_count, list_length)
+#     for index, word in watchdog.attempts(limit.items(enumerate(words, 1))):
+#         with watchdog.step(index):
+#             ... 등록 ...
+#             limit.update(read_counter())
+#     if limit.reached:
+#         ... 팝업 확인 ...
+# =============================================================
+
+
+class LimitLoop:
+    """카운터 기준 한도 감시
+
+    limit : 앱의 최대 등록 갯수
+    counter : 지금 디바이스 카운터 (모르면 None — 한도 판단은 update()부터)
+    """
+
+    def __init__(self, limit, counter=None):
+        self.limit = limit
+        self.counter = counter
+        self._stopped = False
+
+    @property
+    def reached(self):
+        return self._stopped or (self.counter is not None and self.counter >= self.limit)
+
+    @property
+    def remaining(self):
+        """한도까지 남은 등록 가능 갯수 (카운터를 모르면 None)"""
+        if self.counter is None:
+            return None
+        return max(self.limit - self.counter, 0)
+
+    def update(self, counter):
+        """카운터 갱신 → 한도에 닿았으면 True"""
+        if counter is not None:
+            self.counter = counter
+        return self.reached
+
+    def stop(self):
+        """카운터 없이 한도 팝업으로 한도 도달을 확인했을 때"""
+        self._stopped = True
+
+    def items(self, iterable):
+        """한도에 닿으면 남은 항목을 건너뛰는 반복"""
+        iterator = iter(iterable)
+        for item in iterator:
+            if self.reached:
+                skipped = 1 + sum(1 for _ in iterator)
+                counter = f" ({self.counter}/{self.limit})" if self.counter is not None else ''
+                print(f"🛑 한도 도달{counter} — 요청한 항목 중 남은 {skipped}건은 건너뜁니다.")
+                return
+            yield item
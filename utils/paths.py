@@ -0,0 +1,58 @@
+import os
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def get_data_dir(*parts):
+    """로그/기록 파일을 저장할 쓰기 가능한 데이터 경로 반환 (없으면 생성)
+
+    GUI가 스크립트를 실행할 때 RUNNER_DATA_DIR로 경로를 넘겨주므로
+    서브프로세스로 뜬 스크립트도 GUI와 같은 위치에 기록을 남긴다.
+    """
+    base = os.environ.get('RUNNER_DATA_DIR')
+    if not base:
+        if getattr(sys, 'frozen', False):
+            # 앱 번들은 읽기 전용일 수 있으므로 사용자 데이터 디렉토리에 저장
+            system = platform.system().lower()
+            if system == "darwin":
+                base = Path.home() / "Library" / "Application Support" / "AppiumScriptRunner" / "data"
+            elif system == "windows":
+                base = Path(os.environ.get("APPDATA", str(Path.home()))) / "AppiumScriptRunner" / "data"
+            else:
+                base = Path.home() / ".appium-script-runner" / "data"
+        else:
+            base = BASE_DIR / "data"
+
+    path = Path(base).joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+_run_stamp = None
+
+
+def begin_run():
+    """새 실행 시작 (세션 생성 시 호출). 다음에 여는 기록 파일부터 새 시각 접미사를 쓴다.
+
+    GUI 내부 실행은 한 프로세스에서 스크립트를 여러 번 돌리므로 import 시점이 아니라
+    실행마다 시각을 정해야 이전 실행 파일에 이어 쓰지 않는다.
+    """
+    global _run_stamp
+    _run_stamp = None
+
+
+def get_run_file(kind, suffix='.jsonl'):
+    """스크립트 실행 한 번의 기록 파일 경로 (data/<kind>/<스크립트>_<디바이스>_<시각><suffix>)
+
+    같은 실행의 기록(추적, 단계 시간 등)은 처음 연 파일의 시각 접미사를 함께 쓴다.
+    """
+    global _run_stamp
+    if _run_stamp is None:
+        _run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    script = os.environ.get('RUNNER_SCRIPT') or 'script'
+    device = (os.environ.get('APPIUM_DEVICE_NAME') or 'device').replace(':', '_')
+    return get_data_dir(kind) / f"{script}_{device}_{_run_stamp}{suffix}"
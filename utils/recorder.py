@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# =============================================================
+# ✨ WebDriver 통신 기록 (재생 벤치마크용)
+# - APPIUM_RECORD=1 이면 selenium RemoteConnection._request를 감싸
+#   요청(메서드, 경로, 본문)과 응답(클라이언트가 받은 그대로), 소요 시간을
+#   data/recordings/<스크립트>_<디바이스>_<시각>.jsonl 에 순서대로 남긴다.
+# - 기록 파일은 src.bench.replay가 Appium 대신 응답을 돌려주는 데 쓴다.
+#   (디바이스 없이 수정한 스크립트의 명령 수 / 클라이언트 비용 비교)
+# - 직접 클라이언트(utils.direct_client)와 async_driver의 요청은 selenium을
+#   거치지 않아 기록되지 않는다.
+# =============================================================
+
+
+_REPLAY_ENV = ('START_NUM', 'END_NUM', 'WORD_COUNT', 'APPIUM_PLATFORM_VERSION')
+
+
+def recording_enabled():
+    return os.environ.get('APPIUM_RECORD') == '1'
+
+
+class TrafficRecorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file = None
+        self._started = None
+        self._seq = 0
+        self.path = None
+
+    def _open(self, started):
+        from utils.paths import get_run_file
+        self.path = get_run_file('recordings')
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._started = started
+        self._seq = 0
+        header = {
+            'type': 'recording',
+            'script': os.environ.get('RUNNER_SCRIPT') or 'script',
+            'device': os.environ.get('APPIUM_DEVICE_NAME'),
+            'platform': os.environ.get('APPIUM_PLATFORM_NAME'),
+            'started': time.strftime('%Y-%m-%d %H:%M:%S'),
+            # 재생할 때 같은 범위로 돌리기 위한 실행 인자
+            'env': {key: os.environ[key] for key in _REPLAY_ENV if key in os.environ},
+        }
+        self._file.write(json.dumps(header, ensure_ascii=False) + '\n')
+
+    def record(self, method, url, body, response, started, elapsed):
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            payload = body
+        with self._lock:
+            if self._file is None:
+                self._open(started)
+            self._seq += 1
+            entry = {
+                'seq': self._seq,
+                't': round(started - self._started, 4),
+                'ms': round(elapsed * 1000, 2),
+                'method': method,
+                'path': urlparse(url).path,
+                'body': payload,
+                'response': response,
+            }
+            self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+
+    def finish(self):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        print(f"📼 WebDriver 통신 기록: {self.path} ({self._seq}건)")
+
+
+recorder = TrafficRecorder()
+_installed = False
+
+
+# =============================================================
+# - RemoteConnection._request에 기록 훅 설치 (APPIUM_RECORD=1일 때만, 1회)
+#   utils.session.create_driver가 세션 생성 전에 호출한다.
+# =============================================================
+def install():
+    global _installed
+    if _installed or not recording_enabled():
+        return
+    from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+    original = RemoteConnection._request
+
+    def recorded_request(self, method, url, body=None):
+        started = time.monotonic()
+        response = original(self, method, url, body=body)
+        recorder.record(method, url, body, response, started, time.monotonic() - started)
+        return response
+
+    RemoteConnection._request = recorded_request
+    _installed = True
+
+
+def finish():
+    if recording_enabled():
+        recorder.finish()
@@ -0,0 +1,54 @@
+import json
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+# =============================================================
+# ✨ Appium execute-driver 플러그인으로 반복 루프를 서버에서 실행
+# - 입력 → 등록 → 카운터 확인 한 회차에 클라이언트↔서버 왕복이 6~7번
+#   생기는데, 루프 전체를 WebdriverIO 스크립트로 서버에 보내면
+#   한 배치(기본 50회)당 왕복 1번으로 줄어든다.
+# - 서버에 플러그인이 설치되어 있어야 한다:
+#       appium plugin install execute-driver
+#   (서버 풀은 설치 여부를 확인해 --use-plugins=execute-driver로 띄운다)
+# - 팝업 확인 등 최종 검증은 기존처럼 파이썬 쪽에서 한다.
+# =============================================================
+
+DEFAULT_BATCH_SIZE = 50
+# 배치 하나(최대 50회 등록)를 서버가 처리하는 데 허용할 시간
+BATCH_TIMEOUT_MS = 5 * 60 * 1000
+
+
+# =============================================================
+# - 서버 측 루프 사용 여부 (GUI 실행 옵션 → SERVER_LOOP=1)
+# =============================================================
+def server_loop_enabled():
+    return os.environ.get('SERVER_LOOP') == '1'
+
+
+# =============================================================
+# - items를 batch_size씩 나눠 서버에서 script를 실행하고
+#   회차별 결과를 순서대로 하나씩 반환(generator)
+#   script 안의 __ARGS__ 자리에 {"items": [...], **params} JSON이 들어간다.
+#   서버 스크립트가 배치보다 적은 결과를 반환하면(한도 도달, 등록 실패 등)
+#   그 지점에서 멈춘다.
+# - Args (매개변수) :
+#       driver : Appium webDriver
+#       script : WebdriverIO 스크립트 (결과 배열을 return)
+#       items : 회차별 입력값 목록
+#       params : 스크립트에 함께 넘길 값 (locator, 한도 등)
+# - 플러그인이 없으면 WebDriverException이 그대로 올라간다.
+#   호출하는 쪽에서 잡아 일반 모드로 이어서 진행한다.
+# =============================================================
+def run_batches(driver, script, items, batch_size=DEFAULT_BATCH_SIZE, timeout_ms=BATCH_TIMEOUT_MS, **params):
+    items = list(items)
+    for start in range(0, len(items), batch_size):
+        batch = items[start:start + batch_size]
+        source = script.replace('__ARGS__', json.dumps({'items': batch, **params}, ensure_ascii=False))
+        response = driver.execute_driver(script=source, timeout_ms=timeout_ms)
+        results = response.result or []
+        if not isinstance(results, list):
+            raise WebDriverException(f"서버 측 루프 결과 형식 오류: {results!r}")
+        yield from results
+        if len(results) < len(batch):
+            return
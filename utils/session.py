@@ -0,0 +1,316 @@
+import json
+import os
+import sys
+import time
+
+# =============================================================
+# ✨ Appium 세션 생성에 필요한 공통 함수
+# - GUI(서버 풀)가 넘겨준 환경변수를 읽어 서버 URL / 디바이스 포트를 반영한다.
+# =============================================================
+
+DEFAULT_SERVER_URL = "http://localhost:4723"
+
+# 'fast' 세션 프로필 (GUI 실행 옵션 → SESSION_PROFILE=fast)
+# - 창 애니메이션 끄기, 소프트 키보드 숨김(Appium IME) → 매 회차 키보드 닫기 생략
+# - 서버 설치/디바이스 초기화 생략은 이 디바이스에서 한 번 정상 세션이
+#   만들어진 뒤(검증 완료)부터 적용한다.
+# - 세션 생성 후 UI idle 대기를 0으로, 중요하지 않은 뷰는 계층에서 제외
+FAST_CAPS = {
+    'android': {"disableWindowAnimation": True, "hideKeyboard": True},
+    'ios': {"reduceMotion": True},
+}
+FAST_SKIP_CAPS = {
+    'android': {"skipDeviceInitialization": True, "skipServerInstallation": True},
+    'ios': {},
+}
+FAST_SETTINGS = {
+    'android': {"waitForIdleTimeout": 0, "ignoreUnimportantViews": True},
+    'ios': {"waitForIdleTimeout": 0, "animationCoolOffTimeout": 0},
+}
+
+
+# =============================================================
+# - 스크립트가 접속할 Appium 서버 URL 반환
+#   (GUI 밖에서 단독 실행하면 기본 localhost:4723)
+# =============================================================
+def get_server_url():
+    return os.environ.get('APPIUM_SERVER_URL', DEFAULT_SERVER_URL)
+
+
+# =============================================================
+# - 서버 풀이 할당한 포트를 capability dict에 반영
+#   여러 디바이스를 동시에 돌릴 때 systemPort / wdaLocalPort가
+#   겹치지 않게 하기 위함
+# - Args (매개변수) :
+#       caps : capability dict
+#       is_ios : iOS(XCUITest) 여부
+# =============================================================
+def apply_port_caps(caps, is_ios=False):
+    mjpeg_port = os.environ.get('APPIUM_MJPEG_SERVER_PORT')
+    if is_ios:
+        wda_port = os.environ.get('APPIUM_WDA_LOCAL_PORT')
+        if wda_port:
+            caps["wdaLocalPort"] = int(wda_port)
+    else:
+        system_port = os.environ.get('APPIUM_SYSTEM_PORT')
+        if system_port:
+            caps["systemPort"] = int(system_port)
+    if mjpeg_port:
+        caps["mjpegServerPort"] = int(mjpeg_port)
+    return caps
+
+
+# =============================================================
+# - 세션 프로필 ('standard' / 'fast')
+# =============================================================
+def session_profile():
+    return os.environ.get('SESSION_PROFILE', 'standard')
+
+def is_fast_profile():
+    return session_profile() == 'fast'
+
+
+# =============================================================
+# - 이 드라이버의 세션에서 소프트 키보드가 뜨지 않는지 여부
+#   True면 스크립트가 매 회차 키보드 닫기(뒤로가기 등)를 생략한다.
+#   fast 프로필이어도 hideKeyboard capability로 직접 만든 세션만 해당한다.
+#   (세션 유지로 빌린 세션은 capability 없이 만들어져 키보드가 뜬다)
+# =============================================================
+def keyboard_suppressed(driver, is_ios=False):
+    return getattr(driver, 'keyboard_hidden', False) and not is_ios
+
+
+def _script_name():
+    return os.environ.get('RUNNER_SCRIPT') or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+
+def _stats_path():
+    from utils.paths import get_data_dir
+    return get_data_dir() / 'session_stats.json'
+
+def _load_stats():
+    try:
+        with open(_stats_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_stats(stats):
+    try:
+        with open(_stats_path(), 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+
+def _average(values):
+    return sum(values) / len(values) if values else None
+
+
+# =============================================================
+# - 프로필별 세션 시작 / 회차 소요 시간 기록
+#   같은 스크립트의 다른 프로필 평균과 비교해 절약 시간을 로그로 남긴다.
+# =============================================================
+class _ProfileTimer:
+    HISTORY = 20
+
+    def __init__(self):
+        self.session_start = None
+        self.iterations = []
+        self._last_mark = None
+
+    def mark_iteration(self):
+        now = time.monotonic()
+        if self._last_mark is not None:
+            self.iterations.append(now - self._last_mark)
+        self._last_mark = now
+
+    def _entry(self, stats, profile):
+        return stats.setdefault(_script_name(), {}).setdefault(profile, {'session_start': [], 'iteration': []})
+
+    def _compare(self, label, value, others):
+        baseline = _average(others)
+        if baseline is None:
+            print(f"⚡ {label}: {value:.2f}초 ({session_profile()})")
+        else:
+            print(f"⚡ {label}: {value:.2f}초 ({session_profile()}) — 다른 프로필 평균 {baseline:.2f}초 대비 "
+                  f"{baseline - value:+.2f}초 절약")
+
+    def report_session_start(self):
+        stats = _load_stats()
+        other = 'standard' if is_fast_profile() else 'fast'
+        self._compare("세션 시작", self.session_start, self._entry(stats, other)['session_start'])
+
+    def finish(self):
+        if self.session_start is None:
+            return
+        stats = _load_stats()
+        entry = self._entry(stats, session_profile())
+        other = self._entry(stats, 'standard' if is_fast_profile() else 'fast')
+        entry['session_start'] = (entry['session_start'] + [self.session_start])[-self.HISTORY:]
+        average = _average(self.iterations)
+        if average is not None:
+            self._compare("회차 평균", average, other['iteration'])
+            entry['iteration'] = (entry['iteration'] + [average])[-self.HISTORY:]
+        _save_stats(stats)
+
+
+profile_timer = _ProfileTimer()
+
+
+# =============================================================
+# - 루프 회차 시작 시 호출 (회차 소요 시간 / 단계 시간 기록용)
+# =============================================================
+def mark_iteration():
+    from utils.timing import journal
+    profile_timer.mark_iteration()
+    journal.next_iteration()
+
+
+def _verified_path():
+    from utils.paths import get_data_dir
+    return get_data_dir() / 'fast_profile_verified.json'
+
+def _verified_key(options):
+    return f"{options.get_capability('udid') or options.get_capability('deviceName')}|" \
+           f"{options.get_capability('platformVersion')}"
+
+def _load_verified():
+    try:
+        with open(_verified_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _set_verified(options, verified):
+    data = _load_verified()
+    if verified:
+        data[_verified_key(options)] = True
+    else:
+        data.pop(_verified_key(options), None)
+    try:
+        with open(_verified_path(), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    except OSError:
+        pass
+
+
+def _platform_key(options):
+    return 'ios' if (options.get_capability('platformName') or '').lower() == 'ios' else 'android'
+
+
+# =============================================================
+# - fast 프로필 capability 적용. 검증된 디바이스면 서버 설치/초기화 생략까지
+#   적용하고, 적용 여부(skip 사용)를 반환한다.
+# =============================================================
+def _apply_fast_caps(options):
+    platform = _platform_key(options)
+    options.load_capabilities(FAST_CAPS[platform])
+    if FAST_SKIP_CAPS[platform] and _load_verified().get(_verified_key(options)):
+        options.load_capabilities(FAST_SKIP_CAPS[platform])
+        return True
+    return False
+
+
+def _apply_fast_settings(driver, options):
+    try:
+        driver.update_settings(FAST_SETTINGS[_platform_key(options)])
+    except Exception as e:
+        print(f"⚠️ fast 프로필 설정 적용 실패: {e}")
+
+
+def _new_session(options):
+    from appium import webdriver
+    from selenium.common.exceptions import WebDriverException
+
+    if not is_fast_profile():
+        return webdriver.Remote(get_server_url(), options=options)
+
+    skipped = _apply_fast_caps(options)
+    try:
+        driver = webdriver.Remote(get_server_url(), options=options)
+    except WebDriverException:
+        if not skipped:
+            raise
+        # 서버 설치를 생략했는데 디바이스의 서버가 지워졌거나 버전이 다른 경우 —
+        # 검증 표시를 지우고 정상 초기화로 다시 시도한다.
+        print("⚠️ 초기화 생략 세션 생성 실패 — 전체 초기화로 다시 시도합니다.")
+        _set_verified(options, False)
+        for name in FAST_SKIP_CAPS[_platform_key(options)]:
+            options.set_capability(name, None)
+        driver = webdriver.Remote(get_server_url(), options=options)
+    if FAST_SKIP_CAPS[_platform_key(options)]:
+        _set_verified(options, True)
+    driver.keyboard_hidden = bool(options.get_capability('hideKeyboard'))
+    return driver
+
+
+# =============================================================
+# - Appium 드라이버 생성
+#   GUI의 세션 유지 기능이 APPIUM_SESSION_ID를 넘겨주면 새 세션을
+#   만들지 않고 이미 살아 있는 세션에 붙는다. (세션 부트스트랩 생략)
+# - Args (매개변수) :
+#       options : UiAutomator2Options / XCUITestOptions
+# =============================================================
+def create_driver(options):
+    from appium import webdriver
+    from utils import recorder, tracer
+    from utils.paths import begin_run
+
+    begin_run()
+    tracer.install()
+    recorder.install()
+    session_id = os.environ.get('APPIUM_SESSION_ID')
+    if not session_id:
+        started = time.time()
+        driver = _new_session(options)
+        profile_timer.session_start = time.time() - started
+        profile_timer.report_session_start()
+        if is_fast_profile():
+            _apply_fast_settings(driver, options)
+        return driver
+
+    class _AttachedRemote(webdriver.Remote):
+        # Remote.__init__이 start_session()으로 새 세션을 만드는 대신
+        # 넘겨받은 세션 ID와 capability를 그대로 쓰도록 바꾼다.
+        def start_session(self, capabilities, browser_profile=None):
+            self.session_id = session_id
+            self.caps = json.loads(os.environ.get('APPIUM_SESSION_CAPS') or '{}')
+
+    started = time.time()
+    driver = _AttachedRemote(get_server_url(), options=options)
+    driver.is_attached_session = True
+    print(f"♻️ 유지 중인 세션 재사용 ({time.time() - started:.1f}초)")
+    if is_fast_profile():
+        # 미리 만든 세션은 capability를 바꿀 수 없어 런타임 설정만 적용한다.
+        _apply_fast_settings(driver, options)
+    return driver
+
+
+# =============================================================
+# - 드라이버 종료
+#   빌려 쓴 세션은 다음 실행을 위해 종료하지 않고 연결만 정리한다.
+#   입력 방식 때문에 바꿔 둔 IME도 여기서 원래대로 돌린다. (스크립트의 finally)
+# =============================================================
+def quit_driver(driver):
+    from utils import recorder, timing, tracer
+    from utils.util import restore_ime
+    from utils.watchdog import is_transient
+
+    restore_ime()
+    profile_timer.finish()
+    timing.end_iterations()
+    tracer.finish()
+    if getattr(driver, 'is_attached_session', False):
+        try:
+            driver.command_executor.close()
+        except Exception:
+            pass
+    else:
+        try:
+            driver.quit()
+        except Exception as e:
+            # 디바이스 서버가 이미 죽어 세션이 없으면 종료할 것도 없다.
+            if not is_transient(e):
+                raise
+            print(f"⚠️ 세션이 이미 끊겨 있어 종료를 생략합니다: {type(e).__name__}")
+    # 세션 종료 요청까지 기록에 남긴 뒤 닫는다.
+    recorder.finish()
@@ -0,0 +1,87 @@
+import re
+
+try:
+    from lxml import etree as _etree
+    _HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as _etree
+    _HAS_LXML = False
+
+# =============================================================
+# ✨ page_source 스냅샷 조회
+# - 화면 전체 XML을 한 번만 받아 로컬에서 파싱한 뒤, 카운터 / 팝업 /
+#   목록 내용 등 여러 조회를 디바이스 왕복 없이 처리한다.
+#   (find_elements + 요소마다 get_attribute 호출은 요소 수만큼 HTTP 왕복)
+# - lxml이 설치되어 있으면 사용하고, 없으면 표준 ElementTree로 파싱한다.
+# =============================================================
+
+# 화면에 보이는 문자열이 들어 있는 속성 (Android: text/content-desc, iOS: label/name/value)
+TEXT_ATTRS = ('text', 'label', 'content-desc', 'name', 'value')
+
+
+def node_text(node):
+    for attr in TEXT_ATTRS:
+        value = node.get(attr)
+        if value:
+            return value
+    return ''
+
+
+class PageSnapshot:
+    """page_source 한 번으로 만든 화면 스냅샷"""
+
+    def __init__(self, source):
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        if _HAS_LXML:
+            parser = _etree.XMLParser(huge_tree=True, recover=True)
+            self.root = _etree.fromstring(source, parser)
+        else:
+            self.root = _etree.fromstring(source)
+
+    @classmethod
+    def capture(cls, driver):
+        return cls(driver.page_source)
+
+    def nodes(self, tag=None, **attrs):
+        """태그/속성 값이 일치하는 노드를 문서 순서로 반환 (속성명의 '-'는 '_'로 적는다)"""
+        result = []
+        for node in self.root.iter(tag) if tag else self.root.iter():
+            if all(node.get(key.replace('_', '-')) == value for key, value in attrs.items()):
+                result.append(node)
+        return result
+
+    def find(self, tag=None, **attrs):
+        nodes = self.nodes(tag, **attrs)
+        return nodes[0] if nodes else None
+
+    def texts(self, tag=None):
+        """노드들의 표시 문자열 목록 (빈 문자열 제외)"""
+        return [text for text in (node_text(node) for node in self.nodes(tag)) if text]
+
+    def has_text(self, text):
+        return any(text in (node.get(attr) for attr in TEXT_ATTRS) for node in self.root.iter())
+
+    def find_text(self, pattern, tag=None):
+        """표시 문자열이 정규식과 일치하는 첫 노드의 match 객체 반환 (없으면 None)"""
+        regex = re.compile(pattern)
+        for text in self.texts(tag):
+            match = regex.search(text)
+            if match:
+                return match
+        return None
+
+    def xpath(self, expression):
+        """lxml이 있으면 XPath 1.0 전체, 없으면 ElementTree가 지원하는 부분 문법만 사용 가능"""
+        if _HAS_LXML:
+            return self.root.xpath(expression)
+        return self.root.findall(expression if expression.startswith('.') else f".{expression}")
+
+
+# =============================================================
+# - 현재 화면 스냅샷 생성 (page_source 1회 호출)
+# - Args (매개변수) :
+#       driver : Appium webDriver
+# =============================================================
+def snapshot(driver):
+    return PageSnapshot.capture(driver)
@@ -0,0 +1,167 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# =============================================================
+# ✨ 회차별 단계 시간 기록
+# - 루프 한 회차를 단계(입력창 찾기 / 입력 / 키보드 닫기 / 등록 탭 /
+#   카운터 확인 / 대기)로 나눠 단계별 소요 시간을 기록한다.
+# - utils.util의 find / click / tap / type_text / wait_* 가 스스로 단계를
+#   기록하므로 스크립트는 mark_iteration()만 호출하면 되고, 키보드 닫기나
+#   sleep처럼 헬퍼를 거치지 않는 부분만 span()으로 감싼다.
+# - 단계가 겹치면(type 안의 locate 등) 안쪽 단계 시간은 바깥 단계에서
+#   빼고 기록하고, 어느 단계에도 속하지 않은 시간은 'other'로 남는다.
+#   opaque 단계(verify) 안의 호출은 따로 나누지 않는다.
+# - 회차마다 등록 탭 완료부터 화면 반영(카운터 변경 / 다이얼로그 닫힘)
+#   확인까지의 지연(lat)과 그 시점의 목록 크기(n)도 남긴다. 목록이 찰수록
+#   앱이 느려지는지 보고서가 이 값으로 곡선을 맞춘다.
+# - 스크립트는 반영을 확인한 건수를 add_entries()로 남긴다(e). 빠른 채우기처럼
+#   한 회차에 여러 건을 넣는 경우가 있어 보고서의 처리량은 회차 수가 아닌
+#   이 건수로 계산한다.
+# - data/timings/<스크립트>_<디바이스>_<시각>.jsonl 에 회차마다 한 줄씩
+#   쓴다. 보고서: python -m src.runner.report
+# =============================================================
+
+PHASES = ('locate', 'type', 'keyboard', 'tap', 'verify', 'sleep', 'other')
+
+# 실행 조건 비교용으로 헤더에 남길 실행 옵션 환경변수
+_OPTION_ENV = ('SESSION_PROFILE', 'SERVER_LOOP', 'DIRECT_CLIENT', 'FAST_FILL', 'APPIUM_SESSION_ID',
+               'APPIUM_TRACE', 'VERIFY_EVERY')
+
+
+def timing_enabled():
+    return os.environ.get('STEP_TIMING', '1') != '0'
+
+
+class StepJournal:
+    def __init__(self):
+        self._file = None
+        self.path = None
+        self._started = None
+        self._iteration = None
+        self._index = 0
+        self._phases = {}
+        self._stack = []
+        self._opaque = 0
+        self._tapped_at = None
+        self._extra = {}
+
+    def _open(self):
+        from utils.paths import get_run_file
+        self.path = get_run_file('timings')
+        self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+        self._started = time.monotonic()
+        self._index = 0
+        header = {
+            'type': 'run',
+            'script': os.environ.get('RUNNER_SCRIPT') or 'script',
+            'device': os.environ.get('APPIUM_DEVICE_NAME'),
+            'platform': os.environ.get('APPIUM_PLATFORM_NAME'),
+            'started': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'options': {name: os.environ[name] for name in _OPTION_ENV if os.environ.get(name)},
+        }
+        self._file.write(json.dumps(header, ensure_ascii=False) + '\n')
+
+    def _flush_iteration(self, now):
+        if self._iteration is None:
+            return
+        total = now - self._iteration
+        phases = dict(self._phases)
+        other = total - sum(phases.values())
+        if other > 0.0005:
+            phases['other'] = phases.get('other', 0.0) + other
+        entry = {
+            'i': self._index,
+            't': round(self._iteration - self._started, 3),
+            'ms': round(total * 1000, 1),
+            'p': {name: round(value * 1000, 1) for name, value in phases.items()},
+        }
+        entry.update(self._extra)
+        self._file.write(json.dumps(entry) + '\n')
+
+    def next_iteration(self):
+        if not timing_enabled():
+            return
+        now = time.monotonic()
+        if self._file is None:
+            self._open()
+        self._flush_iteration(now)
+        self._index += 1
+        self._iteration = now
+        self._phases = {}
+        self._tapped_at = None
+        self._extra = {}
+
+    def add(self, phase, seconds):
+        if self._iteration is not None:
+            self._phases[phase] = self._phases.get(phase, 0.0) + seconds
+
+    def add_entries(self, count=1):
+        """현재 회차에서 반영을 확인한 등록 건수 추가"""
+        if self._iteration is None or not count or count < 0:
+            return
+        self._extra['e'] = self._extra.get('e', 0) + count
+
+    def inserted(self, count=None):
+        """등록 반영 확인 시점에 호출. 회차의 첫 반영만 기록한다."""
+        if self._iteration is None or self._tapped_at is None or 'lat' in self._extra:
+            return
+        self._extra['lat'] = round((time.monotonic() - self._tapped_at) * 1000, 1)
+        if count is not None:
+            self._extra['n'] = count
+
+    @contextmanager
+    def span(self, phase, opaque=False):
+        if self._iteration is None or self._opaque:
+            yield
+            return
+        frame = [phase, 0.0]  # [단계, 안쪽 단계에 쓴 시간]
+        self._stack.append(frame)
+        if opaque:
+            self._opaque += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            if phase == 'tap':
+                # 요소 조회 시간이 섞이지 않도록 탭 명령이 끝난 시점부터 잰다.
+                self._tapped_at = started + elapsed
+            if opaque:
+                self._opaque -= 1
+            self._stack.pop()
+            self.add(phase, elapsed - frame[1])
+            if self._stack:
+                self._stack[-1][1] += elapsed
+
+    def finish(self):
+        """마지막 회차까지 기록하고 파일을 닫는다. (루프 종료 후 호출)"""
+        if self._file is None:
+            return
+        self._flush_iteration(time.monotonic())
+        self._iteration = None
+        self._file.close()
+        self._file = None
+        print(f"⏱️ 단계 시간 기록: {self.path} ({self._index}회차)")
+
+
+journal = StepJournal()
+
+
+def span(phase, opaque=False):
+    """with span('keyboard'): ... — 현재 회차의 단계 시간으로 기록 (회차 밖에서는 무시)"""
+    return journal.span(phase, opaque=opaque)
+
+
+def sleep(seconds):
+    with journal.span('sleep'):
+        time.sleep(seconds)
+
+
+# =============================================================
+# - 루프가 끝났을 때 호출. 마지막 회차를 닫아 이후의 팝업 확인 등이
+#   마지막 회차 시간에 섞이지 않게 한다. (quit_driver도 호출한다)
+# =============================================================
+def end_iterations():
+    journal.finish()
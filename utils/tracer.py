@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+
+# =============================================================
+# ✨ Appium 명령 왕복 지연 추적
+# - APPIUM_TRACE=1 이면 selenium RemoteConnection.execute를 감싸
+#   명령마다 이름 / locator 전략 / 소요 시간 / 응답 크기를 기록한다.
+#   (직접 클라이언트 utils.direct_client의 명령도 같은 기록에 들어간다)
+# - 실행 중에는 data/traces/<스크립트>_<디바이스>_<시각>.jsonl에 한 줄씩
+#   쓰고, 종료 시 명령별 p50/p95/p99와 구간별 히스토그램을 같은 파일
+#   끝에 summary 줄로 덧붙인 뒤 로그에 표로 출력한다.
+# - GUI 실행 옵션 또는 execute_script(extra_env={'APPIUM_TRACE': '1'})로 켠다.
+# =============================================================
+
+# 히스토그램 구간 상한(ms). 마지막 구간은 그 이상 전부.
+BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def trace_enabled():
+    return os.environ.get('APPIUM_TRACE') == '1'
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def histogram(values_ms):
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for value in values_ms:
+        for index, limit in enumerate(BUCKETS_MS):
+            if value <= limit:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={limit}ms" for limit in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+class CommandTracer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._file = None
+        self.path = None
+
+    def _open(self):
+        from utils.paths import get_run_file
+        self.path = get_run_file('traces')
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._samples = {}
+
+    def record(self, command, strategy, elapsed, size, ok=True):
+        entry = {
+            'ts': round(time.time(), 3),
+            'command': command,
+            'strategy': strategy,
+            'ms': round(elapsed * 1000, 2),
+            'bytes': size,
+            'ok': ok,
+        }
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            key = f"{command} [{strategy}]" if strategy else command
+            self._samples.setdefault(key, []).append(entry['ms'])
+
+    def summary(self):
+        rows = []
+        for key, values in self._samples.items():
+            ordered = sorted(values)
+            rows.append({
+                'type': 'summary',
+                'command': key,
+                'count': len(ordered),
+                'total_ms': round(sum(ordered), 1),
+                'p50': percentile(ordered, 0.50),
+                'p95': percentile(ordered, 0.95),
+                'p99': percentile(ordered, 0.99),
+                'histogram': histogram(ordered),
+            })
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows
+
+    def finish(self):
+        """summary 줄을 파일 끝에 쓰고 로그에 명령별 지연 표 출력"""
+        with self._lock:
+            if self._file is None:
+                return
+            rows = self.summary()
+            for row in rows:
+                self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+            self._file.close()
+            self._file = None
+
+        total = sum(row['total_ms'] for row in rows) or 1
+        print(f"📊 Appium 명령 지연 (총 {sum(row['count'] for row in rows)}회, {total / 1000:.1f}초)")
+        for row in rows:
+            print(f"   {row['command']:<45} {row['count']:>5}회  p50 {row['p50']:>7.1f}  p95 {row['p95']:>7.1f}"
+                  f"  p99 {row['p99']:>7.1f}ms  ({row['total_ms'] / total * 100:.0f}%)")
+        print(f"📊 추적 파일: {self.path}")
+
+
+tracer = CommandTracer()
+_installed = False
+
+
+def _command_name(command, params):
+    # selenium 4는 execute_script를 w3cExecuteScript(Async)로 보낸다. mobile: 확장별로 나눠 센다.
+    from selenium.webdriver.remote.command import Command
+
+    if command in (Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC) and isinstance(params, dict):
+        return f"{command}:{params.get('script', '')}"
+    return command
+
+
+# =============================================================
+# - RemoteConnection.execute에 추적 훅 설치 (APPIUM_TRACE=1일 때만, 1회)
+#   utils.session.create_driver가 세션 생성 전에 호출한다.
+# =============================================================
+def install():
+    global _installed
+    if _installed or not trace_enabled():
+        return
+    from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+    original = RemoteConnection.execute
+
+    def traced_execute(self, command, params):
+        # execute가 경로 인자를 params에서 지우므로 호출 전에 읽어 둔다.
+        name = _command_name(command, params)
+        strategy = params.get('using') if isinstance(params, dict) else None
+        started = time.perf_counter()
+        ok = False
+        response = None
+        try:
+            response = original(self, command, params)
+            ok = True
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            size = len(json.dumps((response or {}).get('value'), default=str)) if ok else 0
+            tracer.record(name, strategy, elapsed, size, ok=ok)
+
+    RemoteConnection.execute = traced_execute
+    _installed = True
+
+
+def finish():
+    if trace_enabled():
+        tracer.finish()
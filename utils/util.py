@@ -1,14 +1,29 @@
+import json
+import os
 import time
+from collections import deque
 
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from utils.timing import journal, span
+
 # =============================================================
 # ✨ 스크립트 진행에 필요한 유틸 함수
-# - 최종 수정일: 2025-06-24
+# - 최종 수정일: 2026-10-18
 # =============================================================
 
+# 조건 대기 시 폴링 주기(초). WebDriverWait 기본값(0.5초)은 루프 한 번에
+# 수백 ms씩 놀게 만들어 짧게 잡는다. 환경변수로 조정 가능.
+POLL_INTERVAL = float(os.environ.get('WAIT_POLL_INTERVAL', '0.05'))
+
 
 # =============================================================
 # - UI 단일 요소 찾는 함수
@@ -18,7 +33,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 #       value : ID, Xpath, UIAUTOMATOR 등 Element 지정 값
 # =============================================================
 def find(driver, by, value, timeout=10):
-    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((by, value)))
+    with span('locate'):
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            EC.presence_of_element_located((by, value)))
 
 # =============================================================
 # - UI 모든 요소 찾는 함수
@@ -28,24 +45,686 @@ def find(driver, by, value, timeout=10):
 #       value : ID, Xpath, UIAUTOMATOR 등 Element 지정 값
 # =============================================================
 def find_all(driver, by, value, timeout=10):
-    return WebDriverWait(driver, timeout).until(EC.presence_of_all_elements_located((by, value)))
+    with span('locate'):
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            EC.presence_of_all_elements_located((by, value)))
 
 # =============================================================
-# - 요소를 찾아 클릭. 키보드 닫힘 등 직후의 레이아웃 변경으로
-#   클릭 시점에 StaleElementReferenceException이 발생하면
-#   요소를 다시 찾아 재시도한다.
+# - 요소 존재 여부를 기다리지 않고 즉시 확인 (분기 판단용)
+#   find()는 요소가 없으면 timeout(기본 10초)을 다 채우고 예외가 나므로
+#   "있으면 A, 없으면 B" 분기에는 이 함수를 쓴다.
+# =============================================================
+def exists(driver, by, value):
+    with span('locate'):
+        return bool(driver.find_elements(by, value))
+
+def _first_present(driver, locators):
+    # 후보가 모두 XPath면 합집합(|) 한 번의 왕복으로 있는지만 먼저 확인한다.
+    # 합집합은 후보 순서가 아니라 화면(문서) 순서로 반환하므로, 하나만 걸렸으면 그대로 쓰고
+    # 여럿이 걸렸으면 which_of처럼 후보 순서대로 다시 확인해 우선순위가 높은 요소를 고른다.
+    if len(locators) > 1 and all(by == By.XPATH for by, _ in locators):
+        elements = driver.find_elements(By.XPATH, ' | '.join(value for _, value in locators))
+        if len(elements) <= 1:
+            return elements[0] if elements else None
+    for by, value in locators:
+        elements = driver.find_elements(by, value)
+        if elements:
+            return elements[0]
+    return None
+
+# =============================================================
+# - 여러 후보 locator 중 먼저 발견되는 요소 반환 (없으면 None)
+#   후보마다 timeout을 따로 기다리지 않고, 매 폴링마다 모든 후보를
+#   한 번씩 확인한다.
+# - Args (매개변수) :
+#       locators : [(by, value), ...] 우선순위 순
+#       timeout : 0이면 한 번만 확인하고 바로 반환
+# =============================================================
+def first_of(driver, locators, timeout=0):
+    locators = list(locators)
+    with span('locate', opaque=True):
+        element = _first_present(driver, locators)
+        if element is not None or timeout <= 0:
+            return element
+        return wait_until(lambda: _first_present(driver, locators), timeout=timeout, required=False)
+
+# =============================================================
+# - first_of와 같지만 어느 후보가 발견됐는지도 함께 반환
+#   → (후보 순번, 요소), 없으면 (None, None)
+#   화면 분기(입력 다이얼로그 / 한도 팝업 등)에 쓰며, 후보를 순서대로 확인하므로
+#   첫 후보가 있으면 왕복 한 번으로 끝난다. (XPath 합집합 조회는 하지 않는다)
+# =============================================================
+def which_of(driver, locators, timeout=0):
+    locators = list(locators)
+
+    def _probe():
+        for position, (by, value) in enumerate(locators):
+            elements = driver.find_elements(by, value)
+            if elements:
+                return position, elements[0]
+        return None
+
+    with span('locate', opaque=True):
+        found = _probe()
+        if found is None and timeout > 0:
+            found = wait_until(_probe, timeout=timeout, required=False)
+        return found or (None, None)
+
+# =============================================================
+# - 요소 핸들 캐시
+#   루프마다 같은 입력창/등록 버튼을 다시 찾는 비용(WebDriverWait +
+#   findElement 왕복)을 줄이기 위해 locator 기준으로 요소를 캐시한다.
+#   캐시된 요소가 stale해지거나 화면이 바뀌면(invalidate_cache) 다시 찾는다.
+# =============================================================
+_element_cache = {}
+_cache_stats = {'hits': 0, 'misses': 0, 'stale': 0}
+
+
+def _cache_key(driver, by, value):
+    return (getattr(driver, 'session_id', None) or id(driver), by, value)
+
+
+# =============================================================
+# - 캐시된 요소 반환. 캐시에 없으면 찾아서 캐시한다.
 # - Args (매개변수) :
 #       driver : Appium webDriver
 #       by : AppiumBy
 #       value : ID, Xpath, UIAUTOMATOR 등 Element 지정 값
 # =============================================================
-def click(driver, by, value, timeout=10, retries=3, retry_delay=0.3):
+def find_cached(driver, by, value, timeout=10):
+    key = _cache_key(driver, by, value)
+    element = _element_cache.get(key)
+    if element is not None:
+        _cache_stats['hits'] += 1
+        return element
+    _cache_stats['misses'] += 1
+    element = find(driver, by, value, timeout=timeout)
+    _element_cache[key] = element
+    return element
+
+# =============================================================
+# - 캐시 무효화 (요소 캐시 + 좌표 캐시). 화면 전환(팝업, 바텀시트 등) 직후 호출한다.
+#   by/value를 생략하면 해당 드라이버의 캐시 전체를 비운다.
+# =============================================================
+def invalidate_cache(driver=None, by=None, value=None):
+    if driver is None:
+        _element_cache.clear()
+        _tap_points.clear()
+        return
+    if by is not None:
+        _element_cache.pop(_cache_key(driver, by, value), None)
+        _tap_points.pop(_cache_key(driver, by, value), None)
+        return
+    session = _cache_key(driver, None, None)[0]
+    for cache in (_element_cache, _tap_points):
+        for key in [k for k in cache if k[0] == session]:
+            del cache[key]
+
+# =============================================================
+# - 캐시 적중/미스/stale 횟수 반환 (적중 횟수 = 절약한 조회 왕복 수)
+# =============================================================
+def cache_stats():
+    return dict(_cache_stats)
+
+def print_cache_stats():
+    stats = cache_stats()
+    if stats['hits'] or stats['misses']:
+        print(f"🧮 요소 캐시: 적중 {stats['hits']} / 미스 {stats['misses']} / stale {stats['stale']}"
+              f" (절약한 조회 {stats['hits']}회)")
+    if _tap_stats['taps']:
+        print(f"📐 좌표 탭: {_tap_stats['taps']}회 / 요소 조회 {_tap_stats['resolves']}회"
+              f" / 화면 변경 감지 {_tap_stats['invalidated']}회")
+
+# =============================================================
+# - 요소를 찾아 action 실행. StaleElementReferenceException이 나면
+#   (캐시 사용 시 캐시를 비우고) 요소를 다시 찾아 재시도한다.
+# =============================================================
+def _with_element(driver, by, value, action, timeout, retries, retry_delay, cache):
     last_exc = None
     for _ in range(retries):
         try:
-            find(driver, by, value, timeout=timeout).click()
-            return
+            if cache:
+                element = find_cached(driver, by, value, timeout=timeout)
+            else:
+                element = find(driver, by, value, timeout=timeout)
+            return action(element)
         except StaleElementReferenceException as e:
             last_exc = e
-            time.sleep(retry_delay)
-    raise last_exc
\ No newline at end of file
+            if cache:
+                _cache_stats['stale'] += 1
+                invalidate_cache(driver, by, value)
+            else:
+                time.sleep(retry_delay)
+    raise last_exc
+
+# =============================================================
+# - 요소를 찾아 클릭. 키보드 닫힘 등 직후의 레이아웃 변경으로
+#   클릭 시점에 StaleElementReferenceException이 발생하면
+#   요소를 다시 찾아 재시도한다.
+# - Args (매개변수) :
+#       driver : Appium webDriver
+#       by : AppiumBy
+#       value : ID, Xpath, UIAUTOMATOR 등 Element 지정 값
+#       cache : True면 캐시된 요소 핸들을 재사용
+# =============================================================
+def click(driver, by, value, timeout=10, retries=3, retry_delay=0.3, cache=False):
+    with span('tap'):
+        _with_element(driver, by, value, lambda el: el.click(), timeout, retries, retry_delay, cache)
+
+# =============================================================
+# - 입력창을 찾아 클릭 후 텍스트 입력 (stale 재시도는 click과 동일)
+# - Args (매개변수) :
+#       text : 입력할 문자열
+# =============================================================
+def send_keys(driver, by, value, text, timeout=10, retries=3, retry_delay=0.3, cache=False):
+    def _type(element):
+        element.click()
+        element.send_keys(text)
+        return element
+    with span('type'):
+        return _with_element(driver, by, value, _type, timeout, retries, retry_delay, cache)
+
+# =============================================================
+# - 요소 텍스트 읽기 (stale 재시도는 click과 동일)
+# =============================================================
+def get_text(driver, by, value, timeout=10, retries=3, retry_delay=0.3, cache=False):
+    return _with_element(driver, by, value, lambda el: el.text, timeout, retries, retry_delay, cache)
+
+# =============================================================
+# - 좌표 캐시 탭
+#   위치가 고정된 버튼('등록', '등록하기', '시작번호 추가 버튼' 등)은
+#   처음 찾을 때 요소 영역(bounds)을 기록해 두고, 이후에는 요소 조회 없이
+#   중앙 좌표로 바로 탭한다 (Android: mobile: clickGesture, iOS: mobile: tap).
+#   TAP_CHECK_EVERY회마다, 그리고 카운터 / 다이얼로그 확인이 실패한 직후에는
+#   요소를 다시 찾아 영역이 그대로인지 확인한다. 키보드·바텀시트·팝업이
+#   떠서 버튼이 밀리거나 가려지면(조회되지 않으면) 좌표 대신 요소를 클릭하고
+#   영역을 새로 기록한다.
+# =============================================================
+TAP_CHECK_EVERY = int(os.environ.get('TAP_CHECK_EVERY', '10'))
+
+_tap_points = {}
+_tap_stats = {'taps': 0, 'resolves': 0, 'invalidated': 0}
+
+
+def _is_ios(driver):
+    return ((getattr(driver, 'capabilities', None) or {}).get('platformName') or '').lower() == 'ios'
+
+def _tap_point(rect):
+    return {
+        'x': int(rect['x'] + rect['width'] / 2),
+        'y': int(rect['y'] + rect['height'] / 2),
+        'bounds': (rect['x'], rect['y'], rect['width'], rect['height']),
+        'uses': 0,
+        'check': False,
+    }
+
+def _current_target(driver, by, value):
+    # 대기 없이 한 번 조회 → (요소, 영역) / 화면에 없으면 (None, None)
+    try:
+        elements = driver.find_elements(by, value)
+        if not elements:
+            return None, None
+        rect = elements[0].rect
+    except (NoSuchElementException, StaleElementReferenceException):
+        return None, None
+    return elements[0], rect
+
+def _tap_at(driver, x, y):
+    if _is_ios(driver):
+        driver.execute_script('mobile: tap', {'x': x, 'y': y})
+    else:
+        driver.execute_script('mobile: clickGesture', {'x': x, 'y': y})
+
+# =============================================================
+# - 다음 좌표 탭에서 요소 영역을 다시 확인하도록 표시
+#   (카운터가 늘지 않음 / 다이얼로그가 안 닫힘 등 확인 실패 시)
+# =============================================================
+def recheck_taps():
+    for point in _tap_points.values():
+        point['check'] = True
+
+# =============================================================
+# - 좌표 캐시로 탭 (click(cache=True)와 같은 자리에 사용)
+# - Args (매개변수) :
+#       driver : Appium webDriver
+#       by : AppiumBy
+#       value : ID, Xpath, UIAUTOMATOR 등 Element 지정 값
+# =============================================================
+def tap(driver, by, value, timeout=10):
+    with span('tap'):
+        key = _cache_key(driver, by, value)
+        point = _tap_points.get(key)
+        if point is not None and (point['check'] or (point['uses'] and point['uses'] % TAP_CHECK_EVERY == 0)):
+            element, rect = _current_target(driver, by, value)
+            if rect is None or _tap_point(rect)['bounds'] != point['bounds']:
+                _tap_stats['invalidated'] += 1
+                print(f"📐 화면 변경 감지 — '{value}' 좌표 대신 요소를 찾아 클릭합니다.")
+                _tap_stats['resolves'] += 1
+                if element is None:
+                    element = find(driver, by, value, timeout=timeout)
+                    rect = element.rect
+                _tap_points[key] = _tap_point(rect)
+                _tap_points[key]['uses'] = 1
+                _tap_stats['taps'] += 1
+                element.click()
+                return
+            point['check'] = False
+        if point is None:
+            _tap_stats['resolves'] += 1
+            point = _tap_points[key] = _tap_point(find(driver, by, value, timeout=timeout).rect)
+        point['uses'] += 1
+        _tap_stats['taps'] += 1
+        _tap_at(driver, point['x'], point['y'])
+
+
+# =============================================================
+# - 적응형 대기 엔진
+#   고정 sleep 대신 실제 화면 상태(카운터 증가, 바텀시트 닫힘 등)를
+#   짧은 주기로 폴링한다. 단계(step)별로 실제 걸린 시간을 기록해
+#   타임아웃을 p99 × k 로 학습하므로, 정상 상황에서는 빨리 넘어가고
+#   실패 상황에서도 10초씩 기다리지 않는다.
+# =============================================================
+class AdaptiveTimeout:
+    def __init__(self, default=10.0, k=3.0, min_timeout=1.0, max_timeout=10.0,
+                 min_samples=20, window=200):
+        self.default = default
+        self.k = k
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.window = window
+        self.samples = {}
+
+    def record(self, step, elapsed):
+        self.samples.setdefault(step, deque(maxlen=self.window)).append(elapsed)
+
+    def percentile(self, step, q):
+        values = sorted(self.samples.get(step, ()))
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(len(values) * q))]
+
+    def timeout(self, step):
+        if len(self.samples.get(step, ())) < self.min_samples:
+            return self.default
+        learned = self.percentile(step, 0.99) * self.k
+        return max(self.min_timeout, min(self.max_timeout, learned))
+
+    def to_dict(self):
+        return {step: list(values) for step, values in self.samples.items()}
+
+    def load(self, data):
+        for step, values in data.items():
+            self.samples[step] = deque(values, maxlen=self.window)
+
+
+adaptive_timeout = AdaptiveTimeout()
+_wait_profile_path = None
+
+
+# =============================================================
+# - 이전 실행에서 학습한 단계별 지연 기록 불러오기/저장
+#   (스크립트 시작 시 load, 종료 시 save)
+# - Args (매개변수) :
+#       name : 프로필 이름 (보통 스크립트/앱 이름)
+# =============================================================
+def load_wait_profile(name):
+    global _wait_profile_path
+    from utils.paths import get_data_dir
+    _wait_profile_path = get_data_dir('wait_profiles') / f"{name}.json"
+    try:
+        with open(_wait_profile_path, encoding='utf-8') as f:
+            adaptive_timeout.load(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+def save_wait_profile():
+    if _wait_profile_path is None:
+        return
+    try:
+        with open(_wait_profile_path, 'w', encoding='utf-8') as f:
+            json.dump(adaptive_timeout.to_dict(), f)
+    except OSError:
+        pass
+
+# =============================================================
+# - condition()이 None/False가 아닌 값을 반환할 때까지 폴링 후 그 값을 반환
+#   요소 탐색 중 나는 NoSuchElement/Stale 예외는 "아직 아님"으로 본다.
+# - Args (매개변수) :
+#       condition : 인자 없는 함수
+#       step : 학습용 단계 이름 (timeout 미지정 시 학습된 타임아웃 사용)
+#       timeout : 최대 대기 시간(초)
+#       poll : 폴링 주기(초)
+#       required : False면 시간 초과 시 예외 대신 None 반환
+# =============================================================
+def wait_until(condition, step=None, timeout=None, poll=None, required=True):
+    if timeout is None:
+        timeout = adaptive_timeout.timeout(step) if step else adaptive_timeout.default
+    poll = POLL_INTERVAL if poll is None else poll
+    started = time.monotonic()
+    deadline = started + timeout
+    with span('verify', opaque=True):
+        while True:
+            try:
+                value = condition()
+            except (NoSuchElementException, StaleElementReferenceException):
+                value = None
+            if value is not None and value is not False:
+                if step:
+                    adaptive_timeout.record(step, time.monotonic() - started)
+                return value
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(poll)
+    if required:
+        raise TimeoutException(f"대기 시간 초과 ({step or 'condition'}, {timeout:.1f}초)")
+    return None
+
+# =============================================================
+# - 카운터 값이 previous와 달라질 때까지 대기 후 새 값 반환
+# - Args (매개변수) :
+#       read_counter : 현재 카운터 값을 int로 반환하는 함수
+#       previous : 직전 카운터 값
+# =============================================================
+def wait_counter_change(read_counter, previous, step='counter', timeout=None, required=True):
+    def _changed():
+        current = read_counter()
+        return current if current is not None and current != previous else None
+    try:
+        current = wait_until(_changed, step=step, timeout=timeout, required=required)
+    except TimeoutException:
+        recheck_taps()
+        raise
+    if current is not None:
+        journal.inserted(current)
+    else:
+        recheck_taps()
+    return current
+
+# =============================================================
+# - 요소가 화면에서 사라질 때까지 대기 (바텀시트/다이얼로그 닫힘 등)
+# =============================================================
+def wait_gone(driver, by, value, step=None, timeout=None, required=True):
+    try:
+        gone = wait_until(lambda: not driver.find_elements(by, value),
+                          step=step, timeout=timeout, required=required)
+    except TimeoutException:
+        recheck_taps()
+        raise
+    if gone:
+        journal.inserted()
+    else:
+        recheck_taps()
+    return gone
+
+# =============================================================
+# - 요소가 나타날 때까지 대기 (find와 같지만 학습된 타임아웃 사용)
+# =============================================================
+def wait_present(driver, by, value, step=None, timeout=None, required=True):
+    def _present():
+        elements = driver.find_elements(by, value)
+        return elements[0] if elements else None
+    return wait_until(_present, step=step, timeout=timeout, required=required)
+
+
+# =============================================================
+# - 텍스트 입력 전략
+#   send_keys(UiAutomator2 setText) / mobile: type(IME 입력 제스처) /
+#   클립보드 붙여넣기 / ADB IME 브로드캐스트(ADBKeyBoard) 중 하나로 입력한다.
+#   한글은 setText보다 붙여넣기·브로드캐스트가 훨씬 빠른 경우가 많고,
+#   반대로 setText에 반응하지 않는 입력창(인사말 바텀시트 등)도 있어
+#   처음 입력할 때 후보를 모두 시험해 보고(벤치마크) 실제로 입력된
+#   전략 중 가장 빠른 것을 앱+디바이스별로 기억한다.
+# =============================================================
+def _input_send_keys(driver, element, text):
+    element.click()
+    element.send_keys(text)
+
+def _input_mobile_type(driver, element, text):
+    element.click()
+    driver.execute_script('mobile: type', {'text': text})
+
+def _input_clipboard(driver, element, text):
+    driver.set_clipboard_text(text)
+    element.click()
+    driver.press_keycode(279)  # KEYCODE_PASTE
+
+_previous_ime = None
+
+# =============================================================
+# - ADBKeyBoard로 바꿔 둔 IME를 원래 키보드로 되돌림
+#   벤치마크가 adb_ime를 고르지 않았을 때 바로, 그리고 스크립트가 끝날 때
+#   (quit_driver의 finally / GUI 중지 시그널 / atexit) 호출한다. 여러 번 불러도 된다.
+# =============================================================
+def restore_ime():
+    global _previous_ime
+    previous, _previous_ime = _previous_ime, None
+    if previous is None:
+        return
+    from utils.adb import ADB_KEYBOARD_IME, set_ime
+    if previous == ADB_KEYBOARD_IME:
+        return
+    try:
+        set_ime(previous)
+    except Exception:
+        pass
+
+def _restore_ime_on_signal(signum, frame):
+    # GUI의 중지(terminate)는 SIGTERM — 키보드를 되돌리고 평소처럼 종료 처리를 진행한다.
+    restore_ime()
+    raise SystemExit(128 + signum)
+
+_ime_watched = False
+
+def _watch_ime_restore():
+    import atexit
+    import signal
+    import threading
+    global _ime_watched
+    if _ime_watched:
+        return
+    _ime_watched = True
+    atexit.register(restore_ime)
+    if threading.current_thread() is threading.main_thread():
+        for name in ('SIGTERM', 'SIGBREAK'):
+            if hasattr(signal, name):
+                try:
+                    signal.signal(getattr(signal, name), _restore_ime_on_signal)
+                except (ValueError, OSError):
+                    pass
+
+def _input_adb_ime(driver, element, text):
+    import base64
+    from utils.adb import ADB_KEYBOARD_IME, adb_shell, current_ime, has_adb_keyboard, set_ime
+    global _previous_ime
+    if _previous_ime is None:
+        if not has_adb_keyboard():
+            raise RuntimeError("ADBKeyBoard IME가 설치되어 있지 않습니다.")
+        _previous_ime = current_ime()
+        if _previous_ime != ADB_KEYBOARD_IME:
+            set_ime(ADB_KEYBOARD_IME)
+            _watch_ime_restore()
+    element.click()
+    encoded = base64.b64encode(text.encode('utf-8')).decode('ascii')
+    adb_shell('am', 'broadcast', '-a', 'ADB_INPUT_B64', '--es', 'msg', encoded)
+
+INPUT_STRATEGIES = {
+    'send_keys': _input_send_keys,
+    'mobile_type': _input_mobile_type,
+    'clipboard': _input_clipboard,
+    'adb_ime': _input_adb_ime,
+}
+# iOS(XCUITest)는 send_keys 외 전략을 지원하지 않는다.
+_IOS_STRATEGIES = ('send_keys',)
+
+_input_choices = None
+_input_stats = {}
+
+
+def _input_key(driver, field=None):
+    caps = getattr(driver, 'capabilities', None) or {}
+    app = caps.get('appPackage') or caps.get('bundleId') or 'unknown'
+    device = os.environ.get('APPIUM_DEVICE_NAME') or caps.get('udid') or caps.get('deviceName') or 'unknown'
+    return f"{app}|{device}|{field}" if field else f"{app}|{device}"
+
+def _input_choice_path():
+    from utils.paths import get_data_dir
+    return get_data_dir() / 'input_strategies.json'
+
+def _load_input_choices():
+    global _input_choices
+    if _input_choices is None:
+        try:
+            with open(_input_choice_path(), encoding='utf-8') as f:
+                _input_choices = json.load(f)
+        except (OSError, ValueError):
+            _input_choices = {}
+    return _input_choices
+
+def _save_input_choices():
+    try:
+        with open(_input_choice_path(), 'w', encoding='utf-8') as f:
+            json.dump(_input_choices, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+
+def _field_has(element, text):
+    try:
+        return text in (element.text or '')
+    except StaleElementReferenceException:
+        return False
+
+# 입력창 전체 선택(Ctrl+A) 후 지우기 — clear()(setText(""))를 거부하는 입력창용
+_KEYCODE_A = 29
+_KEYCODE_DEL = 67
+_META_CTRL_ON = 0x1000
+
+def _field_empty(element):
+    # Android 입력창은 비어 있으면 힌트 문구를 text로 돌려준다.
+    try:
+        text = element.text or ''
+        if not text:
+            return True
+        for name in ('hint', 'placeholderValue'):
+            try:
+                if text == element.get_attribute(name):
+                    return True
+            except WebDriverException:
+                continue
+    except StaleElementReferenceException:
+        pass
+    return False
+
+def _clear_field(driver, element):
+    """입력창 비우기 → 비었는지 확인한 결과"""
+    try:
+        element.clear()
+    except WebDriverException:
+        pass
+    if _field_empty(element):
+        return True
+    try:
+        element.click()
+        driver.press_keycode(_KEYCODE_A, _META_CTRL_ON)
+        driver.press_keycode(_KEYCODE_DEL)
+    except WebDriverException:
+        return False
+    return _field_empty(element)
+
+def _benchmark_sample(text):
+    # 실제 입력값과 같은 종류의 문자(한글 / 숫자 / 영문)로 된 버리는 문자열
+    if any('\uac00' <= ch <= '\ud7a3' for ch in text):
+        return '가나다'
+    if any(ch.isdigit() for ch in text) and not any(ch.isalpha() for ch in text):
+        return '010'
+    return 'abc'
+
+# =============================================================
+# - 입력창에서 전략별 입력 시간을 재고, 실제로 입력된 전략 중
+#   가장 빠른 전략 이름을 반환 (입력창은 비운 상태로 돌려놓는다)
+#   후보마다 입력창이 비었는지 먼저 확인한다. 앞 후보의 입력이 남아 있으면
+#   다음 후보가 입력하지 못해도 통과한 것처럼 보이기 때문에, 비우지 못하면
+#   남은 후보는 시험하지 않는다.
+#   adb_ime가 선택되지 않으면 바꿔 둔 IME는 바로 원래대로 돌린다.
+# - Args (매개변수) :
+#       element : 입력창 요소
+#       sample : 시험 입력할 문자열 (실제 입력값이 아닌 같은 종류의 버리는 문자열)
+# =============================================================
+def benchmark_input(driver, element, sample, strategies=None):
+    is_ios = (getattr(driver, 'capabilities', None) or {}).get('platformName', '').lower() == 'ios'
+    candidates = strategies or (_IOS_STRATEGIES if is_ios else tuple(INPUT_STRATEGIES))
+    timings = {}
+    try:
+        for name in candidates:
+            if not _clear_field(driver, element):
+                print(f"⚠️ 입력창을 비우지 못해 남은 입력 방식은 시험하지 않습니다: {name} 부터")
+                break
+            started = time.monotonic()
+            try:
+                INPUT_STRATEGIES[name](driver, element, sample)
+                ok = wait_until(lambda: _field_has(element, sample), timeout=2, required=False)
+            except Exception:
+                ok = False
+            elapsed = time.monotonic() - started
+            print(f"⌨️ 입력 방식 {name}: {f'{elapsed * 1000:.0f}ms' if ok else '실패'}")
+            if ok:
+                timings[name] = elapsed
+        if not _clear_field(driver, element):
+            print("⚠️ 시험 입력한 문자열을 지우지 못했습니다.")
+    finally:
+        best = min(timings, key=timings.get) if timings else 'send_keys'
+        if best != 'adb_ime':
+            restore_ime()
+    return best
+
+# =============================================================
+# - 기억된(없으면 벤치마크로 고른) 입력 전략으로 요소에 텍스트 입력
+# - Args (매개변수) :
+#       element : 입력창 요소
+#       text : 입력할 문자열
+#       strategy : 전략 이름 지정 시 벤치마크 없이 해당 전략 사용
+#       field : 같은 앱 안에서 입력창마다 따로 기억할 때 붙이는 이름
+# =============================================================
+def input_text(driver, element, text, strategy=None, field=None):
+    if strategy is None:
+        choices = _load_input_choices()
+        key = _input_key(driver, field)
+        strategy = choices.get(key)
+        if strategy not in INPUT_STRATEGIES:
+            strategy = benchmark_input(driver, element, _benchmark_sample(text))
+            choices[key] = strategy
+            _save_input_choices()
+            print(f"⌨️ 입력 방식 선택: {strategy} ({key})")
+    started = time.monotonic()
+    with span('type'):
+        INPUT_STRATEGIES[strategy](driver, element, text)
+    stats = _input_stats.setdefault(strategy, [0, 0.0])
+    stats[0] += 1
+    stats[1] += time.monotonic() - started
+    return element
+
+# =============================================================
+# - locator로 입력창을 찾아 input_text (stale 재시도는 click과 동일)
+#   입력 전략은 locator 값 기준으로 입력창마다 따로 기억한다.
+# =============================================================
+def type_text(driver, by, value, text, timeout=10, retries=3, retry_delay=0.3, cache=False, strategy=None):
+    with span('type'):
+        return _with_element(driver, by, value, lambda el: input_text(driver, el, text, strategy, field=value),
+                             timeout, retries, retry_delay, cache)
+
+# =============================================================
+# - 기억된 입력 전략 초기화 (앱 업데이트 등으로 다시 벤치마크할 때)
+# =============================================================
+def reset_input_strategy(driver=None):
+    choices = _load_input_choices()
+    if driver is None:
+        choices.clear()
+    else:
+        prefix = _input_key(driver)
+        for key in [k for k in choices if k == prefix or k.startswith(f"{prefix}|")]:
+            del choices[key]
+    _save_input_choices()
+
+def print_input_stats():
+    for name, (count, total) in _input_stats.items():
+        print(f"⌨️ 입력 방식 {name}: {count}회, 평균 {total / count * 1000:.0f}ms")
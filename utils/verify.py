@@ -0,0 +1,224 @@
+import os
+import re
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from utils.timing import journal, span
+from utils.util import recheck_taps, wait_until
+
+# =============================================================
+# ✨ 등록 반영 확인 정책 (카운터를 매 건 / N건마다 / 한도 근처에서만 읽기)
+# - VERIFY_EVERY (GUI: 카운터 확인)
+#       1 또는 미설정 : 매 건 등록 후 카운터 확인 (기존 동작)
+#       N            : N건을 이어서 등록한 뒤 카운터를 한 번 확인
+#       limit        : 한도 근처(NEAR_LIMIT건 이내)에 올 때까지 확인하지 않음
+#   어느 정책이든 한도 근처에서는 매 건 확인해 한도 도달 회차를 정확히 잡는다.
+# - 일괄 확인에서 카운터가 기대보다 적으면(누락 k건) 목록에 보이는 항목을
+#   조회해 어느 항목이 빠졌는지 이분 탐색한다. 최근 절반만 조회하고 나머지
+#   절반의 누락 수는 k에서 빼서 추론하므로, 누락이 최근 항목에 있으면
+#   목록 화면에서 스크롤되어 안 보이는 옛 항목은 조회하지 않는다.
+#   빠진 항목은 다시 등록하고 그때는 매 건 확인한다.
+# - 조회 결과가 누락 수와 맞지 않으면(일괄 건수가 화면에 보이는 행보다 많아
+#   옛 항목이 목록 밖으로 밀려난 경우) 위치를 특정하지 않고 그 일괄 전체를
+#   다시 등록한 뒤, 카운터가 누락 수만큼 늘었는지로 확인한다.
+#   (이미 등록된 항목은 중복이라 카운터에 반영되지 않는다)
+# - 목록 조회는 숫자만 맞춰 보므로(하이픈/공백 그룹핑 무시) 번호 스크립트용이다.
+#
+#     verifier = CounterVerifier(read_counter, count_listed, counter, limit=MAX_COUNT)
+#     for i in watchdog.attempts(limit.items(verifier.entries(range(...)))):
+#         ... 입력 / 등록 탭 ...
+#         verifier.add(i, number)
+#         if verifier.due():
+#             counter, batch, failed = verifier.verify()
+# =============================================================
+
+# 한도까지 이만큼 남으면 정책과 관계없이 매 건 확인
+NEAR_LIMIT = 10
+
+
+def verify_every():
+    """VERIFY_EVERY → 1(매 건) / N(N건마다) / 0(한도 근처에서만)"""
+    value = (os.environ.get('VERIFY_EVERY') or '1').strip().lower()
+    if value == 'limit':
+        return 0
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        return 1
+
+
+def _number_pattern(text):
+    # 표시 형식과 관계없이 숫자 사이에 숫자가 아닌 문자가 끼어도 맞는다.
+    return '[^0-9]*'.join(re.sub(r'\D', '', text))
+
+
+# =============================================================
+# - texts 중 목록 화면에 보이는 항목 수 (조회 한 번)
+#   Android는 UiSelector textMatches, iOS는 predicate MATCHES로
+#   후보 전체를 정규식 하나로 묶어 찾는다. 입력창(EditText / TextField)은 제외.
+# =============================================================
+def count_listed(driver, texts, ios=False):
+    pattern = '[^0-9]*(' + '|'.join(_number_pattern(text) for text in texts) + ')[^0-9]*'
+    if ios:
+        locator = (AppiumBy.IOS_PREDICATE,
+                   f"type == 'XCUIElementTypeStaticText' AND label MATCHES '{pattern}'")
+    else:
+        locator = (AppiumBy.ANDROID_UIAUTOMATOR,
+                   f'new UiSelector().className("android.widget.TextView").textMatches("{pattern}")')
+    with span('verify'):
+        return len(driver.find_elements(*locator))
+
+
+class CounterVerifier:
+    """등록 반영 확인
+
+    read_counter : 디바이스 카운터 읽기
+    count_listed : 항목 텍스트 목록 → 그중 목록 화면에 보이는 수
+    counter : 시작 카운터 (모르면 None — 첫 확인에서 읽는다)
+    limit : 앱 최대 등록 갯수 (None이면 한도 근처 판단 없음)
+    """
+
+    def __init__(self, read_counter, count_listed, counter, limit=None, every=None):
+        self.read_counter = read_counter
+        self.count_listed = count_listed
+        self.counter = counter
+        self.limit = limit
+        self.every = verify_every() if every is None else every
+        self.pending = []       # 등록 탭까지 했지만 아직 확인하지 않은 (키, 텍스트)
+        self.requeued = []      # 마지막 확인에서 누락으로 찾아 다시 등록할 키
+        self.highest = None     # 지금까지 등록한 가장 큰 키
+        self.lookups = 0        # 누락 위치를 찾느라 목록을 조회한 횟수
+        self._retry = []
+        self._retried = set()
+        self._duplicates = 0    # 다시 등록하는 항목 중 중복으로 반영되지 않을 건수
+
+    @property
+    def settled(self):
+        """확인하지 않은 항목도, 다시 등록할 항목도 없는 상태"""
+        return not self.pending and not self._retry
+
+    def entries(self, iterable):
+        """반복 키 목록. 누락으로 찾은 항목은 다음 차례에 한 번 더 돌려준다."""
+        for key in iterable:
+            yield key
+            while self._retry:
+                yield self._retry.pop(0)
+        while self._retry:
+            yield self._retry.pop(0)
+
+    def add(self, key, text):
+        if all(key != pending for pending, _ in self.pending):
+            self.pending.append((key, text))
+        if self.highest is None or key > self.highest:
+            self.highest = key
+
+    def due(self):
+        """지금 카운터를 확인할 차례인지"""
+        if not self.pending:
+            return False
+        if self.counter is None:
+            return True
+        if any(key in self._retried for key, _ in self.pending):
+            # 묶어서 다시 등록하는 항목은 모두 등록한 뒤 한 번에 확인한다.
+            return not (self._duplicates and self._retry)
+        if self.every == 1:
+            return True
+        if self.limit is not None and self.counter + len(self.pending) >= self.limit - NEAR_LIMIT:
+            return True
+        return self.every > 0 and len(self.pending) >= self.every
+
+    def _settle(self, expected):
+        def _reached():
+            current = self.read_counter()
+            return current if current is not None and current >= expected else None
+        current = wait_until(_reached, step='counter', required=False)
+        if current is None:
+            # 등록 탭이 빗나갔을 수 있어 다음 좌표 탭은 버튼 위치부터 확인한다.
+            recheck_taps()
+            current = self.read_counter()
+        else:
+            journal.inserted(current)
+        return current
+
+    def _locate_missing(self, items, count):
+        """items 중 누락 count건 찾기 (최근 절반 조회, 나머지는 개수로 추론)
+
+        조회 결과가 누락 수와 맞지 않으면 None
+        """
+        if count <= 0:
+            return []
+        if count >= len(items):
+            return list(items)
+        half = len(items) // 2
+        older, newer = items[:half], items[half:]
+        self.lookups += 1
+        newer_missing = len(newer) - self.count_listed([text for _, text in newer])
+        if not 0 <= newer_missing <= count:
+            return None
+        older_found = self._locate_missing(older, count - newer_missing)
+        newer_found = self._locate_missing(newer, newer_missing)
+        if older_found is None or newer_found is None:
+            return None
+        return older_found + newer_found
+
+    # =============================================================
+    # - 쌓인 항목의 반영 확인
+    # - Args (매개변수) :
+    #       settle : 카운터가 기대값에 닿을 때까지 기다릴지 (장애 복구 직후는 바로 읽는다)
+    #       requeue : 누락 항목을 모두 다시 등록 대기열로 (장애 복구용)
+    # - Returns (반환값) : (카운터, 확인한 키 목록, 끝내 반영되지 않은 키 목록)
+    #       한 건씩 확인한 항목이 반영되지 않으면 바로 실패, 일괄 확인에서 찾은
+    #       누락은 다시 등록하고 그 재시도까지 반영되지 않으면 실패로 돌려준다.
+    # =============================================================
+    def verify(self, settle=True, requeue=False):
+        # 확인 도중 장애가 나도 복구 후 같은 항목을 다시 확인하도록 끝까지 pending을 유지한다.
+        batch = list(self.pending)
+        keys = [key for key, _ in batch]
+        self.requeued = []
+        if not batch:
+            return self.counter, keys, []
+        if self.counter is None:
+            self.counter = self.read_counter()
+            self.pending = []
+            return self.counter, keys, []
+
+        duplicates, self._duplicates = self._duplicates, 0
+        expected = self.counter + len(batch) - duplicates
+        current = self._settle(expected) if settle else self.read_counter()
+        gap = expected - current
+        missing = []
+        if gap > 0 and (len(batch) == 1 or duplicates):
+            # 한 건 확인 / 묶어서 다시 등록한 항목은 위치를 다시 찾지 않는다.
+            missing = list(batch) if len(batch) == 1 else []
+        elif gap > 0:
+            lookups = self.lookups
+            # 목록에 보이는 행보다 묶음이 크면 나눠 찾은 결과를 믿을 수 없어, 묶음 전체가 다 보이는지 먼저 본다.
+            self.lookups += 1
+            if len(batch) - self.count_listed([text for _, text in batch]) == gap:
+                missing = self._locate_missing(batch, gap)
+            else:
+                missing = None
+            if missing is None:
+                missing = list(batch)
+                print(f"🔎 일괄 확인에서 누락 {gap}건 — 목록 화면에 보이지 않는 항목이 있어 "
+                      f"{len(batch)}건을 모두 다시 등록하고 카운터로 확인합니다.")
+            else:
+                print(f"🔎 일괄 확인에서 누락 {gap}건 — 목록 조회 {self.lookups - lookups}회로 찾음: "
+                      f"{', '.join(text for _, text in missing)}")
+        self.counter = current
+        self.pending = []
+
+        if gap > 0 and duplicates:
+            print(f"🕹️ ❗️ 다시 등록한 {len(batch)}건 중 {gap}건이 여전히 반영되지 않았습니다.")
+            return current, keys, keys
+        failed = []
+        for key, text in missing:
+            if requeue or (len(batch) > 1 and key not in self._retried):
+                self._retried.add(key)
+                self._retry.append(key)
+                self.requeued.append(key)
+            else:
+                failed.append(key)
+        if len(missing) > gap:
+            self._duplicates = len(missing) - gap
+        return current, keys, failed
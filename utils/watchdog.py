@@ -0,0 +1,165 @@
+import http.client
+import os
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+
+# =============================================================
+# ✨ 루프 감시 (UiAutomator2 / WDA 장애 시 세션 재생성 후 이어서 실행)
+# - 회차 실행 중 예외가 나면 일시적인 장애인지 판단한다.
+#   (instrumentation 크래시, 소켓 끊김, 세션 없음, Appium 연결 거부 등)
+# - 일시적인 장애면 같은 드라이버 객체에 새 세션을 만들고(start_session)
+#   요소/좌표 캐시와 직접 클라이언트 연결을 갱신한 뒤 실패한 회차를 다시 실행한다.
+#   스크립트가 들고 있는 driver / hot 변수는 그대로 쓸 수 있다.
+# - 새 세션은 autoLaunch를 끄고 만들어 앱을 다시 띄우지 않는다. (진입해 둔 화면 유지)
+# - 그 외 예외(요소 없음, 시간 초과 등)는 지금처럼 그대로 올려 실행을 끝낸다.
+# - WATCHDOG=0이면 끈다. 실행 한 번에 재생성은 WATCHDOG_RESTARTS(기본 5)회까지.
+#
+#     watchdog = Watchdog(driver, options, hot=hot, on_recover=resync)
+#     for i in watchdog.attempts(range(start_num, end_num + 1)):
+#         with watchdog.step(i):
+#             ... 회차 본문 ...
+# =============================================================
+
+DEFAULT_RESTARTS = 5
+# 세션 재생성 시도 횟수 / 간격(초) — Appium이 디바이스 서버를 다시 띄우는 시간
+SESSION_ATTEMPTS = 3
+SESSION_RETRY_DELAY = 2.0
+
+# 일시적인 장애로 보는 오류 메시지 (소문자)
+TRANSIENT_MESSAGES = (
+    'instrumentation process is not running',
+    'uiautomator2 server',
+    'cannot be proxied',
+    'could not proxy command',
+    'socket hang up',
+    'econnrefused',
+    'econnreset',
+    'session is either terminated or not started',
+    'session not found',
+    'invalid session id',
+    'connection refused',
+    'connection reset',
+    'connection aborted',
+    'remote end closed connection',
+    'max retries exceeded',
+    'webdriveragent',
+)
+
+
+def watchdog_enabled():
+    return os.environ.get('WATCHDOG') != '0'
+
+
+def _transient_types():
+    types = [InvalidSessionIdException, ConnectionError, http.client.HTTPException]
+    try:
+        from urllib3.exceptions import HTTPError as Urllib3Error
+        types.append(Urllib3Error)
+    except ImportError:
+        pass
+    return tuple(types)
+
+
+def is_transient(exc):
+    """세션을 다시 만들면 이어갈 수 있는 장애인지 판단"""
+    if isinstance(exc, _transient_types()):
+        return True
+    if isinstance(exc, WebDriverException):
+        message = (exc.msg or str(exc) or '').lower()
+    else:
+        message = str(exc).lower()
+    return any(pattern in message for pattern in TRANSIENT_MESSAGES)
+
+
+# =============================================================
+# - 같은 드라이버 객체에 새 세션 생성
+#   죽은 세션은 정리만 시도하고, 세션 유지(GUI)로 빌린 세션이었어도
+#   새로 만든 세션은 스크립트가 끝날 때 종료한다.
+# =============================================================
+def restart_session(driver, options):
+    from appium import webdriver
+    from utils.session import _apply_fast_settings, is_fast_profile
+
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    options.set_capability('autoLaunch', False)
+    last_exc = None
+    for attempt in range(SESSION_ATTEMPTS):
+        if attempt:
+            time.sleep(SESSION_RETRY_DELAY)
+        try:
+            webdriver.Remote.start_session(driver, options)
+            break
+        except Exception as e:
+            last_exc = e
+    else:
+        raise last_exc
+    driver.is_attached_session = False
+    driver.keyboard_hidden = bool(options.get_capability('hideKeyboard'))
+    if is_fast_profile():
+        _apply_fast_settings(driver, options)
+
+
+class Watchdog:
+    """루프 회차 감시
+
+    on_recover(key) : 세션을 다시 만든 뒤 step()에 넘긴 회차 키로 호출. 실패한 회차가
+                      이미 반영됐으면(카운터가 늘었으면) True를 반환해 다음 회차로 넘어간다.
+    """
+
+    def __init__(self, driver, options, hot=None, on_recover=None, max_restarts=None):
+        self.driver = driver
+        self.options = options
+        self.hot = hot
+        self.on_recover = on_recover
+        if max_restarts is None:
+            max_restarts = int(os.environ.get('WATCHDOG_RESTARTS') or DEFAULT_RESTARTS)
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self._failed = None
+
+    def recover(self, exc):
+        """일시적인 장애면 세션을 다시 만들고 True, 아니면 False"""
+        if not watchdog_enabled() or not is_transient(exc) or self.restarts >= self.max_restarts:
+            return False
+        from utils.util import invalidate_cache
+
+        self.restarts += 1
+        reason = (str(exc).strip().splitlines() or [''])[0]
+        print(f"🩺 일시적인 장애 감지 — 세션을 다시 만듭니다 ({self.restarts}/{self.max_restarts}): "
+              f"{type(exc).__name__}: {reason}")
+        started = time.monotonic()
+        try:
+            restart_session(self.driver, self.options)
+            invalidate_cache()
+            if self.hot is not None and self.hot is not self.driver:
+                self.hot.refresh()
+        except Exception as e:
+            print(f"❌ 세션 재생성 실패: {e}")
+            return False
+        print(f"🩺 세션 재생성 완료 ({time.monotonic() - started:.1f}초) — 실패한 회차부터 이어서 진행합니다.")
+        return True
+
+    def attempts(self, iterable):
+        """회차 반복. step()이 장애를 복구한 회차는 한 번 더 돌려준다."""
+        for item in iterable:
+            while True:
+                self._failed = None
+                yield item
+                if self._failed is None:
+                    break
+                if self.on_recover is not None and self.on_recover(self._failed[0]):
+                    break
+
+    @contextmanager
+    def step(self, key):
+        try:
+            yield
+        except Exception as e:
+            if not self.recover(e):
+                raise
+            self._failed = (key,)